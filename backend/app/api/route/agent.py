@@ -1,39 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.schema import (
+    AgentDetail,
+    AgentOut,
+    AgentPage,
+    AgentSearchResults,
+    TopRatedAgents,
+    TrendingAgents,
+)
+from backend.app.api.utils.loading import load_for
+from backend.app.api.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    keyset_statement,
+    split_page,
+)
+from backend.app.core.database import get_async_db
+from backend.app.core.models import Agent
+from backend.app.core.ratings import rating_summary, top_rated
+from backend.app.core.search import search_agents
+from backend.app.core.trending import trending_agents
 
 
 router = APIRouter()
 
 
-@router.get("/agent")
-def list_agents(category: str = None, trending: bool = False or True):
+# The search, rating and trending services are plain Session code shared with
+# sync callers (upserts, the trending job); async routes run them through
+# AsyncSession.run_sync, which still awaits every query on the event loop.
+
+
+@router.get("/agent", response_model=AgentPage)
+async def list_agents(
+    category: Optional[str] = None,
+    trending: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List agents, newest first, one page at a time.
+    Pass the returned `next_cursor` as `cursor` to get the following page.
+    """
+    statement = load_for(select(Agent), AgentOut)
+    if category is not None:
+        statement = statement.where(Agent.category == category)
+    if trending is not None:
+        statement = statement.where(Agent.trending == trending)
+    try:
+        statement = keyset_statement(statement, Agent, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    agents, next_cursor = split_page((await db.scalars(statement)).all(), limit)
+    return {"agents": agents, "next_cursor": next_cursor}
+
+
+@router.get("/agent/search", response_model=AgentSearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Search agents by name, category and description, best match first.
+    Misspelled words still match (one typo per word).
+    """
+    hits = await db.run_sync(search_agents, q, limit, category)
+    agents = [
+        {**AgentOut.model_validate(agent).model_dump(), "score": score}
+        for agent, score in hits
+    ]
+    return {"query": q, "agents": agents}
+
+
+@router.get("/agent/top-rated", response_model=TopRatedAgents)
+async def top_rated_agents(
+    category: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Best rated agents, overall or in one category. Ranked by a Bayesian
+    average, so an agent with a single 5-star rating doesn't top the list.
+    """
+    agents = [
+        {**AgentOut.model_validate(agent).model_dump(), "rating": rating_summary(agent)}
+        for agent in await db.run_sync(top_rated, category, limit)
+    ]
+    return {"category": category, "agents": agents}
+
+
+@router.get("/agent/trending", response_model=TrendingAgents)
+async def trending(
+    category: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Agents with the most recent highlights, reviews and ratings, overall or in
+    one category. Served from lists precomputed by the trending job.
+    """
+    agents = [
+        {**AgentOut.model_validate(agent).model_dump(), "score": score}
+        for agent, score in await db.run_sync(trending_agents, category, limit)
+    ]
+    return {"category": category, "agents": agents}
+
+
+@router.get("/agent/{agent_id}", response_model=AgentDetail)
+async def get_agent(agent_id: int, db: AsyncSession = Depends(get_async_db)):
     """
-    List all agents.
+    Get details of a specific agent by ID, with its rating and reviews.
     """
-    # * Sample data for agents
+    agent = await db.scalar(
+        load_for(select(Agent).where(Agent.id == agent_id), AgentDetail)
+    )
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+
+    reviews = sorted(
+        agent.reviews, key=lambda review: (review.created_at, review.id), reverse=True
+    )
     return {
-        "agents": [
-            {"id":1, "name":"Agent 1", "category":category, "trending":trending},
-            {"id":2, "name":"Agent 2", "category":category, "trending":trending},
-            {"id":3, "name":"Agent 3", "category":category, "trending":trending}
-            ]}
-
-@router.get("/agent/{agent_id}")
-def get_agent(agent_id: int):
-    """
-    Get details of a specific agent by ID.
-    """
-    # * Sample data for agents
-    agents = {
-        1: {"id": 1, "name": "Agent 1", "category": "Category A", "trending": True},
-        2: {"id": 2, "name": "Agent 2", "category": "Category B", "trending": False},
-        3: {"id": 3, "name": "Agent 3", "category": "Category C", "trending": True}
+        **AgentOut.model_validate(agent).model_dump(),
+        "rating": rating_summary(agent),
+        "reviews": reviews,
     }
-    
-    agent = agents.get(agent_id)
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
-    
-    return agent
+
 
 @router.post("/agent/{agent_id}/review")
 def review_agent(agent_id: int, review: str):
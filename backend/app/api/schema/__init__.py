@@ -1 +1 @@
-from .validate import LoginRequest, SignupRequest, agentRequest
\ No newline at end of file
+from .validate import LoginRequest, SignupRequest, agentRequest, AgentOut, AgentPage, AgentHit, AgentSearchResults, RatingSummary, RatedAgent, TopRatedAgents, TrendingAgents, UserPublic, ReviewOut, AgentDetail
\ No newline at end of file
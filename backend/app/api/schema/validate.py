@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
 
 class LoginRequest(BaseModel):
     username: str
@@ -15,3 +16,70 @@ class agentRequest(BaseModel):
     category: Optional[str] = None
     trending: Optional[bool] = True 
 
+
+class AgentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    homepage_url: Optional[str] = None
+    category: Optional[str] = None
+    source: Optional[str] = None
+    trending: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class AgentPage(BaseModel):
+    agents: List[AgentOut]
+    next_cursor: Optional[str] = None
+
+
+class AgentHit(AgentOut):
+    score: float
+
+
+class AgentSearchResults(BaseModel):
+    query: str
+    agents: List[AgentHit]
+
+
+class RatingSummary(BaseModel):
+    count: int
+    average: Optional[float] = None
+    histogram: Dict[int, int]
+
+
+class RatedAgent(AgentOut):
+    rating: RatingSummary
+
+
+class TopRatedAgents(BaseModel):
+    category: Optional[str] = None
+    agents: List[RatedAgent]
+
+
+class TrendingAgents(BaseModel):
+    category: Optional[str] = None
+    agents: List[AgentHit]
+
+
+class UserPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str
+
+
+class ReviewOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    content: Optional[str] = None
+    created_at: Optional[datetime] = None
+    user: Optional[UserPublic] = None
+
+
+class AgentDetail(AgentOut):
+    rating: RatingSummary
+    reviews: List[ReviewOut]
@@ -0,0 +1,35 @@
+"""
+Loader strategies per response shape.
+
+Every relationship on the models is lazy by default, which loads a review's
+author with one query per review. A route instead selects its rows with the
+options of the schema it returns: collections with selectinload (one extra
+query for all parents, no row multiplication) and many-to-one references
+with joinedload (folded into the query that loads the rows). Any other
+relationship is raiseload'ed, on the rows and on every object loaded with
+them, so a response that starts touching a new relationship fails loudly in
+the tests rather than issuing one query per row.
+"""
+
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from backend.app.api.schema import AgentDetail, AgentOut
+from backend.app.core.models import Agent, Review
+
+LOADER_OPTIONS = {
+    AgentOut: (raiseload("*"),),
+    AgentDetail: (
+        selectinload(Agent.reviews).options(
+            joinedload(Review.user).raiseload("*"),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    ),
+}
+
+
+def load_for(statement, shape):
+    """
+    Apply the loader options of the response schema `shape` to a select().
+    """
+    return statement.options(*LOADER_OPTIONS[shape])
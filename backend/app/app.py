@@ -0,0 +1,25 @@
+"""
+FastAPI application entry point.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from backend.app.api.route import agent, login
+from backend.app.core.trending import REFRESH_SECONDS, start_trending_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # TRENDING_REFRESH_SECONDS=0 leaves trending to an external scheduler
+    stop = start_trending_worker(REFRESH_SECONDS) if REFRESH_SECONDS > 0 else None
+    yield
+    if stop is not None:
+        stop.set()
+
+
+app = FastAPI(title="AI Agent Directory", lifespan=lifespan)
+
+app.include_router(agent.router)
+app.include_router(login.router)
@@ -1,16 +1,23 @@
 """
 This module sets up the database connection using SQLAlchemy and provides
-a session factory for database operations
+a session factory for database operations.
+
+Requests use the async engine (asyncpg on Postgres, aiosqlite on SQLite), so
+waiting on the database never blocks the event loop or a threadpool worker.
+The sync engine stays for scripts, background jobs and the ETL-facing helpers.
 """
 
+import os
+from pathlib import Path
 
-from sqlalchemy import create_engine, Column
-from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
-from pathlib import Path
-import os
+from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
-path = Path("../../.env_example")
+path = Path(__file__).resolve().parents[2] / ".env_example"
 
 load_dotenv(dotenv_path=path)
 
@@ -20,12 +27,69 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
-DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL overrides the DB_* parts, e.g. sqlite:// for tests
+DB_URL = os.getenv(
+    "DATABASE_URL",
+    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+)
+
+# Async pool per process: pool_size connections kept open, up to max_overflow
+# more under bursts; pre-ping replaces connections the server has dropped
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+# asyncpg prepared statements cached per connection
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_url(url=DB_URL):
+    """
+    The async-driver form of a database URL, e.g. postgresql+asyncpg://.
+    """
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
 
-engine = create_engine(DB_URL)
+def make_engine(url=DB_URL):
+    if url.startswith("sqlite"):
+        # One shared connection, so an in-memory database outlives each session
+        return create_engine(
+            url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    return create_engine(url)
 
 
-SessionLocal = sessionmaker(autoflush=False, autocomit=False, bind=engine)
+engine = make_engine()
+
+
+def make_async_engine(url=DB_URL):
+    url = async_url(url)
+    if url.get_backend_name() == "sqlite":
+        # SQLite has nothing to pool; an in-memory database is not shared
+        # with the sync engine, so tests use a file
+        return create_async_engine(url, poolclass=NullPool)
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+async_engine = make_async_engine()
+
+
+SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
+# Loaded rows stay readable after commit, when lazy refreshes can't run
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -45,8 +109,16 @@ def get_db():
         db.close()
 
 
-def init_db():
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def init_db(bind=None):
+    # Importing the models registers every table on Base.metadata
+    from backend.app.core import models  # noqa: F401
+
     try:
-        Base.metadata.create_all(engine)
+        Base.metadata.create_all(bind or engine)
     except Exception as e:
         print(f"{e}")
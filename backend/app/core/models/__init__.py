@@ -0,0 +1,11 @@
+"""
+Importing this package registers every model, so relationships declared by
+class name can be resolved.
+"""
+
+from .agent import Agent
+from .highlight import Highlight
+from .rating import Rating
+from .reveiw import Review
+from .trending import TrendingAgent, TrendingState
+from .user import User
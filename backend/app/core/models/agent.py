@@ -1,12 +1,34 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, Text, ForeignKey, DateTime,
-    func, UniqueConstraint, CheckConstraint
+    func, UniqueConstraint, CheckConstraint, Index, DDL, event, literal_column,
+    Float
 )
+# Registers Postgres' full-text functions (to_tsvector, ...) before the index
+# expression below is built, even when no Postgres engine was created first
+import sqlalchemy.dialects.postgresql  # noqa: F401
 from sqlalchemy.orm import relationship, declarative_base
-from backend.app.core.database import init_db, BaseModel
-from highlight import Highlight
-from rating import Rating
-from reveiw import Review
+from backend.app.core.database import BaseModel
+
+# Text search configuration, as a regconfig literal so the expression is
+# immutable and can be indexed
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def search_vector(name, category, description):
+    """
+    Weighted tsvector of an agent: name (A), category (B), description (C).
+    Queries must build this same expression to be answered by ix_agents_search.
+    """
+    parts = [
+        func.setweight(
+            func.to_tsvector(
+                SEARCH_CONFIG, func.coalesce(column, literal_column("''"))
+            ),
+            literal_column(f"'{weight}'"),
+        )
+        for column, weight in ((name, "A"), (category, "B"), (description, "C"))
+    ]
+    return parts[0].op("||")(parts[1]).op("||")(parts[2])
 
 
 class Agent(BaseModel):  # Xteristics: Can be highlighted, reviewed, and rated by users. Can be marked trending (admin only)
@@ -18,12 +40,61 @@ class Agent(BaseModel):  # Xteristics: Can be highlighted, reviewed, and rated b
     category = Column(String)
     source = Column(String)
     trending = Column(Boolean, default=False)
-    created_at = Column(DateTime, server_default=func.now())
+    # The keyset pagination key (api/utils/pagination.py), so never NULL
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
+    # Rating aggregates, kept current on every Rating write (see models/rating.py)
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bayesian average used to rank; 0 while an agent has no ratings
+    rating_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    # Decayed activity score, scaled to the trending epoch (see core/trending.py)
+    trending_score = Column(Float, nullable=False, default=0.0, server_default="0")
+
     highlights = relationship("Highlight", back_populates="agent", cascade="all, delete")
     reviews = relationship("Review", back_populates="agent", cascade="all, delete")
     ratings = relationship("Rating", back_populates="agent", cascade="all, delete")
 
+    # Keyset pagination walks (created_at, id); each filter gets its own composite index
+    # so a filtered page is a single index range scan, however deep the cursor
+    __table_args__ = (
+        Index("ix_agents_created_at_id", "created_at", "id"),
+        Index("ix_agents_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_agents_trending_created_at_id", "trending", "created_at", "id"),
+        Index(
+            "ix_agents_category_trending_created_at_id",
+            "category", "trending", "created_at", "id",
+        ),
+        Index("ix_agents_rating_score_id", "rating_score", "id"),
+        Index("ix_agents_category_rating_score_id", "category", "rating_score", "id"),
+        Index("ix_agents_trending_score_id", "trending_score", "id"),
+        Index(
+            "ix_agents_category_trending_score_id", "category", "trending_score", "id"
+        ),
+        # Postgres only: ranked full-text and typo-tolerant trigram search
+        Index(
+            "ix_agents_search",
+            search_vector(name, category, description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_agents_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+event.listen(
+    Agent.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
 
-init_db()
\ No newline at end of file
@@ -1,11 +1,9 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, Text, ForeignKey, DateTime,
-    func, UniqueConstraint, CheckConstraint
+    func, UniqueConstraint, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship, declarative_base
-from backend.app.core.database import init_db, BaseModel
-from user import User
-from agent import Agent
+from backend.app.core.database import BaseModel
 
 
 class Highlight(BaseModel):  # Characteristics: One user cannot highlight the same agent twice
@@ -13,11 +11,13 @@ class Highlight(BaseModel):  # Characteristics: One user cannot highlight the sa
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"))
+    created_at = Column(DateTime, server_default=func.now())
 
     user = relationship("User", back_populates="highlights")
     agent = relationship("Agent", back_populates="highlights")
 
-    __table_args__ = (UniqueConstraint("user_id", "agent_id", name="_user_agent_highlight_uc"),)
-
-
-init_db()
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("user_id", "agent_id", name="_user_agent_highlight_uc"),
+        # The trending job reads new rows in (created_at, id) order
+        Index("ix_highlights_created_at_id", "created_at", "id"),
+    )
@@ -1,11 +1,11 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, Text, ForeignKey, DateTime,
-    func, UniqueConstraint, CheckConstraint
+    func, UniqueConstraint, CheckConstraint, Index, case, event, inspect, update
 )
-from sqlalchemy.orm import relationship, declarative_base
-from backend.app.core.database import init_db, BaseModel
-from user import User
-from agent import Agent
+from sqlalchemy.orm import Session, object_session, relationship, declarative_base
+from sqlalchemy.orm.util import identity_key
+from backend.app.core.database import BaseModel
+from backend.app.core.models.agent import Agent
 
 
 class Rating(BaseModel):   # Characteristics: One user can only rate an agent once
@@ -13,6 +13,7 @@ class Rating(BaseModel):   # Characteristics: One user can only rate an agent on
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"))
+    created_at = Column(DateTime, server_default=func.now())
     value = Column(Integer, nullable=False)
 
     user = relationship("User", back_populates="ratings")
@@ -20,8 +21,94 @@ class Rating(BaseModel):   # Characteristics: One user can only rate an agent on
 
     __table_args__ = (
         UniqueConstraint("user_id", "agent_id", name="_user_agent_rating_uc"),
-        CheckConstraint("value >= 1 AND value <= 5", name="check_rating_range")
+        CheckConstraint("value >= 1 AND value <= 5", name="check_rating_range"),
+        # The trending job reads new rows in (created_at, id) order
+        Index("ix_ratings_created_at_id", "created_at", "id"),
     )
 
 
-init_db()
\ No newline at end of file
+# The agent's rating aggregates are updated in the same flush as the rating,
+# with relative UPDATEs (count = count + 1), so concurrent raters don't lose
+# writes and no request ever has to aggregate the ratings table.
+# Bulk query.delete()/update() skip these listeners; run recompute_rating_stats()
+# (core/ratings.py) after those.
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+RATING_FIELDS = ["rating_count", "rating_sum", "rating_score"] + [
+    f"rating_{value}" for value in range(1, 6)
+]
+
+
+def rating_score(count, total):
+    """
+    Bayesian average: the mean pulled towards PRIOR_MEAN by PRIOR_WEIGHT
+    virtual ratings, so one 5-star rating doesn't top the list. Works on
+    numbers and on SQL expressions alike.
+    """
+    return (PRIOR_MEAN * PRIOR_WEIGHT + total) / (PRIOR_WEIGHT + count)
+
+
+def _apply(connection, agent_id, value, sign):
+    if agent_id is None or value is None:
+        return
+    count = Agent.rating_count + sign
+    total = Agent.rating_sum + sign * value
+    star = getattr(Agent, f"rating_{value}")
+    connection.execute(
+        update(Agent)
+        .where(Agent.id == agent_id)
+        .values(
+            {
+                Agent.rating_count: count,
+                Agent.rating_sum: total,
+                star: star + sign,
+                Agent.rating_score: case(
+                    (count > 0, rating_score(count, total)), else_=0.0
+                ),
+            }
+        )
+    )
+
+
+def _touched(target, *agent_ids):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("rated_agents", set()).update(
+            agent_id for agent_id in agent_ids if agent_id is not None
+        )
+
+
+def _previous(target, key):
+    history = inspect(target).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+
+@event.listens_for(Rating, "after_insert")
+def _rating_inserted(mapper, connection, target):
+    _apply(connection, target.agent_id, target.value, 1)
+    _touched(target, target.agent_id)
+
+
+@event.listens_for(Rating, "after_update")
+def _rating_updated(mapper, connection, target):
+    old_agent, old_value = _previous(target, "agent_id"), _previous(target, "value")
+    if (old_agent, old_value) == (target.agent_id, target.value):
+        return
+    _apply(connection, old_agent, old_value, -1)
+    _apply(connection, target.agent_id, target.value, 1)
+    _touched(target, old_agent, target.agent_id)
+
+
+@event.listens_for(Rating, "after_delete")
+def _rating_deleted(mapper, connection, target):
+    _apply(connection, _previous(target, "agent_id"), _previous(target, "value"), -1)
+    _touched(target, _previous(target, "agent_id"))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_rated_agents(session, flush_context):
+    # Loaded agents still hold the aggregates from before the UPDATE
+    for agent_id in session.info.pop("rated_agents", ()):
+        agent = session.identity_map.get(identity_key(Agent, agent_id))
+        if agent is not None:
+            session.expire(agent, RATING_FIELDS)
@@ -1,11 +1,9 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, Text, ForeignKey, DateTime,
-    func, UniqueConstraint, CheckConstraint
+    func, UniqueConstraint, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship, declarative_base
-from backend.app.core.database import init_db, BaseModel
-from user import User
-from agent import Agent
+from backend.app.core.database import BaseModel
 
 
 class Review(BaseModel): # Characteristics: user writes a review for an agent
@@ -13,10 +11,11 @@ class Review(BaseModel): # Characteristics: user writes a review for an agent
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"))
+    created_at = Column(DateTime, server_default=func.now())
     content = Column(Text)
 
     user = relationship("User", back_populates="reviews")
     agent = relationship("Agent", back_populates="reviews")
 
-
-init_db()
\ No newline at end of file
+    # The trending job reads new rows in (created_at, id) order
+    __table_args__ = (Index("ix_reviews_created_at_id", "created_at", "id"),)
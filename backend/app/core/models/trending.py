@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from backend.app.core.database import Base, BaseModel
+
+
+class TrendingState(BaseModel):  # Single row: where the trending job stopped and its decay epoch
+    __tablename__ = "trending_state"
+
+    epoch = Column(DateTime, nullable=False)
+    # Per activity table, the (created_at, id) of the last row read
+    highlights_at = Column(DateTime)
+    highlights_id = Column(Integer, nullable=False, default=0)
+    reviews_at = Column(DateTime)
+    reviews_id = Column(Integer, nullable=False, default=0)
+    ratings_at = Column(DateTime)
+    ratings_id = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime)
+
+
+class TrendingAgent(Base):  # Precomputed top-K per category; category "" is the overall list
+    __tablename__ = "trending_agents"
+
+    category = Column(String, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    agent_id = Column(
+        Integer, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False
+    )
+    score = Column(Float, nullable=False)
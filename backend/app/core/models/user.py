@@ -3,10 +3,7 @@ from sqlalchemy import (
     func, UniqueConstraint, CheckConstraint
 )
 from sqlalchemy.orm import relationship, declarative_base
-from backend.app.core.database import init_db, BaseModel
-from highlight import Highlight
-from rating import Rating
-from reveiw import Review
+from backend.app.core.database import BaseModel
 
 
 class User(BaseModel):   # Abilities: Can highlight, rate, and review agents
@@ -20,6 +17,3 @@ class User(BaseModel):   # Abilities: Can highlight, rate, and review agents
     highlights = relationship("Highlight", back_populates="user", cascade="all, delete")
     reviews = relationship("Review", back_populates="user", cascade="all, delete")
     ratings = relationship("Rating", back_populates="user", cascade="all, delete")
-
-
-init_db()
\ No newline at end of file
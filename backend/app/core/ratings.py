@@ -0,0 +1,83 @@
+"""
+Per-agent rating aggregates.
+
+Every agent row carries its rating count, sum, 1-5 histogram and ranking
+score. They are updated in the same flush as each rating write (see
+models/rating.py), so reading an agent's rating or the top rated agents of a
+category never aggregates the ratings table. recompute_rating_stats()
+rebuilds them from scratch with one GROUP BY, for backfills and after bulk
+writes that bypass the ORM.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.models import Agent, Rating
+from backend.app.core.models.rating import RATING_FIELDS, rating_score
+
+STARS = range(1, 6)
+
+
+def rating_summary(agent: Agent) -> dict:
+    """
+    An agent's rating as served by the API, read from its aggregate columns.
+    """
+    count = agent.rating_count
+    return {
+        "count": count,
+        "average": round(agent.rating_sum / count, 2) if count else None,
+        "histogram": {star: getattr(agent, f"rating_{star}") for star in STARS},
+    }
+
+
+def compute_rating_stats(db: Session) -> dict:
+    """
+    Aggregate the ratings table from scratch.
+
+    Returns:
+        dict: {agent_id: {field: value}} for every field in RATING_FIELDS,
+            only for agents with at least one rating.
+    """
+    stats = {}
+    rows = db.execute(
+        select(Rating.agent_id, Rating.value, func.count()).group_by(
+            Rating.agent_id, Rating.value
+        )
+    )
+    for agent_id, value, count in rows:
+        agent = stats.setdefault(agent_id, dict.fromkeys(RATING_FIELDS, 0))
+        agent[f"rating_{value}"] += count
+        agent["rating_count"] += count
+        agent["rating_sum"] += count * value
+    for agent in stats.values():
+        agent["rating_score"] = rating_score(agent["rating_count"], agent["rating_sum"])
+    return stats
+
+
+def recompute_rating_stats(db: Session) -> int:
+    """
+    Overwrite every agent's aggregates with a full recompute and commit.
+
+    Returns:
+        int: Agents with at least one rating.
+    """
+    stats = compute_rating_stats(db)
+    db.execute(update(Agent).values({field: 0 for field in RATING_FIELDS}))
+    if stats:
+        db.execute(
+            update(Agent),
+            [{"id": agent_id, **fields} for agent_id, fields in stats.items()],
+        )
+    db.commit()
+    return len(stats)
+
+
+def top_rated(db: Session, category: str = None, limit: int = 20) -> list:
+    """
+    Rated agents by descending score, read off the (category, rating_score, id)
+    index.
+    """
+    query = db.query(Agent).filter(Agent.rating_count > 0)
+    if category is not None:
+        query = query.filter(Agent.category == category)
+    return query.order_by(Agent.rating_score.desc(), Agent.id.desc()).limit(limit).all()
@@ -0,0 +1,323 @@
+"""
+Agent search over name, category and description.
+
+Postgres is the only supported database for search in production. There,
+search runs on two GIN indexes declared on the Agent model: a weighted
+tsvector (name > category > description) for ranked full-text matches and a
+pg_trgm index on the name for misspelled queries. Postgres keeps both current
+on every write, including the ETL's, which writes the agents table directly.
+
+Other databases (SQLite in the tests and local development) use SearchIndex,
+an in-process inverted index with the same weighting. Misspelled words are
+matched through a deletion index: every vocabulary word is stored under each
+of its one-letter-shorter variants, so the words within one edit of a query
+word are found with a few dict lookups instead of a scan of the vocabulary.
+The index is built from the agents table on first use and then only sees the
+writes this process makes through upsert_agents(); after writes from anywhere
+else, call reset_search_index().
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from backend.app.core.models import Agent
+from backend.app.core.models.agent import SEARCH_CONFIG, search_vector
+
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+# A word within one edit of a query word scores this fraction of an exact match
+FUZZY_PENALTY = 0.6
+# BM25 term-frequency saturation
+K1 = 1.2
+# Most agents a single word brings in. Postings are grouped by weight, so a
+# common word brings in its best agents (e.g. those with it in the name); once
+# rarer words found candidates, common words only re-score those
+MAX_CANDIDATES = 1000
+MIN_FUZZY_LENGTH = 4
+# pg_trgm's default similarity threshold
+TRIGRAM_THRESHOLD = 0.3
+UPSERT_FIELDS = ("description", "homepage_url", "category", "source", "trending")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(value) -> list:
+    return _TOKEN.findall(value.lower()) if value else []
+
+
+def _deletes(word: str) -> set:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class SearchIndex:
+    """
+    Thread-safe in-process inverted index of agents.
+    """
+
+    def __init__(self):
+        # word -> {weight: agent ids}, so a word's best agents are read first
+        self._postings = defaultdict(lambda: defaultdict(set))
+        self._counts = defaultdict(int)  # word -> number of agents
+        self._deletions = defaultdict(set)  # word minus one letter -> words
+        self._docs = {}  # agent_id -> ({word: weight}, category)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, agent_id: int, name=None, description=None, category=None):
+        """
+        Index an agent, replacing what was indexed for it before.
+        """
+        weights = defaultdict(float)
+        for field, value in (
+            ("name", name),
+            ("category", category),
+            ("description", description),
+        ):
+            for word in tokenize(value):
+                weights[word] += FIELD_WEIGHTS[field]
+
+        with self._lock:
+            self._remove(agent_id)
+            for word, weight in weights.items():
+                if word not in self._counts and len(word) >= MIN_FUZZY_LENGTH:
+                    for variant in _deletes(word):
+                        self._deletions[variant].add(word)
+                self._postings[word][weight].add(agent_id)
+                self._counts[word] += 1
+            self._docs[agent_id] = (dict(weights), category)
+
+    def remove(self, agent_id: int):
+        with self._lock:
+            self._remove(agent_id)
+
+    def _remove(self, agent_id):
+        doc = self._docs.pop(agent_id, None)
+        if doc is None:
+            return
+        for word, weight in doc[0].items():
+            postings = self._postings[word]
+            postings[weight].discard(agent_id)
+            if not postings[weight]:
+                del postings[weight]
+            self._counts[word] -= 1
+            if self._counts[word]:
+                continue
+            del self._counts[word], self._postings[word]
+            if len(word) >= MIN_FUZZY_LENGTH:
+                for variant in _deletes(word):
+                    self._deletions[variant].discard(word)
+                    if not self._deletions[variant]:
+                        del self._deletions[variant]
+
+    def _expand(self, word) -> dict:
+        """
+        Indexed words matching a query word: {word: similarity}.
+        """
+        matches = {word: 1.0} if word in self._counts else {}
+        if len(word) < MIN_FUZZY_LENGTH:
+            return matches
+        # Substitutions, transpositions and insertions share a deletion variant;
+        # a missing letter in the query is the query itself in the deletion index
+        variants = _deletes(word) | {word}
+        candidates = self._counts.keys() & variants
+        for variant in variants:
+            candidates |= self._deletions.get(variant, set())
+        for candidate in candidates:
+            matches.setdefault(candidate, FUZZY_PENALTY)
+        return matches
+
+    def _best(self, word):
+        """
+        Agents containing `word`, highest weight first, at most MAX_CANDIDATES.
+        """
+        taken = 0
+        for weight in sorted(self._postings[word], reverse=True):
+            for agent_id in self._postings[word][weight]:
+                yield agent_id, weight
+                taken += 1
+                if taken == MAX_CANDIDATES:
+                    return
+
+    def search(self, query: str, limit: int = 20, category: str = None) -> list:
+        """
+        Rank agents against a free-text query.
+
+        Returns:
+            list: (agent_id, score) pairs, best first.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+
+        with self._lock:
+            total = len(self._docs)
+            # Spelling variants of a word that is itself indexed only re-score
+            # agents found otherwise, instead of bringing in agents of their own
+            terms = [
+                (position, match, similarity, similarity == 1 or not known)
+                for position, word in enumerate(words)
+                for known in [word in self._counts]
+                for match, similarity in self._expand(word).items()
+            ]
+            terms.sort(key=lambda term: (not term[3], self._counts[term[1]]))
+            scores = defaultdict(float)
+            matched = defaultdict(set)
+            for position, word, similarity, finds in terms:
+                count = self._counts[word]
+                idf = math.log(1 + (total - count + 0.5) / (count + 0.5))
+                if finds and (count <= MAX_CANDIDATES or not scores):
+                    hits = self._best(word)
+                else:
+                    hits = (
+                        (agent_id, self._docs[agent_id][0].get(word))
+                        for agent_id in list(scores)
+                    )
+                for agent_id, weight in hits:
+                    if weight:
+                        scores[agent_id] += (
+                            similarity * idf * weight * (K1 + 1) / (weight + K1)
+                        )
+                        matched[agent_id].add(position)
+
+            if category is not None:
+                scores = {
+                    agent_id: score
+                    for agent_id, score in scores.items()
+                    if self._docs[agent_id][1] == category
+                }
+            # Agents matching every query word rank above those matching only some
+            ranked = heapq.nlargest(
+                limit,
+                (
+                    (score * len(matched[agent_id]) / len(words), agent_id)
+                    for agent_id, score in scores.items()
+                ),
+            )
+        return [(agent_id, round(score, 4)) for score, agent_id in ranked]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(db: Session) -> SearchIndex:
+    """
+    The process-wide SearchIndex, built from the agents table on first use.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    # Read outside the lock: under AsyncSession.run_sync the query yields to the
+    # event loop, and another request on the loop may be waiting for the lock
+    rows = db.execute(
+        select(Agent.id, Agent.name, Agent.description, Agent.category)
+    ).all()
+    with _index_lock:
+        if _index is None:
+            index = SearchIndex()
+            for agent_id, name, description, category in rows:
+                index.add(agent_id, name, description, category)
+            _index = index
+        return _index
+
+
+def reset_search_index():
+    """
+    Forget the in-process index, e.g. after the agents table was recreated.
+    """
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def postgres_search_statement(query: str, limit: int = 20, category: str = None):
+    """
+    The ranked search query run on Postgres, answered by ix_agents_search and
+    ix_agents_name_trgm.
+    """
+    vector = search_vector(Agent.name, Agent.category, Agent.description)
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    similarity = func.similarity(Agent.name, query)
+    score = (func.ts_rank(vector, ts_query) + similarity).label("score")
+    # Both conditions are answered by a GIN index; Postgres ORs the two bitmaps
+    statement = select(Agent.id, score).where(
+        vector.op("@@")(ts_query) | Agent.name.op("%")(query)
+    )
+    if category is not None:
+        statement = statement.where(Agent.category == category)
+    return statement.order_by(score.desc(), Agent.id).limit(limit)
+
+
+def _postgres_search(db, query, limit, category):
+    statement = postgres_search_statement(query, limit, category)
+    db.execute(
+        text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+        {"threshold": str(TRIGRAM_THRESHOLD)},
+    )
+    return [
+        (agent_id, round(float(score), 4)) for agent_id, score in db.execute(statement)
+    ]
+
+
+def search_agents(db: Session, query: str, limit: int = 20, category: str = None):
+    """
+    Search agents by name, category and description.
+
+    Returns:
+        list: (Agent, score) pairs, best first.
+    """
+    if _is_postgres(db):
+        hits = _postgres_search(db, query, limit, category)
+    else:
+        hits = get_search_index(db).search(query, limit, category)
+    if not hits:
+        return []
+    ids = [agent_id for agent_id, _ in hits]
+    agents = {agent.id: agent for agent in db.query(Agent).filter(Agent.id.in_(ids))}
+    return [(agents[agent_id], score) for agent_id, score in hits if agent_id in agents]
+
+
+def upsert_agents(db: Session, agents: list) -> list:
+    """
+    Insert or update agents by name and keep this process's search index current.
+    Args:
+        db (Session): Open session; the upsert is committed.
+        agents (list): Dicts with a `name` and any of UPSERT_FIELDS.
+
+    Returns:
+        list: The inserted or updated Agent rows.
+    """
+    by_name = {agent["name"]: agent for agent in agents}
+    existing = {
+        agent.name: agent
+        for agent in db.query(Agent).filter(Agent.name.in_(list(by_name)))
+    }
+    rows = []
+    for name, values in by_name.items():
+        row = existing.get(name)
+        if row is None:
+            row = Agent(name=name)
+            db.add(row)
+        for field in UPSERT_FIELDS:
+            if field in values:
+                setattr(row, field, values[field])
+        rows.append(row)
+    db.commit()
+
+    # Postgres maintains its GIN indexes itself; the in-process index only
+    # needs the changed agents once it has been built
+    if not _is_postgres(db) and _index is not None:
+        for row in rows:
+            _index.add(row.id, row.name, row.description, row.category)
+    return rows
@@ -0,0 +1,257 @@
+"""
+Trending engine: a time-decayed activity score per agent.
+
+Every highlight, review and rating adds its weight to the agent's score, and
+the weight halves every HALF_LIFE. Instead of decaying every agent on every
+run, an event at time t is stored as weight * 2 ** ((t - epoch) / HALF_LIFE):
+all scores then shrink by the same factor as time passes, so their order
+never changes without new activity, and a run only touches the agents that
+got some. The stored scores are rescaled (and the epoch moved) once the
+exponent grows large.
+
+refresh_trending() reads only the activity rows past the last watermark. In
+the same transaction it adds them to the agents' scores, rebuilds the top-K
+lists of the categories those agents are in and advances the watermark.
+GET /agent/trending then reads one precomputed list and never scans activity.
+
+Watermarks are (created_at, id) pairs, not ids: an id is taken when a row is
+inserted, not when it commits, so a row can appear below an id already read.
+created_at is set by the database when the row is inserted, and a row is only
+read once it is SETTLE old on that same clock. A row whose transaction commits
+within SETTLE therefore still sorts after the watermark.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.database import SessionLocal
+from backend.app.core.models import (
+    Agent,
+    Highlight,
+    Rating,
+    Review,
+    TrendingAgent,
+    TrendingState,
+)
+
+HALF_LIFE = timedelta(days=3)
+# Rescale stored scores once they reach 2 ** 60, far from float overflow
+REBASE_AFTER = 60 * HALF_LIFE
+TOP_K = 100
+OVERALL = ""
+# Activity rows younger than this, on the database clock, are left for the next
+# run, so a transaction committing up to SETTLE late is not skipped
+SETTLE = timedelta(seconds=5)
+REFRESH_SECONDS = float(os.getenv("TRENDING_REFRESH_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+
+# (model, watermark columns prefix on TrendingState, weight per event)
+ACTIVITY = [
+    (Highlight, "highlights", 3.0),
+    (Review, "reviews", 2.0),
+    (Rating, "ratings", 1.0),
+]
+
+
+def _exponent(moment: datetime, epoch: datetime) -> float:
+    return (moment - epoch) / HALF_LIFE
+
+
+def current_score(stored: float, epoch: datetime, now: datetime = None) -> float:
+    """
+    A stored score decayed to `now`, in units of fresh events' weight.
+    """
+    now = now or datetime.utcnow()
+    return stored * 2 ** -_exponent(now, epoch)
+
+
+def database_now(db: Session) -> datetime:
+    """
+    The database clock, which sets created_at, as a naive datetime.
+    """
+    now = db.scalar(select(func.now()))
+    # Postgres returns now() in the session time zone, the zone created_at is stored in
+    return now.replace(tzinfo=None)
+
+
+def _state(db: Session, now: datetime) -> TrendingState:
+    state = db.query(TrendingState).with_for_update().first()
+    if state is None:
+        state = TrendingState(epoch=now, highlights_id=0, reviews_id=0, ratings_id=0)
+        db.add(state)
+        db.flush()
+    return state
+
+
+def _rebase(db, state, now):
+    factor = 2 ** -_exponent(now, state.epoch)
+    db.execute(
+        update(Agent)
+        .where(Agent.trending_score > 0)
+        .values(trending_score=Agent.trending_score * factor)
+    )
+    db.execute(update(TrendingAgent).values(score=TrendingAgent.score * factor))
+    state.epoch = now
+    logger.info(f"Rebased trending scores to epoch {now.isoformat()}")
+
+
+def _new_activity(db, state, now):
+    """
+    Score increments per agent from the settled activity past the watermarks.
+    """
+    deltas = defaultdict(float)
+    for model, watermark, weight in ACTIVITY:
+        last_at = getattr(state, f"{watermark}_at")
+        last_id = getattr(state, f"{watermark}_id")
+        if last_at is None:
+            # First run, or a state row written before watermarks had a time
+            past = model.id > last_id
+        else:
+            past = tuple_(model.created_at, model.id) > tuple_(last_at, last_id)
+        rows = db.execute(
+            select(model.id, model.agent_id, model.created_at)
+            .where(past, model.created_at <= now - SETTLE)
+            .order_by(model.created_at, model.id)
+        )
+        last = None
+        for row_id, agent_id, created_at in rows:
+            if agent_id is not None:
+                deltas[agent_id] += weight * 2 ** _exponent(created_at, state.epoch)
+            last = created_at, row_id
+        if last is not None:
+            setattr(state, f"{watermark}_at", last[0])
+            setattr(state, f"{watermark}_id", last[1])
+    return deltas
+
+
+def _rebuild_top(db, category):
+    query = select(Agent.id, Agent.trending_score).where(Agent.trending_score > 0)
+    if category != OVERALL:
+        query = query.where(Agent.category == category)
+    rows = db.execute(
+        query.order_by(Agent.trending_score.desc(), Agent.id.desc()).limit(TOP_K)
+    ).all()
+    db.execute(delete(TrendingAgent).where(TrendingAgent.category == category))
+    if rows:
+        db.execute(
+            insert(TrendingAgent.__table__),
+            [
+                {"category": category, "rank": rank, "agent_id": agent, "score": score}
+                for rank, (agent, score) in enumerate(rows, start=1)
+            ],
+        )
+
+
+def refresh_trending(db: Session, now: datetime = None) -> dict:
+    """
+    Fold the activity since the last run into the trending scores and lists,
+    and commit.
+    Args:
+        db (Session): Open session
+        now (datetime): Time of the run on the database clock, defaults to its
+            current time
+
+    Returns:
+        dict: Counts of agents whose score changed and lists rebuilt.
+    """
+    now = now or database_now(db)
+    state = _state(db, now)
+    if now - state.epoch > REBASE_AFTER:
+        _rebase(db, state, now)
+
+    deltas = _new_activity(db, state, now)
+    categories = set()
+    if deltas:
+        agents = Agent.__table__.c
+        db.connection().execute(
+            update(Agent.__table__)
+            .where(agents.id == bindparam("agent_id"))
+            .values(trending_score=agents.trending_score + bindparam("delta")),
+            [{"agent_id": agent, "delta": delta} for agent, delta in deltas.items()],
+        )
+        categories = {
+            category
+            for (category,) in db.execute(
+                select(Agent.category).where(Agent.id.in_(list(deltas))).distinct()
+            )
+            if category is not None
+        }
+        # Only lists containing an agent with new activity can change order
+        for category in sorted(categories) + [OVERALL]:
+            _rebuild_top(db, category)
+    state.refreshed_at = now
+    db.commit()
+
+    stats = {"agents": len(deltas), "lists": len(categories) + 1 if deltas else 0}
+    logger.info(f"Trending refreshed: {stats}")
+    return stats
+
+
+def trending_agents(db: Session, category: str = None, limit: int = 20, now=None):
+    """
+    The precomputed trending list of a category (overall when None), with scores
+    decayed to `now`, by default the database's current time.
+
+    Returns:
+        list: (Agent, current score) pairs, best first.
+    """
+    row = db.query(TrendingState, func.now()).first()
+    if row is None:
+        return []
+    state, database_time = row
+    now = now or database_time.replace(tzinfo=None)
+    rows = (
+        db.query(Agent, TrendingAgent.score)
+        .join(TrendingAgent, TrendingAgent.agent_id == Agent.id)
+        .filter(TrendingAgent.category == (OVERALL if category is None else category))
+        .order_by(TrendingAgent.rank)
+        .limit(limit)
+        .all()
+    )
+    return [
+        (agent, round(current_score(score, state.epoch, now), 4))
+        for agent, score in rows
+    ]
+
+
+def start_trending_worker(interval: float = REFRESH_SECONDS) -> threading.Event:
+    """
+    Run refresh_trending() every `interval` seconds on a daemon thread.
+
+    Returns:
+        threading.Event: Set it to stop the worker.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            started = time.monotonic()
+            db = SessionLocal()
+            try:
+                refresh_trending(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Trending refresh failed: {e}", exc_info=True)
+            finally:
+                db.close()
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    threading.Thread(target=run, name="trending-worker", daemon=True).start()
+    return stop
+
+
+if __name__ == "__main__":
+    # One-off refresh, e.g. from cron: python -m backend.app.core.trending
+    session = SessionLocal()
+    try:
+        print(refresh_trending(session))
+    finally:
+        session.close()
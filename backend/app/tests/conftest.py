@@ -0,0 +1,79 @@
+"""Shared fixtures: the app runs against a throwaway SQLite database."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# A file rather than sqlite://, so the sync and async engines share the database
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+# Tests run the trending job themselves
+os.environ.setdefault("TRENDING_REFRESH_SECONDS", "0")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from backend.app.app import app  # noqa: E402
+from backend.app.core.database import (  # noqa: E402
+    Base,
+    SessionLocal,
+    async_engine,
+    engine,
+    init_db,
+)
+from backend.app.core.search import reset_search_index  # noqa: E402
+
+
+@pytest.fixture
+def session():
+    init_db()
+    db = SessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(engine)
+    reset_search_index()
+
+
+@pytest.fixture
+def client(session):
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements():
+    """
+    (statement, parameters) of every query sent on either engine while the
+    test runs.
+    """
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engines = (engine, async_engine.sync_engine)
+    for bind in engines:
+        event.listen(bind, "before_cursor_execute", capture)
+    yield captured
+    for bind in engines:
+        event.remove(bind, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def query_budget(statements):
+    """
+    `with query_budget(n): ...` fails when the block sends more than n queries,
+    listing the queries it sent.
+    """
+
+    @contextmanager
+    def budget(limit):
+        start = len(statements)
+        yield
+        sent = [statement for statement, _ in statements[start:]]
+        assert len(sent) <= limit, (
+            f"{len(sent)} queries over a budget of {limit}:\n" + "\n\n".join(sent)
+        )
+
+    return budget
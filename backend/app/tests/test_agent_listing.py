@@ -0,0 +1,86 @@
+"""Keyset pagination and filters of GET /agent."""
+
+from datetime import datetime, timedelta
+
+from backend.app.api.utils.pagination import encode_cursor
+from backend.app.core.models import Agent
+
+START = datetime(2025, 7, 1)
+
+
+def seed(session, count=45):
+    # Several agents share a created_at, so the id tie-breaker matters
+    session.add_all(
+        [
+            Agent(
+                name=f"Agent {i}",
+                category="Writing" if i % 3 else "Video",
+                trending=i % 2 == 0,
+                created_at=START + timedelta(hours=i // 4),
+            )
+            for i in range(count)
+        ]
+    )
+    session.commit()
+
+
+def fetch_all(client, **params):
+    names, cursor, pages = [], None, 0
+    while True:
+        page_params = {**params, "cursor": cursor} if cursor else params
+        response = client.get("/agent", params=page_params)
+        assert response.status_code == 200
+        body = response.json()
+        names.extend(agent["name"] for agent in body["agents"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return names, pages
+
+
+def test_pages_cover_every_agent_once_newest_first(client, session):
+    seed(session)
+    names, pages = fetch_all(client, limit=10)
+
+    assert pages == 5
+    assert len(names) == len(set(names)) == 45
+    expected = session.query(Agent).order_by(Agent.created_at.desc(), Agent.id.desc())
+    assert names == [agent.name for agent in expected]
+
+
+def test_filters_use_keyset_pages(client, session):
+    seed(session)
+    names, _ = fetch_all(client, category="Video", trending=True, limit=4)
+
+    expected = session.query(Agent).filter_by(category="Video", trending=True)
+    assert sorted(names) == sorted(agent.name for agent in expected)
+
+
+def test_page_size_is_bounded(client, session):
+    seed(session, 5)
+    assert client.get("/agent", params={"limit": 101}).status_code == 422
+    assert client.get("/agent", params={"limit": 0}).status_code == 422
+    assert len(client.get("/agent").json()["agents"]) == 5
+
+
+def test_invalid_cursor_is_rejected(client, session):
+    assert client.get("/agent", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_deep_pages_are_index_range_scans(client, session, statements):
+    seed(session)
+    cursor = encode_cursor(START + timedelta(hours=3), 10)
+    del statements[:]
+    client.get("/agent", params={"category": "Video", "cursor": cursor})
+
+    statement, parameters = next(
+        (statement, parameters)
+        for statement, parameters in reversed(statements)
+        if statement.lstrip().startswith("SELECT") and "FROM agents" in statement
+    )
+    plan = session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_agents_category_created_at_id" in detail
+    assert "TEMP B-TREE" not in detail
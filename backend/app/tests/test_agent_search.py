@@ -0,0 +1,133 @@
+"""
+GET /agent/search and the in-process search index.
+
+- test name matches rank above category and description matches
+- test misspelled words still match
+- test the category filter and the query validation
+- test upsert_agents updates the built index in place, matching a full rebuild
+- test the Postgres query filters on the exact expressions of its GIN indexes
+"""
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from backend.app.core import search
+from backend.app.core.models import Agent
+from backend.app.core.search import (
+    SearchIndex,
+    get_search_index,
+    postgres_search_statement,
+    upsert_agents,
+)
+
+AGENTS = [
+    {
+        "name": "Summarizer",
+        "category": "Writing",
+        "description": "Turns long articles into short notes",
+    },
+    {
+        "name": "Note Taker",
+        "category": "Productivity",
+        "description": "Meeting notes with an automatic summarizer",
+    },
+    {
+        "name": "Clip Maker",
+        "category": "Video",
+        "description": "Cuts podcasts into short video clips",
+    },
+    {
+        "name": "Copy Writer",
+        "category": "Writing",
+        "description": "Marketing copy for landing pages",
+    },
+]
+
+QUERIES = ["summarizer", "sumarizer", "short notes", "writing", "video clip", "copy"]
+
+
+def names(response):
+    assert response.status_code == 200
+    return [agent["name"] for agent in response.json()["agents"]]
+
+
+def test_search_ranks_name_matches_first(client, session):
+    upsert_agents(session, AGENTS)
+
+    assert names(client.get("/agent/search", params={"q": "summarizer"})) == [
+        "Summarizer",
+        "Note Taker",
+    ]
+    hits = client.get("/agent/search", params={"q": "short notes"}).json()["agents"]
+    assert hits[0]["name"] == "Summarizer"
+    assert [hit["score"] for hit in hits] == sorted(
+        (hit["score"] for hit in hits), reverse=True
+    )
+
+
+def test_search_tolerates_typos(client, session):
+    upsert_agents(session, AGENTS)
+
+    def top(q):
+        return names(client.get("/agent/search", params={"q": q}))
+
+    assert top("sumarizer")[0] == "Summarizer"
+    assert top("podcsats") == ["Clip Maker"]
+    assert top("qwertyuiop") == []
+
+
+def test_search_filters_and_validates(client, session):
+    upsert_agents(session, AGENTS)
+
+    assert names(
+        client.get("/agent/search", params={"q": "short", "category": "Video"})
+    ) == ["Clip Maker"]
+    assert client.get("/agent/search", params={"q": ""}).status_code == 422
+    assert client.get("/agent/search").status_code == 422
+
+
+def test_upsert_updates_the_index_in_place(session):
+    upsert_agents(session, AGENTS)
+    index = get_search_index(session)
+
+    upsert_agents(
+        session,
+        [
+            {"name": "Clip Maker", "description": "Generates thumbnails for videos"},
+            {
+                "name": "Voice Cloner",
+                "category": "Audio",
+                "description": "Clones voices",
+            },
+        ],
+    )
+
+    assert get_search_index(session) is index
+    assert session.query(Agent).count() == 5
+    assert [agent.name for agent, _ in search.search_agents(session, "podcasts")] == []
+    assert [agent.name for agent, _ in search.search_agents(session, "thumbnail")] == [
+        "Clip Maker"
+    ]
+
+    rebuilt = SearchIndex()
+    for agent in session.query(Agent):
+        rebuilt.add(agent.id, agent.name, agent.description, agent.category)
+    for query in QUERIES + ["voices", "thumbnails"]:
+        assert index.search(query) == rebuilt.search(query)
+
+
+def test_postgres_query_matches_its_indexes():
+    dialect = postgresql.dialect()
+    statement = postgres_search_statement("sumarizer", 5, "Writing")
+    where = str(statement.whereclause.compile(dialect=dialect))
+    indexes = {
+        index.name: str(CreateIndex(index).compile(dialect=dialect))
+        for index in Agent.__table__.indexes
+    }
+
+    # Postgres only uses an expression index for the identical expression
+    vector = indexes["ix_agents_search"].split("USING gin ", 1)[1][1:-1]
+    assert f"{vector} @@ websearch_to_tsquery(" in where.replace("agents.", "")
+    assert "(name gin_trgm_ops)" in indexes["ix_agents_name_trgm"]
+    assert "agents.name %% " in where
+    assert "agents.category = " in where
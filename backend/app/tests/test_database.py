@@ -0,0 +1,38 @@
+"""
+Async database layer.
+
+- test database URLs map to their async drivers
+- test concurrent requests on the async routes each get their own session
+"""
+
+import asyncio
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from backend.app.app import app
+from backend.app.core.database import async_url
+from backend.app.core.models import Agent
+
+
+def test_async_url():
+    assert async_url("postgresql+psycopg2://u:p@db:5432/agents") == make_url(
+        "postgresql+asyncpg://u:p@db:5432/agents"
+    )
+    assert async_url("sqlite:///test.db") == make_url("sqlite+aiosqlite:///test.db")
+
+
+def test_concurrent_async_requests(session):
+    session.add_all([Agent(name=f"Agent {i}", category="Writing") for i in range(30)])
+    session.commit()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await asyncio.gather(
+                *(c.get("/agent", params={"limit": 10}) for _ in range(100))
+            )
+
+    responses = asyncio.run(run())
+    assert {response.status_code for response in responses} == {200}
+    assert {len(response.json()["agents"]) for response in responses} == {10}
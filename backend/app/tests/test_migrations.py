@@ -0,0 +1,145 @@
+"""
+Alembic migrations.
+
+- test upgrading a database created before migrations backfills the rating
+  aggregates and ends at the models' schema
+- test agents with a NULL created_at are backfilled and reachable through the
+  listing's cursor pages
+- test a new database upgrades to the models' schema and downgrades to empty
+- test the migrated search index has the expression the search query uses
+"""
+
+import importlib.util
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.api.utils.pagination import keyset_statement, split_page
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from backend.app.core.database import Base
+from backend.app.core.models import Agent
+
+BACKEND = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND / "alembic.ini"
+# Created by Postgres only (ddl_if), so never present on SQLite
+POSTGRES_ONLY = {"ix_agents_search", "ix_agents_name_trgm"}
+
+
+def alembic_config(url):
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def schema_diff(engine):
+    with engine.connect() as connection:
+        diffs = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    return [
+        diff
+        for diff in diffs
+        if not (diff[0] == "add_index" and diff[1].name in POSTGRES_ONLY)
+    ]
+
+
+def test_upgrade_from_baseline_backfills_ratings(tmp_path):
+    url = f"sqlite:///{tmp_path / 'baseline.db'}"
+    config = alembic_config(url)
+    engine = create_engine(url)
+    command.upgrade(config, "0001_baseline")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, email, hashed_password) VALUES "
+                "('a', 'a@x.io', 'x'), ('b', 'b@x.io', 'x'), ('c', 'c@x.io', 'x')"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO agents (name, category) VALUES ('One', 'W'), ('Two', 'W')")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO ratings (user_id, agent_id, value) VALUES "
+                "(1, 1, 5), (2, 1, 3), (3, 1, 5), (1, 2, 2)"
+            )
+        )
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT id, rating_count, rating_sum, rating_2, rating_3, rating_5, "
+                "trending_score FROM agents ORDER BY id"
+            )
+        ).all()
+    assert [tuple(row) for row in rows] == [(1, 3, 13, 0, 1, 2, 0), (2, 1, 2, 1, 0, 0, 0)]
+    assert schema_diff(engine) == []
+    engine.dispose()
+
+
+def test_upgrade_backfills_null_created_at(tmp_path):
+    url = f"sqlite:///{tmp_path / 'baseline.db'}"
+    config = alembic_config(url)
+    engine = create_engine(url)
+    command.upgrade(config, "0001_baseline")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO agents (name, created_at, updated_at) VALUES "
+                "('Dated', '2025-07-02 00:00:00.000000', NULL), "
+                "('Updated', NULL, '2025-07-01 00:00:00.000000'), "
+                "('Undated', NULL, NULL)"
+            )
+        )
+
+    command.upgrade(config, "head")
+
+    with Session(engine) as session:
+        names, cursor = [], None
+        for _ in range(4):
+            statement = keyset_statement(select(Agent), Agent, 1, cursor)
+            rows = session.scalars(statement).all()
+            page, cursor = split_page(rows, 1)
+            names.extend(agent.name for agent in page)
+            if cursor is None:
+                break
+        assert names == ["Undated", "Dated", "Updated"]
+
+    with pytest.raises(IntegrityError), engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO agents (name, created_at) VALUES ('Null', NULL)")
+        )
+    engine.dispose()
+
+
+def test_new_database_upgrades_and_downgrades(tmp_path):
+    url = f"sqlite:///{tmp_path / 'new.db'}"
+    config = alembic_config(url)
+    engine = create_engine(url)
+
+    command.upgrade(config, "head")
+    assert schema_diff(engine) == []
+
+    command.downgrade(config, "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+
+def test_migrated_search_index_matches_model():
+    path = BACKEND / "migrations" / "versions" / "0002_listing_search_ratings.py"
+    spec = importlib.util.spec_from_file_location("listing_search_ratings", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    index = next(i for i in Agent.__table__.indexes if i.name == "ix_agents_search")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl.endswith(f"USING gin (({migration.SEARCH_VECTOR}))")
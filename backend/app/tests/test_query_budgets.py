@@ -0,0 +1,98 @@
+"""
+Query budgets of the agent endpoints.
+
+- test agent detail loads reviews and their authors in a fixed number of queries
+- test each listing endpoint stays within its budget
+- test the budget fixture fails an endpoint that goes over
+- test the detail loader raises on relationships of reviews and their authors
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from backend.app.api.schema import AgentDetail
+from backend.app.api.utils.loading import load_for
+from backend.app.core.models import Agent, Rating, Review, User
+from backend.app.core.trending import refresh_trending
+
+
+def seed(session, reviews):
+    agent = Agent(name="Summarizer", category="Writing", description="Short notes")
+    users = [
+        User(username=f"user{i}", email=f"user{i}@x.io", hashed_password="x")
+        for i in range(reviews)
+    ]
+    session.add(agent)
+    session.add_all(users)
+    session.flush()
+    session.add_all(
+        [
+            Review(user=user, agent=agent, content=f"Review {i}")
+            for i, user in enumerate(users)
+        ]
+    )
+    session.add_all([Rating(user=user, agent=agent, value=4) for user in users[:10]])
+    session.commit()
+    return agent.id
+
+
+@pytest.mark.parametrize("reviews", [1, 500])
+def test_agent_detail_is_constant_queries(client, session, query_budget, reviews):
+    agent_id = seed(session, reviews)
+
+    # The agent, then all its reviews with their authors
+    with query_budget(2):
+        response = client.get(f"/agent/{agent_id}")
+
+    body = response.json()
+    assert len(body["reviews"]) == reviews
+    assert {review["user"]["username"] for review in body["reviews"]} == {
+        f"user{i}" for i in range(reviews)
+    }
+    assert body["rating"]["count"] == min(reviews, 10)
+
+
+def test_agent_detail_not_found(client, session):
+    assert client.get("/agent/12345").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "path, params, budget",
+    [
+        ("/agent", {"category": "Writing"}, 1),
+        # The first search also loads the in-process index
+        ("/agent/search", {"q": "summarizer"}, 2),
+        ("/agent/top-rated", {"category": "Writing"}, 1),
+        ("/agent/trending", {}, 2),
+    ],
+)
+def test_listing_budgets(client, session, query_budget, path, params, budget):
+    seed(session, 50)
+    refresh_trending(session)
+
+    with query_budget(budget):
+        response = client.get(path, params=params)
+    assert response.status_code == 200
+
+
+def test_budget_fails_when_exceeded(client, session, query_budget):
+    seed(session, 3)
+    with pytest.raises(AssertionError, match="over a budget of 1"):
+        with query_budget(1):
+            client.get("/agent/1")
+
+
+def test_detail_loader_raises_below_reviews(session):
+    agent_id = seed(session, 2)
+    session.expunge_all()
+
+    agent = session.scalars(
+        load_for(select(Agent).where(Agent.id == agent_id), AgentDetail)
+    ).one()
+    review = agent.reviews[0]
+    assert review.user.username.startswith("user")
+    unloaded = [(agent, "ratings"), (review, "agent"), (review.user, "ratings")]
+    for owner, relationship in unloaded:
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            getattr(owner, relationship)
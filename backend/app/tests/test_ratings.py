@@ -0,0 +1,147 @@
+"""
+Incremental rating aggregates and GET /agent/top-rated.
+
+- test random rating creates, changes and deletes keep every agent's
+  aggregates equal to a full recompute
+- test loaded agents see the new aggregates after a flush
+- test recompute_rating_stats repairs aggregates after a bulk delete
+- test top rated ranking, category filter and that it never reads ratings
+"""
+
+import random
+
+import pytest
+
+from backend.app.core.models import Agent, Rating, User
+from backend.app.core.models.rating import RATING_FIELDS
+from backend.app.core.ratings import compute_rating_stats, recompute_rating_stats
+
+
+def seed(session, agents=6, users=12):
+    session.add_all(
+        [
+            Agent(name=f"Agent {i}", category="Writing" if i % 2 else "Video")
+            for i in range(agents)
+        ]
+    )
+    session.add_all(
+        [
+            User(username=f"user{i}", email=f"user{i}@x.io", hashed_password="x")
+            for i in range(users)
+        ]
+    )
+    session.commit()
+
+
+def stored_stats(session):
+    return {
+        agent.id: {field: getattr(agent, field) for field in RATING_FIELDS}
+        for agent in session.query(Agent).filter(Agent.rating_count > 0)
+    }
+
+
+def assert_matches_recompute(session):
+    stored, recomputed = stored_stats(session), compute_rating_stats(session)
+    assert stored.keys() == recomputed.keys()
+    for agent_id, fields in recomputed.items():
+        assert stored[agent_id] == pytest.approx(fields)
+
+
+def test_incremental_aggregates_match_recompute(session):
+    seed(session)
+    rng = random.Random(7)
+    agent_ids = [agent.id for agent in session.query(Agent)]
+    user_ids = [user.id for user in session.query(User)]
+
+    for step in range(300):
+        user_id, agent_id = rng.choice(user_ids), rng.choice(agent_ids)
+        rating = (
+            session.query(Rating).filter_by(user_id=user_id, agent_id=agent_id).first()
+        )
+        if rating is None:
+            value = rng.randint(1, 5)
+            session.add(Rating(user_id=user_id, agent_id=agent_id, value=value))
+        elif rng.random() < 0.5:
+            rating.value = rng.randint(1, 5)
+        else:
+            session.delete(rating)
+        session.commit()
+        if step % 25 == 0:
+            assert_matches_recompute(session)
+
+    # Deleting a user cascades through the ORM to their ratings
+    session.delete(session.get(User, user_ids[0]))
+    session.commit()
+    assert_matches_recompute(session)
+    assert session.query(Rating).count() > 0
+
+
+def test_loaded_agent_sees_new_aggregates(session):
+    seed(session, agents=1, users=2)
+    agent = session.query(Agent).one()
+    assert agent.rating_count == 0
+
+    session.add(Rating(user_id=1, agent_id=agent.id, value=5))
+    session.flush()
+    assert (agent.rating_count, agent.rating_sum, agent.rating_5) == (1, 5, 1)
+
+    session.query(Rating).one().value = 1
+    session.commit()
+    assert (agent.rating_count, agent.rating_sum) == (1, 1)
+    assert (agent.rating_1, agent.rating_5) == (1, 0)
+
+
+def test_recompute_repairs_bulk_writes(session):
+    seed(session, agents=2, users=3)
+    session.add_all(
+        [Rating(user_id=user, agent_id=1, value=4) for user in (1, 2, 3)]
+        + [Rating(user_id=1, agent_id=2, value=2)]
+    )
+    session.commit()
+
+    # Bulk deletes bypass the ORM listeners
+    session.query(Rating).filter(Rating.user_id == 1).delete()
+    session.commit()
+    assert session.get(Agent, 1).rating_count == 3
+
+    assert recompute_rating_stats(session) == 1
+    assert_matches_recompute(session)
+    assert session.get(Agent, 2).rating_count == 0
+
+
+def test_top_rated(client, session, statements):
+    seed(session, agents=4, users=10)
+    ratings = {
+        1: [5],  # one perfect rating
+        2: [5] * 8 + [4] * 2,  # consistently great
+        3: [3] * 10,
+        4: [4] * 6,
+    }
+    session.add_all(
+        [
+            Rating(user_id=user, agent_id=agent_id, value=value)
+            for agent_id, values in ratings.items()
+            for user, value in enumerate(values, start=1)
+        ]
+    )
+    session.add(Agent(name="Unrated", category="Video"))
+    session.commit()
+
+    del statements[:]
+    body = client.get("/agent/top-rated").json()
+
+    assert [agent["name"] for agent in body["agents"]] == [
+        "Agent 1",
+        "Agent 3",
+        "Agent 0",
+        "Agent 2",
+    ]
+    assert body["agents"][0]["rating"] == {
+        "count": 10,
+        "average": 4.8,
+        "histogram": {"1": 0, "2": 0, "3": 0, "4": 2, "5": 8},
+    }
+    assert not any("FROM ratings" in statement for statement, _ in statements)
+
+    video = client.get("/agent/top-rated", params={"category": "Video"}).json()
+    assert [agent["name"] for agent in video["agents"]] == ["Agent 0", "Agent 2"]
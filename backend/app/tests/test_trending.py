@@ -0,0 +1,218 @@
+"""
+Trending scores and GET /agent/trending.
+
+- test incremental refreshes match decaying all activity from scratch
+- test a refresh only reads activity past the watermark and leaves unsettled rows
+- test a row with a lower id than one already read is still counted
+- test a state row with only id watermarks carries on from them
+- test refreshes default to the database clock
+- test rebasing the epoch keeps scores and order
+- test recent activity outranks a larger but older burst
+- test the endpoint serves the precomputed lists without reading activity tables
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.core import trending
+from backend.app.core.models import (
+    Agent,
+    Highlight,
+    Rating,
+    Review,
+    TrendingAgent,
+    TrendingState,
+    User,
+)
+from backend.app.core.trending import (
+    HALF_LIFE,
+    REBASE_AFTER,
+    TOP_K,
+    SETTLE,
+    current_score,
+    database_now,
+    refresh_trending,
+)
+
+START = datetime(2025, 7, 1)
+
+
+def seed(session, agents=4, users=6):
+    session.add_all(
+        [
+            Agent(name=f"Agent {i}", category="Writing" if i % 2 else "Video")
+            for i in range(agents)
+        ]
+    )
+    session.add_all(
+        [
+            User(username=f"user{i}", email=f"user{i}@x.io", hashed_password="x")
+            for i in range(users)
+        ]
+    )
+    session.commit()
+
+
+def add_activity(session, model, user_id, agent_id, at, **fields):
+    session.add(model(user_id=user_id, agent_id=agent_id, created_at=at, **fields))
+    session.commit()
+
+
+def expected_scores(session, now):
+    # Full recompute: decay every activity row to `now`
+    scores = {}
+    for model, _, weight in trending.ACTIVITY:
+        for row in session.query(model):
+            age = (now - row.created_at) / HALF_LIFE
+            scores[row.agent_id] = scores.get(row.agent_id, 0) + weight * 2**-age
+    return scores
+
+
+def stored_scores(session, now):
+    epoch = session.query(TrendingState).one().epoch
+    return {
+        agent.id: current_score(agent.trending_score, epoch, now)
+        for agent in session.query(Agent).filter(Agent.trending_score > 0)
+    }
+
+
+def test_incremental_refresh_matches_recompute(session):
+    seed(session)
+    rng = random.Random(3)
+    pairs = [(user, agent) for user in range(1, 7) for agent in range(1, 5)]
+    highlights, ratings = rng.sample(pairs, 18), rng.sample(pairs, 6)
+    now = START
+    for day in range(6):
+        for hour in range(3):
+            at = START + timedelta(days=day, hours=hour)
+            user, agent = highlights[day * 3 + hour]
+            add_activity(session, Highlight, user, agent, at)
+            add_activity(session, Review, user, agent, at, content="Nice")
+        user, agent = ratings[day]
+        add_activity(session, Rating, user, agent, at, value=rng.randint(1, 5))
+        now = START + timedelta(days=day + 1)
+        refresh_trending(session, now)
+
+    assert stored_scores(session, now) == pytest.approx(expected_scores(session, now))
+
+
+def test_refresh_reads_past_the_watermark_only(session):
+    seed(session)
+    add_activity(session, Highlight, 1, 1, START)
+    assert refresh_trending(session, START + timedelta(minutes=1)) == {
+        "agents": 1,
+        "lists": 2,
+    }
+    assert refresh_trending(session, START + timedelta(minutes=2)) == {
+        "agents": 0,
+        "lists": 0,
+    }
+
+    # Too recent to be settled: left for the next run
+    now = START + timedelta(minutes=3)
+    add_activity(session, Highlight, 2, 2, now - timedelta(seconds=1))
+    assert refresh_trending(session, now)["agents"] == 0
+    assert refresh_trending(session, now + timedelta(minutes=1))["agents"] == 1
+    assert session.query(TrendingState).one().highlights_id == 2
+
+
+def test_late_commit_below_the_watermark_is_counted(session):
+    seed(session)
+    now = START + timedelta(hours=1)
+    # id 1 is still settling while id 2, from a transaction that started
+    # earlier but committed later, is already settled
+    add_activity(session, Highlight, 1, 1, now - SETTLE / 2)
+    add_activity(session, Highlight, 2, 2, now - 2 * SETTLE)
+    assert refresh_trending(session, now)["agents"] == 1
+
+    later = now + timedelta(minutes=1)
+    assert refresh_trending(session, later)["agents"] == 1
+    assert stored_scores(session, later) == pytest.approx(
+        expected_scores(session, later)
+    )
+    state = session.query(TrendingState).one()
+    assert (state.highlights_at, state.highlights_id) == (now - SETTLE / 2, 1)
+
+
+def test_id_only_watermark_carries_on(session):
+    seed(session)
+    add_activity(session, Highlight, 1, 1, START)
+    session.add(
+        TrendingState(epoch=START, highlights_id=1, reviews_id=0, ratings_id=0)
+    )
+    session.commit()
+    add_activity(session, Highlight, 2, 2, START)
+
+    assert refresh_trending(session, START + timedelta(minutes=1))["agents"] == 1
+    assert session.get(Agent, 1).trending_score == 0
+    assert session.query(TrendingState).one().highlights_at == START
+
+
+def test_refresh_uses_database_clock(session):
+    seed(session)
+    session.add(Highlight(user_id=1, agent_id=1))
+    session.commit()
+    stamped = session.query(Highlight).one().created_at
+
+    # Not settled yet on the clock that stamped it
+    assert refresh_trending(session)["agents"] == 0
+    assert session.query(TrendingState).one().refreshed_at >= stamped
+    assert refresh_trending(session, database_now(session) + SETTLE)["agents"] == 1
+
+
+def test_rebase_keeps_scores(session):
+    seed(session)
+    add_activity(session, Highlight, 1, 1, START)
+    add_activity(session, Review, 1, 2, START, content="Nice")
+    refresh_trending(session, START + timedelta(minutes=1))
+
+    later = START + REBASE_AFTER + timedelta(days=1)
+    before = stored_scores(session, later)
+    refresh_trending(session, later)
+    assert session.query(TrendingState).one().epoch == later
+    assert stored_scores(session, later) == pytest.approx(before)
+    overall = session.query(TrendingAgent).filter_by(category="").order_by("rank")
+    assert [row.agent_id for row in overall] == [1, 2]
+
+
+def test_recent_activity_outranks_old_burst(client, session):
+    # The endpoint decays scores to the current time
+    now = datetime.utcnow()
+    seed(session)
+    for user in range(1, 7):
+        add_activity(session, Highlight, user, 1, now - 4 * HALF_LIFE)
+    add_activity(session, Highlight, 1, 2, now - timedelta(hours=1))
+    refresh_trending(session, now)
+
+    # 6 highlights four half-lives ago weigh 6/16 of one fresh highlight
+    body = client.get("/agent/trending").json()
+    assert [agent["name"] for agent in body["agents"]] == ["Agent 1", "Agent 0"]
+
+
+def test_endpoint_serves_precomputed_lists(client, session, statements):
+    now = datetime.utcnow()
+    seed(session, agents=6)
+    for agent in range(1, 7):
+        for user in range(1, agent + 1):
+            add_activity(session, Highlight, user, agent, now - timedelta(hours=1))
+    refresh_trending(session, now)
+    assert session.query(TrendingAgent).filter_by(category="").count() == min(6, TOP_K)
+
+    del statements[:]
+    body = client.get("/agent/trending", params={"category": "Writing"}).json()
+
+    assert body["category"] == "Writing"
+    assert [agent["name"] for agent in body["agents"]] == [
+        "Agent 5",
+        "Agent 3",
+        "Agent 1",
+    ]
+    scores = [agent["score"] for agent in body["agents"]]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+    assert not any(
+        f"FROM {table}" in statement
+        for statement, _ in statements
+        for table in ("highlights", "reviews", "ratings")
+    )
@@ -0,0 +1,141 @@
+"""
+Load test: sync vs async database sessions on the agent listing.
+
+Serves the same keyset-paginated listing twice: GET /agent from the app's
+router (async def, AsyncSession on the async engine) and GET /sync/agent
+(plain def on the sync engine, run in Starlette's threadpool). `--clients`
+concurrent clients then request random pages of each for `--seconds`, and the
+run reports requests/sec and p50/p99 latency per path.
+
+By default the app is driven in-process through httpx's ASGI transport. Pass
+`--url` to load a server started separately instead, e.g.
+`uvicorn backend.benchmarks.bench_db_load:app`; requests then go over HTTP.
+
+Usage (from the repository root, against the database in DATABASE_URL):
+    python -m backend.benchmarks.bench_db_load [--clients 500] [--seconds 20]
+        [--agents 10000] [--url http://localhost:8000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.app.api.route import agent
+from backend.app.api.schema import AgentPage
+from backend.app.api.utils.pagination import keyset_statement, split_page
+from backend.app.core.database import DB_POOL_SIZE, SessionLocal, get_db, init_db
+from backend.app.core.models import Agent
+
+CATEGORIES = ["Writing", "Video", "Audio", "Code", "Marketing"]
+
+app = FastAPI()
+app.include_router(agent.router)
+
+
+@app.get("/sync/agent", response_model=AgentPage)
+def list_agents_sync(
+    category: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    statement = select(Agent)
+    if category is not None:
+        statement = statement.where(Agent.category == category)
+    rows = db.scalars(keyset_statement(statement, Agent, limit)).all()
+    agents, next_cursor = split_page(rows, limit)
+    return {"agents": agents, "next_cursor": next_cursor}
+
+
+def seed(count):
+    init_db()
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).select_from(Agent))
+        start = datetime(2025, 1, 1)
+        db.add_all(
+            [
+                Agent(
+                    name=f"Load test agent {i}",
+                    category=CATEGORIES[i % len(CATEGORIES)],
+                    created_at=start + timedelta(minutes=i),
+                )
+                for i in range(existing, count)
+            ]
+        )
+        db.commit()
+
+
+async def run_clients(client, path, clients, seconds):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker(rng):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            params = {"category": rng.choice(CATEGORIES), "limit": 20}
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(i)) for i in range(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--url", help="Base URL of a running server")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL") and not os.getenv("DB_HOST"):
+        parser.error("Set DATABASE_URL (or the DB_* variables) to the database to load")
+    seed(args.agents)
+
+    limits = httpx.Limits(max_connections=args.clients)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60)
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+        )
+
+    print(
+        f"{args.clients} clients, {args.seconds:.0f}s per path, "
+        f"async pool {DB_POOL_SIZE}"
+    )
+    async with client:
+        for label, path in (("sync", "/sync/agent"), ("async", "/agent")):
+            await client.get(path)  # warm up connections and caches
+            latencies, errors, elapsed = await run_clients(
+                client, path, args.clients, args.seconds
+            )
+            latencies.sort()
+            print(
+                f"[{label:>5}] {len(latencies) / elapsed:8.1f} req/s, "
+                f"p50 {percentile(latencies, 0.5) * 1000:7.1f}ms, "
+                f"p99 {percentile(latencies, 0.99) * 1000:7.1f}ms, {errors} errors"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
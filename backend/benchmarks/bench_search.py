@@ -0,0 +1,97 @@
+"""
+Benchmark: SearchIndex query latency on a synthetic catalog.
+
+Builds an index of `--agents` synthetic agents (names, categories and
+descriptions drawn from a Zipf-distributed vocabulary, so a few words are
+very common and most are rare) and runs `--queries` one-to-three word queries,
+a third of them with a typo. Reports build time and p50/p95/p99 latency, then
+times upserting `--updates` agents into the built index.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_search [--agents 1000000] [--queries 2000]
+"""
+
+import argparse
+import random
+import string
+import time
+from itertools import accumulate
+
+from backend.app.core.search import SearchIndex
+
+CATEGORIES = [
+    "Writing", "Video", "Audio", "Image", "Code", "Marketing", "Productivity",
+    "Research", "Education", "Finance", "Sales", "Design",
+]
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    # Random order, so word frequency is unrelated to spelling
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def make_agent(vocabulary, weights, rng):
+    return (
+        " ".join(rng.choices(vocabulary, cum_weights=weights, k=2)).title(),
+        " ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(8, 25))),
+        rng.choice(CATEGORIES),
+    )
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=200_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--updates", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    # Cumulative weights, so rng.choices doesn't re-sum the vocabulary on every call
+    weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for agent_id in range(args.agents):
+        index.add(agent_id, *make_agent(vocabulary, weights, rng))
+    print(f"Indexed {args.agents} agents in {time.perf_counter() - started:.1f}s")
+
+    latencies = []
+    for i in range(args.queries):
+        words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(1, 3))
+        if i % 3 == 0:
+            words[0] = typo(words[0], rng)
+        started = time.perf_counter()
+        index.search(" ".join(words))
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(
+        f"{args.queries} queries: p50 {percentile(latencies, 0.5):.2f}ms, "
+        f"p95 {percentile(latencies, 0.95):.2f}ms, "
+        f"p99 {percentile(latencies, 0.99):.2f}ms"
+    )
+
+    started = time.perf_counter()
+    for _ in range(args.updates):
+        index.add(rng.randrange(args.agents), *make_agent(vocabulary, weights, rng))
+    elapsed = time.perf_counter() - started
+    print(f"{args.updates} upserts: {elapsed * 1e6 / args.updates:.0f}us per agent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Alembic environment: migrates the app's database, DB_URL unless the config
+sets sqlalchemy.url (the tests point it at a scratch database).
+"""
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from backend.app.core.database import DB_URL, Base
+from backend.app.core import models  # noqa: F401  registers every table
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=context.config.get_main_option("sqlalchemy.url") or DB_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    url = context.config.get_main_option("sqlalchemy.url") or DB_URL
+    with create_engine(url).connect() as connection:
+        # SQLite can only alter tables by copying them
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
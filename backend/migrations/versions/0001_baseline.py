@@ -0,0 +1,78 @@
+"""
+Baseline: the schema init_db() created before migrations existed.
+
+A database created that way is already at this revision; mark it with
+`alembic -c backend/alembic.ini stamp 0001_baseline` before upgrading.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("username", sa.String(), nullable=False, unique=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_admin", sa.Boolean()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "agents",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("homepage_url", sa.String()),
+        sa.Column("category", sa.String()),
+        sa.Column("source", sa.String()),
+        sa.Column("trending", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_agents_id", "agents", ["id"])
+    op.create_index("ix_agents_name", "agents", ["name"])
+
+    op.create_table(
+        "highlights",
+        *_user_agent_columns(),
+        sa.UniqueConstraint("user_id", "agent_id", name="_user_agent_highlight_uc"),
+    )
+    op.create_table("reviews", *_user_agent_columns(), sa.Column("content", sa.Text()))
+    op.create_table(
+        "ratings",
+        *_user_agent_columns(),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.UniqueConstraint("user_id", "agent_id", name="_user_agent_rating_uc"),
+        sa.CheckConstraint("value >= 1 AND value <= 5", name="check_rating_range"),
+    )
+    for table in ("highlights", "reviews", "ratings"):
+        op.create_index(f"ix_{table}_id", table, ["id"])
+
+
+def _user_agent_columns():
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE")
+        ),
+        sa.Column(
+            "agent_id", sa.Integer(), sa.ForeignKey("agents.id", ondelete="CASCADE")
+        ),
+    ]
+
+
+def downgrade():
+    for table in ("ratings", "reviews", "highlights", "agents", "users"):
+        op.drop_table(table)
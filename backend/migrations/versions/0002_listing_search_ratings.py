@@ -0,0 +1,129 @@
+"""
+Agent listing, search and rating aggregates.
+
+- agents.created_at backfilled and made NOT NULL: it is the keyset pagination
+  key, and NULL keys sort first in DESC order on Postgres and fit in no cursor
+- keyset pagination indexes on (filters..., created_at, id)
+- Postgres only: pg_trgm and the GIN indexes behind GET /agent/search
+- per-agent rating aggregate columns and their ranking indexes, backfilled
+  from the ratings table
+
+Revision ID: 0002_listing_search_ratings
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+revision = "0002_listing_search_ratings"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+LISTING_INDEXES = {
+    "ix_agents_created_at_id": ["created_at", "id"],
+    "ix_agents_category_created_at_id": ["category", "created_at", "id"],
+    "ix_agents_trending_created_at_id": ["trending", "created_at", "id"],
+    "ix_agents_category_trending_created_at_id": [
+        "category", "trending", "created_at", "id",
+    ],
+}
+RATING_COLUMNS = [
+    "rating_count", "rating_sum",
+    "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+]
+RATING_INDEXES = {
+    "ix_agents_rating_score_id": ["rating_score", "id"],
+    "ix_agents_category_rating_score_id": ["category", "rating_score", "id"],
+}
+# Must stay the expression of search_vector() in models/agent.py
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(category, '')), 'B'))"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+# SQLite keeps datetimes as text in SQLAlchemy's format, which keyset cursors
+# compare against; CURRENT_TIMESTAMP there has no fractional seconds
+NOW_SQL = {
+    "sqlite": "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')",
+}
+
+
+def upgrade():
+    now = NOW_SQL.get(op.get_bind().dialect.name, "CURRENT_TIMESTAMP")
+    op.execute(
+        f"UPDATE agents SET created_at = COALESCE(updated_at, {now}) "
+        "WHERE created_at IS NULL"
+    )
+    with op.batch_alter_table("agents") as batch:
+        batch.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(),
+            existing_server_default=sa.func.now(),
+            nullable=False,
+        )
+    for name, columns in LISTING_INDEXES.items():
+        op.create_index(name, "agents", columns)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_agents_search",
+            "agents",
+            [sa.text(f"({SEARCH_VECTOR})")],
+            postgresql_using="gin",
+        )
+        op.create_index(
+            "ix_agents_name_trgm",
+            "agents",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+    with op.batch_alter_table("agents") as batch:
+        for column in RATING_COLUMNS:
+            batch.add_column(
+                sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+            )
+        batch.add_column(
+            sa.Column("rating_score", sa.Float(), nullable=False, server_default="0")
+        )
+    for name, columns in RATING_INDEXES.items():
+        op.create_index(name, "agents", columns)
+
+    if context.is_offline_mode():
+        op.execute(
+            "-- Backfill: run backend.app.core.ratings.recompute_rating_stats() "
+            "once this script is applied"
+        )
+        return
+    # Imported here: the backfill runs the app's own recompute
+    from backend.app.core.ratings import recompute_rating_stats
+
+    # Joins the migration's transaction; its commit() only releases a savepoint
+    recompute_rating_stats(Session(bind=op.get_bind()))
+
+
+def downgrade():
+    for name in RATING_INDEXES:
+        op.drop_index(name, "agents")
+    with op.batch_alter_table("agents") as batch:
+        for column in RATING_COLUMNS + ["rating_score"]:
+            batch.drop_column(column)
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_agents_name_trgm", "agents")
+        op.drop_index("ix_agents_search", "agents")
+    for name in LISTING_INDEXES:
+        op.drop_index(name, "agents")
+    with op.batch_alter_table("agents") as batch:
+        batch.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(),
+            existing_server_default=sa.func.now(),
+            nullable=True,
+        )
@@ -0,0 +1,82 @@
+"""
+Trending scores.
+
+- created_at on highlights, reviews and ratings, with the (created_at, id)
+  indexes the trending job reads new activity through
+- Agent.trending_score and its ranking indexes
+- trending_state (watermarks and decay epoch) and trending_agents (top-K lists)
+
+Revision ID: 0003_trending
+Revises: 0002_listing_search_ratings
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_trending"
+down_revision = "0002_listing_search_ratings"
+branch_labels = None
+depends_on = None
+
+ACTIVITY_TABLES = ("highlights", "reviews", "ratings")
+TRENDING_INDEXES = {
+    "ix_agents_trending_score_id": ["trending_score", "id"],
+    "ix_agents_category_trending_score_id": ["category", "trending_score", "id"],
+}
+
+
+def upgrade():
+    # Existing rows get the migration time: the first refresh scores them as new
+    for table in ACTIVITY_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(
+                sa.Column("created_at", sa.DateTime(), server_default=sa.func.now())
+            )
+        op.create_index(f"ix_{table}_created_at_id", table, ["created_at", "id"])
+
+    with op.batch_alter_table("agents") as batch:
+        batch.add_column(
+            sa.Column("trending_score", sa.Float(), nullable=False, server_default="0")
+        )
+    for name, columns in TRENDING_INDEXES.items():
+        op.create_index(name, "agents", columns)
+
+    op.create_table(
+        "trending_state",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("epoch", sa.DateTime(), nullable=False),
+        sa.Column("highlights_at", sa.DateTime()),
+        sa.Column("highlights_id", sa.Integer(), nullable=False),
+        sa.Column("reviews_at", sa.DateTime()),
+        sa.Column("reviews_id", sa.Integer(), nullable=False),
+        sa.Column("ratings_at", sa.DateTime()),
+        sa.Column("ratings_id", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime()),
+    )
+    op.create_index("ix_trending_state_id", "trending_state", ["id"])
+    op.create_table(
+        "trending_agents",
+        sa.Column("category", sa.String(), primary_key=True),
+        sa.Column("rank", sa.Integer(), primary_key=True),
+        sa.Column(
+            "agent_id",
+            sa.Integer(),
+            sa.ForeignKey("agents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("trending_agents")
+    op.drop_table("trending_state")
+    for name in TRENDING_INDEXES:
+        op.drop_index(name, "agents")
+    with op.batch_alter_table("agents") as batch:
+        batch.drop_column("trending_score")
+    for table in ACTIVITY_TABLES:
+        op.drop_index(f"ix_{table}_created_at_id", table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("created_at")
@@ -0,0 +1,85 @@
+"""
+Benchmark: threaded HostController fetches vs the pooled AsyncFetcher.
+
+Serves the Toolify subcategory fixture from a local aiohttp server that adds
+`--latency` seconds to every response, fetches `--pages` pages with a thread
+pool around HostController.get (as scrape_all_toolify_data_concurrent does) and
+with AsyncFetcher (as scrape_all_toolify_data_async does), checks both got
+every page and prints the wall time of each.
+
+Usage (from etl/):
+    python -m benchmarks.bench_async_fetch [--pages 400] [--latency 0.1] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from aiohttp import web
+from utils.async_fetcher import AsyncFetcher
+from utils.host_controller import HostController
+
+PAGE = (Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "toolify_subcategory.html").read_bytes()
+
+
+def start_server(latency):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    async def handle(request):
+        await asyncio.sleep(latency)
+        return web.Response(body=PAGE, content_type="text/html")
+
+    async def start():
+        app = web.Application()
+        app.router.add_get("/{path:.*}", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    return asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+
+def controller_for(concurrency):
+    # Pin the limit so both engines run at the same concurrency
+    return HostController(initial_limit=concurrency, min_limit=concurrency, max_limit=concurrency)
+
+
+def fetch_threaded(urls, concurrency):
+    controller = controller_for(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return [len(body) for body in executor.map(lambda url: controller.get(url).content, urls)]
+
+
+def fetch_async(urls, concurrency):
+    async def crawl():
+        async with AsyncFetcher(max_concurrency=concurrency, per_host_limit=concurrency,
+                                controller=controller_for(concurrency)) as fetcher:
+            return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+    return [len(response[2]) for response in asyncio.run(crawl())]
+
+
+def main(pages=400, latency=0.1, concurrency=10):
+    base_url = start_server(latency)
+    urls = [f"{base_url}/category/sub-{i}" for i in range(pages)]
+    print(f"{pages} pages, {latency}s server latency, {concurrency} requests in flight\n")
+    print(f"{'engine':<10} {'wall s':>8} {'pages/s':>8}")
+
+    for label, fetch in (("threaded", fetch_threaded), ("async", fetch_async)):
+        started = time.perf_counter()
+        sizes = fetch(urls, concurrency)
+        seconds = time.perf_counter() - started
+        assert sizes == [len(PAGE)] * pages, f"{label} missed pages"
+        print(f"{label:<10} {seconds:>8.2f} {pages / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    main(args.pages, args.latency, args.concurrency)
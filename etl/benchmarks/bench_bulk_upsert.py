@@ -0,0 +1,110 @@
+"""
+Benchmark: execute_values upsert_agents() vs the COPY-based bulk_upsert_agents().
+
+Needs a scratch Postgres reachable through the usual DB_* variables. Everything
+runs in its own schema (dropped at the end), so the real agents table is never
+touched. For each size both loaders run twice, first into an empty table
+(inserts) and then over the loaded rows (updates), and the resulting tables are
+compared to check that both paths give the same result.
+
+Usage (from etl/):
+    DB_HOST=localhost DB_PORT=5432 DB_NAME=postgres DB_USER=postgres DB_PASSWORD=postgres \\
+        python -m benchmarks.bench_bulk_upsert [--sizes 10000 100000 1000000] [--batch-size 50000]
+"""
+
+import argparse
+import time
+import pandas as pd
+from utils.models import get_connection, upsert_agents, bulk_upsert_agents
+
+SCHEMA = "bench_bulk_upsert"
+AGENTS_DDL = """
+    CREATE TABLE agents (
+        id SERIAL PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL,
+        description TEXT,
+        homepage_url TEXT,
+        category TEXT,
+        source TEXT,
+        trending BOOLEAN,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    )
+"""
+# Everything but id and updated_at, which is set to NOW() on conflict
+TABLE_DIGEST = """
+    SELECT count(*), md5(string_agg(
+        concat_ws('|', name, description, homepage_url, category, source, trending, created_at), ',' ORDER BY name))
+    FROM agents
+"""
+
+
+def make_agents(n: int, version: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({
+        "name": [f"Agent {i}" for i in range(n)],
+        "description": [f"Tool number {i}, revision {version}, does \"things\"" for i in range(n)],
+        "homepage_url": [f"https://agent{i}.example.com" for i in range(n)],
+        "category": [("Writing", "Video", "SEO", "")[i % 4] for i in range(n)],
+        "source": ["https://www.toolify.ai"] * n,
+        "trending": [i % 2 for i in range(n)],
+        "created_at": pd.Timestamp("2025-07-01"),
+        "updated_at": pd.Timestamp("2025-07-01"),
+    })
+
+
+def reset(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.execute(AGENTS_DDL)
+    conn.commit()
+
+
+def digest(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(TABLE_DIGEST)
+        result = cursor.fetchone()
+    conn.commit()
+    return result
+
+
+def timed(load, df, conn):
+    started = time.perf_counter()
+    load(df.copy(), conn)
+    return time.perf_counter() - started
+
+
+def main(sizes, batch_size):
+    loaders = {
+        "execute_values": lambda df, conn: upsert_agents(df, conn=conn),
+        "COPY + merge": lambda df, conn: bulk_upsert_agents(df, conn=conn, batch_size=batch_size),
+    }
+    conn = get_connection()
+    try:
+        print(f"{'rows':>9} {'loader':<15} {'insert s':>9} {'rows/s':>9} {'update s':>9} {'rows/s':>9}")
+        for n in sizes:
+            inserts, updates = make_agents(n), make_agents(n, version=1)
+            digests = {}
+            for label, load in loaders.items():
+                reset(conn)
+                insert_seconds = timed(load, inserts, conn)
+                update_seconds = timed(load, updates, conn)
+                digests[label] = digest(conn)
+                print(f"{n:>9} {label:<15} {insert_seconds:>9.2f} {n / insert_seconds:>9.0f} "
+                      f"{update_seconds:>9.2f} {n / update_seconds:>9.0f}")
+            assert len(set(digests.values())) == 1, f"Loaders produced different tables: {digests}"
+        print("Both loaders produced identical tables at every size")
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+    main(args.sizes, args.batch_size)
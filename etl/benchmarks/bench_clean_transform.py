@@ -0,0 +1,75 @@
+"""
+Benchmark: per-row clean/transform steps vs their vectorized replacements.
+
+Loads the distinct rows of the committed downloads/*.csv snapshots, repeats
+them `--scale` times, checks that both versions produce identical frames and
+prints the time of each stage.
+
+Usage (from etl/):
+    python -m benchmarks.bench_clean_transform [--scale 100]
+"""
+
+import argparse
+import time
+from pathlib import Path
+import pandas as pd
+from utils.utils import clean_categories, clean_data, remove_hashtags, transform_data
+
+DOWNLOADS = Path(__file__).resolve().parent.parent / "downloads"
+
+
+def load_snapshots(scale: int) -> pd.DataFrame:
+    df = pd.concat([pd.read_csv(path) for path in sorted(DOWNLOADS.glob("*.csv"))], ignore_index=True)
+    df = df.drop_duplicates().reset_index(drop=True)
+    scaled = pd.concat([df] * scale, ignore_index=True)
+    # Give every copy its own names so transform_data's dedup keeps them all
+    scaled["name"] = scaled["name"] + " #" + (scaled.index // len(df)).astype(str)
+    return scaled
+
+
+def rowwise_categories(tags: pd.Series) -> pd.Series:
+    return tags.apply(remove_hashtags)
+
+
+def rowwise_clean_data(df):
+    df = df.drop(columns=[col for col in ["pricing", "page"] if col in df.columns])
+    new_df = df.dropna().reset_index(drop=True)
+    new_df["category"] = rowwise_categories(new_df["category"])
+    return new_df
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main(scale=100):
+    df = load_snapshots(scale)
+    print(f"{len(df)} rows ({scale}x the distinct snapshot rows)\n")
+    print(f"{'stage':<20} {'row-wise s':>11} {'vectorized s':>13} {'speedup':>8}")
+
+    stages = [
+        ("category cleaning", rowwise_categories, clean_categories, df["category"]),
+        ("clean_data", rowwise_clean_data, clean_data, df),
+    ]
+    for label, rowwise, vectorized, data in stages:
+        expected, rowwise_seconds = timed(rowwise, data.copy())
+        actual, vectorized_seconds = timed(vectorized, data.copy())
+        if isinstance(expected, pd.DataFrame):
+            pd.testing.assert_frame_equal(actual, expected)
+        else:
+            pd.testing.assert_series_equal(actual, expected)
+        print(f"{label:<20} {rowwise_seconds:>11.3f} {vectorized_seconds:>13.3f} "
+              f"{rowwise_seconds / vectorized_seconds:>7.1f}x")
+
+    cleaned = clean_data(df)
+    _, transform_seconds = timed(transform_data, cleaned)
+    print(f"{'transform_data':<20} {'':>11} {transform_seconds:>13.3f}")
+    print("\nOutputs identical")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    main(parser.parse_args().scale)
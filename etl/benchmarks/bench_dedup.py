@@ -0,0 +1,108 @@
+"""
+Benchmark: near-duplicate clustering with canonical URLs + MinHash/LSH.
+
+Takes the distinct tools in the committed downloads/*.csv snapshots and
+generates noisy copies of them (spacing and case changes in names, a word
+dropped or swapped in descriptions, tracking parameters / www / trailing
+slashes on URLs) until each requested size is reached. Every copy should
+cluster with its original, so the run reports timing, how many generated
+duplicate groups were recovered whole and how many clusters mix different
+tools. An exact all-pairs Jaccard pass on a small sample shows the quadratic
+cost the LSH index avoids.
+
+Usage (from etl/):
+    python -m benchmarks.bench_dedup [--sizes 25000 50000 100000 150000] [--threshold 0.7]
+"""
+
+import argparse
+import time
+from itertools import combinations
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from utils.dedup import find_clusters, shingles
+
+DOWNLOADS = Path(__file__).resolve().parent.parent / "downloads"
+
+
+def load_tools() -> pd.DataFrame:
+    df = pd.concat([pd.read_csv(path) for path in sorted(DOWNLOADS.glob("*.csv"))], ignore_index=True)
+    df = df.dropna(subset=["name", "description"]).drop_duplicates(subset=["name"], keep="last")
+    return df.rename(columns={"url": "homepage_url"}).reset_index(drop=True)
+
+
+def perturb(row, rng):
+    name, description, url = row["name"], row["description"], row["homepage_url"]
+    choice = rng.integers(4)
+    if choice == 0 and len(name) > 3:
+        cut = int(rng.integers(1, len(name) - 1))
+        name = f"{name[:cut]} {name[cut:]}"
+    elif choice == 1:
+        name = name.upper()
+    elif choice == 2:
+        name = name.replace(" ", "")
+
+    words = description.split()
+    if len(words) > 8:
+        del words[int(rng.integers(len(words)))]
+        description = " ".join(words)
+
+    if isinstance(url, str):
+        url = (url.replace("https://", "https://www.", 1) if "://www." not in url else url).rstrip("/")
+        url += "/?utm_source=bench" if rng.integers(2) else "/"
+    return name, description, url
+
+
+def make_catalog(tools: pd.DataFrame, size: int, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    group = np.concatenate([np.arange(len(tools)), rng.integers(0, len(tools), size - len(tools))])
+    rows = []
+    for i, g in enumerate(group):
+        row = tools.iloc[g]
+        name, description, url = (row["name"], row["description"], row["homepage_url"]) if i < len(tools) \
+            else perturb(row, rng)
+        rows.append({"name": name, "description": description, "homepage_url": url, "group": g})
+    return pd.DataFrame(rows)
+
+
+def score(clusters: np.ndarray, groups: np.ndarray):
+    frame = pd.DataFrame({"cluster": clusters, "group": groups})
+    groups_whole = (frame.groupby("group")["cluster"].nunique() == 1).mean()
+    mixed = (frame.groupby("cluster")["group"].nunique() > 1).sum()
+    return groups_whole, mixed
+
+
+def brute_force_seconds(catalog: pd.DataFrame, threshold: float) -> float:
+    sets = [shingles(n, d) for n, d in zip(catalog["name"], catalog["description"])]
+    started = time.perf_counter()
+    matches = sum(1 for a, b in combinations(sets, 2) if a and b and len(a & b) / len(a | b) >= threshold)
+    return time.perf_counter() - started, matches
+
+
+def main(sizes, threshold=0.7):
+    tools = load_tools()
+    print(f"{len(tools)} distinct tools as originals\n")
+
+    sample = make_catalog(tools, len(tools) + 1000).sample(3000, random_state=0)
+    seconds, matches = brute_force_seconds(sample, threshold)
+    pairs = 3000 * 2999 // 2
+    print(f"exact all-pairs Jaccard on 3000 rows: {seconds:.2f}s for {pairs} pairs ({matches} matches), "
+          f"~{seconds * (100_000 / 3000) ** 2 / 3600:.1f}h extrapolated to 100k rows\n")
+
+    print(f"{'rows':>8} {'seconds':>8} {'rows/s':>8} {'clusters':>9} {'groups whole':>13} {'mixed clusters':>15}")
+    for size in sizes:
+        catalog = make_catalog(tools, size)
+        started = time.perf_counter()
+        clusters = find_clusters(catalog, threshold)
+        seconds = time.perf_counter() - started
+        whole, mixed = score(clusters, catalog["group"].to_numpy())
+        print(f"{size:>8} {seconds:>8.2f} {size / seconds:>8.0f} {len(np.unique(clusters)):>9} "
+              f"{whole:>12.1%} {mixed:>15}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25_000, 50_000, 100_000, 150_000])
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+    main(args.sizes, args.threshold)
@@ -0,0 +1,62 @@
+"""
+Microbenchmark: extract_tool_data() vs the compiled ToolTilePlan.
+
+Runs both extractors over the saved aitoolsdirectory page in
+tests/fixtures, checks that they return identical tool dicts and prints
+the per-tile cost of each.
+
+Usage (from etl/):
+    python -m benchmarks.bench_extract_tool_data [--repeat 50]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from bs4 import BeautifulSoup
+from utils.parsers import extract_tool_data
+from utils.selector_plan import ToolTilePlan
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "aitoolsdirectory_page.html"
+MAIN_LIST_SELECTOR = "div.sv-tiles-list.sv-tiles-list--flex.sv-tiles-list--tile-view.sv-tiles-list--small-size"
+
+
+def load_tiles(path=FIXTURE):
+    soup = BeautifulSoup(path.read_text(encoding="utf-8"), "html.parser")
+    return soup.select_one(MAIN_LIST_SELECTOR).find_all(recursive=False)
+
+
+def time_per_tile(extract_page, tiles, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        extract_page(tiles)
+    return (time.perf_counter() - started) / (repeat * len(tiles))
+
+
+def main(repeat=50):
+    tiles = load_tiles()
+    plan = ToolTilePlan()
+
+    def run_plan(page_tiles):
+        state = plan.new_page()
+        return [plan.extract(tile, state) for tile in page_tiles]
+
+    def run_reference(page_tiles):
+        return [extract_tool_data(tile) for tile in page_tiles]
+
+    expected = run_reference(tiles)
+    actual = run_plan(tiles)
+    assert actual == expected, "ToolTilePlan output differs from extract_tool_data()"
+    assert [list(t) for t in actual] == [list(t) for t in expected], "Field order differs"
+
+    reference = time_per_tile(run_reference, tiles, repeat)
+    compiled = time_per_tile(run_plan, tiles, repeat)
+    print(f"{len(tiles)} tiles x {repeat} runs, output identical")
+    print(f"extract_tool_data : {reference * 1e6:8.1f} us/tile")
+    print(f"ToolTilePlan      : {compiled * 1e6:8.1f} us/tile")
+    print(f"speedup           : {reference / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args().repeat)
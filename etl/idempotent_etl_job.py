@@ -1,40 +1,189 @@
 """
 Idempotent ETL Job Script.
 """
+import argparse
+import time
 from pathlib import Path
-from utils.utils import read_data, clean_data, transform_data
-from utils.models import upsert_agents
+from utils.utils import read_data_chunks, clean_data, transform_data, DEFAULT_CHUNKSIZE
+from utils.models import upsert_agents, bulk_upsert_agents, delete_agents, pooled_connection
+from utils.models import merge_agents_via_staging, fetch_agent_fingerprints
 import pandas as pd
-from utils.utils import fetch_latest_csv_from_s3, fetch_db_records, merging_dfs
-from utils.logger_config import logger
+from utils.utils import read_latest_from_s3, fetch_db_records, merging_dfs, changed_agents
+from utils.etl_stats import StageStats
+from utils.dedup import dedupe_agents, write_cluster_report
+from utils.logger_config import logger, timestamp
 from utils.models import DB_URL
 
 
-def run_basic_etl() -> pd.DataFrame:
+MERGE_STRATEGIES = ("staging", "hash", "full")
+
+
+def run_basic_etl(streaming=False, chunksize=DEFAULT_CHUNKSIZE, merge="staging", dedup=True) -> pd.DataFrame:
     """
     Basic ETL Job.
+    Args:
+        streaming (bool): Process the file chunk by chunk with run_streaming_etl()
+            instead of loading it whole.
+        chunksize (int): Rows per chunk in streaming mode.
+        merge (str): How scraped rows are reconciled with the agents table:
+            'staging' stages them in a temp table and lets Postgres write only new or
+            changed agents; 'hash' compares against key + row-hash fingerprints
+            in-process (used automatically if staging fails); 'full' reads the whole
+            table back and rewrites it.
+        dedup (bool): Collapse near-duplicate agents (same canonical URL, same
+            normalized name or similar name + description) before writing. The
+            merged clusters are saved to logs/. Not applied in streaming mode.
+
     Returns:
-        pd.DataFrame: Ai tools data to run etl job on.
+        pd.DataFrame: Ai tools data to run etl job on. In streaming mode only the
+            per-stage stats are returned, as the rows are never held all at once.
     """
-    # download latest file from s3
-    scraped_data_source = fetch_latest_csv_from_s3()
+    # read the latest snapshot straight from s3, no local copy
+    if streaming:
+        return run_streaming_etl(chunksize=chunksize, chunks=read_latest_from_s3(chunksize=chunksize))
 
-    scraped_df = read_data(scraped_data_source)
+    scraped_df = read_latest_from_s3()
+    if scraped_df is None:
+        logger.warning("No snapshot to load, nothing to do.")
+        return pd.DataFrame()
 
     clean_scraped_df = clean_data(scraped_df)
 
     trans_scraped_df = transform_data(clean_scraped_df)
 
+    if dedup:
+        trans_scraped_df, clusters = dedupe_agents(trans_scraped_df)
+        write_cluster_report(clusters, f"logs/{timestamp}_dedup_clusters.csv")
+
+    if merge == "staging":
+        try:
+            counts = merge_agents_via_staging(trans_scraped_df)
+            logger.info(f"📦 ETL complete: {counts['inserted']} inserted, {counts['updated']} updated "
+                        f"of {counts['staged']} scraped tools.")
+            return trans_scraped_df
+        except RuntimeError:
+            logger.warning("Staged merge failed, falling back to the row-hash merge.")
+            merge = "hash"
+
+    if merge == "hash":
+        changed_df = changed_agents(trans_scraped_df, fetch_agent_fingerprints())
+        if not changed_df.empty:
+            upsert_agents(changed_df)
+        logger.info(f"📦 ETL complete: {len(changed_df)} of {len(trans_scraped_df)} scraped tools written.")
+        return trans_scraped_df
+
     existing_db_df = fetch_db_records()
 
     final_df = merging_dfs(trans_scraped_df, existing_db_df)
     final_df = final_df.drop_duplicates(subset=['name'], keep='last')
 
-    upsert_agents(final_df)
+    bulk_upsert_agents(final_df)
     logger.info(f"📦 ETL complete: {len(final_df)} total tools after merge.")
 
     return final_df
 
 
+def run_streaming_etl(source_path: str = None, chunksize=DEFAULT_CHUNKSIZE, chunks=None) -> dict:
+    """
+    Streaming ETL Job: read, clean, transform and upsert one chunk at a time, so
+    memory is bounded by the chunk size rather than the catalog size.
+
+    Chunks are bulk-loaded in file order over one pooled connection, so when a name appears
+    in several chunks the last row wins, as with drop_duplicates(keep='last') in
+    the whole-file job. Existing DB rows are left to ON CONFLICT instead of being
+    read back and merged.
+    Args:
+        source_path (str): Scraped data file
+        chunksize (int): Rows per chunk
+        chunks (iterable): DataFrames to load instead of reading `source_path`,
+            e.g. a snapshot streamed from S3
+
+    Returns:
+        dict: Rows, rows/sec and peak RSS per stage.
+    """
+    stats = StageStats()
+    if chunks is None and source_path is None:
+        logger.warning("No snapshot to stream, nothing to do.")
+        return stats.report()
+    started = time.perf_counter()
+    chunks = iter(chunks if chunks is not None else read_data_chunks(source_path, chunksize))
+
+    with pooled_connection() as conn:
+        while True:
+            with stats.track("read") as stage:
+                chunk = next(chunks, None)
+                stage["rows"] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            stats.chunks += 1
+
+            with stats.track("clean") as stage:
+                chunk = clean_data(chunk)
+                stage["rows"] = len(chunk)
+            with stats.track("transform") as stage:
+                chunk = transform_data(chunk)
+                stage["rows"] = len(chunk)
+            if chunk.empty:
+                continue
+            with stats.track("upsert") as stage:
+                bulk_upsert_agents(chunk, conn=conn)
+                stage["rows"] = len(chunk)
+
+    stats.wall_seconds = time.perf_counter() - started
+    logger.info(f"📦 Streaming ETL complete: {stats.rows['upsert']} tools upserted in {stats.chunks} chunks.")
+    return stats.report()
+
+
+def run_delta_etl(apply_removals=False) -> pd.DataFrame:
+    """
+    Delta ETL Job: applies only the tools the scraper reported as added or changed.
+    Args:
+        apply_removals (bool): Also delete agents a source no longer lists. Off by default,
+            matching the full ETL, which never removes agents.
+
+    Returns:
+        pd.DataFrame: The upserted rows.
+    """
+    delta_df = read_latest_from_s3(kind='delta')
+    if delta_df is None:
+        logger.warning("No delta file to apply, nothing to do.")
+        return pd.DataFrame()
+
+    removed_df = delta_df[delta_df['change'] == 'removed']
+    changed_df = delta_df[delta_df['change'] != 'removed'].drop(columns=['change'])
+
+    trans_df = pd.DataFrame()
+    if not changed_df.empty:
+        trans_df = transform_data(clean_data(changed_df))
+        upsert_agents(trans_df)
+
+    if apply_removals:
+        for source, rows in removed_df.groupby('source'):
+            delete_agents(rows['name'].tolist(), source)
+
+    logger.info(f"📦 Delta ETL complete: {len(trans_df)} tools upserted, "
+                f"{len(removed_df)} removed upstream ({'deleted' if apply_removals else 'kept'}).")
+    return trans_df
+
+
 if __name__ == "__main__":
-    run_basic_etl()
+    parser = argparse.ArgumentParser(description="Load scraped AI tools into the agents table.")
+    parser.add_argument("--mode", choices=["full", "delta"], default="full",
+                        help="'full' re-processes the latest snapshot, 'delta' applies only the latest change file")
+    parser.add_argument("--merge", choices=MERGE_STRATEGIES, default="staging",
+                        help="In full mode, how scraped rows are reconciled with the agents table")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="In full mode, skip the near-duplicate agent stage")
+    parser.add_argument("--stream", action="store_true",
+                        help="In full mode, process the snapshot in chunks instead of loading it whole")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument("--apply-removals", action="store_true",
+                        help="In delta mode, delete agents their source no longer lists")
+    args = parser.parse_args()
+
+    if args.mode == "delta":
+        run_delta_etl(apply_removals=args.apply_removals)
+    else:
+        run_basic_etl(streaming=args.stream, chunksize=args.chunksize, merge=args.merge,
+                      dedup=not args.no_dedup)
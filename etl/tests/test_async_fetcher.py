@@ -0,0 +1,144 @@
+"""
+- test AsyncFetcher never has more than `max_concurrency` requests in flight.
+- test AsyncFetcher caps connections per host while other hosts keep going.
+- test failed requests (4xx, exhausted 5xx retries, refused connections) return None.
+- test the async Toolify crawl sinks each subcategory as it completes and returns what it sank.
+"""
+import asyncio
+import socket
+import threading
+from pathlib import Path
+import pytest
+from aiohttp import web
+import web_scraper
+from utils.async_fetcher import AsyncFetcher
+from utils.host_controller import HostController
+from web_scraper import AIToolsScraper
+
+PAGE = (Path(__file__).parent / "fixtures" / "toolify_subcategory.html").read_bytes()
+NAME_CLASS = "text-base text-gray-1000 flex-1 w-0 truncate font-medium"
+
+
+class StubServer:
+    """
+    aiohttp server on its own event loop thread. /slow sleeps `delay` seconds,
+    /missing answers 404, /down 503, /categories lists `subcategories` and
+    /sub/<name> answers the subcategory fixture, with Jasper's link pointing at
+    `name`, after `subcategories[name]` seconds.
+    """
+
+    def __init__(self, loop, delay=0.05, subcategories=None):
+        self.loop = loop
+        self.delay = delay
+        self.subcategories = subcategories or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.hits = {}
+        self.url = None
+
+    async def handle(self, request):
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if request.path == "/missing":
+                return web.Response(status=404)
+            if request.path == "/down":
+                return web.Response(status=503)
+            if request.path == "/categories":
+                links = "".join(f'<a class="go-category-link" href="{self.url}/sub/{name}">'
+                                f'<span class="{NAME_CLASS}">{name}</span></a>' for name in self.subcategories)
+                return web.Response(body=f'<div id="group-1"><h3>Writing</h3>{links}</div>', content_type="text/html")
+            if request.path.startswith("/sub/"):
+                name = request.path.rsplit("/", 1)[1]
+                await asyncio.sleep(self.subcategories[name])
+                return web.Response(body=PAGE.replace(b"www.jasper.ai", name.encode()), content_type="text/html")
+            await asyncio.sleep(self.delay)
+            return web.Response(text="ok")
+        finally:
+            self.in_flight -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.url = f"http://127.0.0.1:{self.runner.addresses[0][1]}"
+
+
+@pytest.fixture
+def serve():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = []
+
+    def start(**options):
+        server = StubServer(loop, **options)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.runner.cleanup(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def fetch_all(urls, **options):
+    async def crawl():
+        async with AsyncFetcher(**options) as fetcher:
+            return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+    return asyncio.run(crawl())
+
+
+def test_requests_in_flight_stay_within_max_concurrency(serve):
+    server = serve()
+    responses = fetch_all([f"{server.url}/slow?i={i}" for i in range(30)], max_concurrency=5, per_host_limit=10)
+
+    assert [response[2] for response in responses] == [b"ok"] * 30
+    assert server.max_in_flight == 5
+
+
+def test_per_host_limit_caps_each_host(serve):
+    first, second = serve(), serve()
+    urls = [f"{server.url}/slow?i={i}" for i in range(12) for server in (first, second)]
+    responses = fetch_all(urls, max_concurrency=20, per_host_limit=2)
+
+    assert all(response[0] == 200 for response in responses)
+    assert first.max_in_flight == second.max_in_flight == 2
+
+
+def test_failed_requests_return_none(serve):
+    server = serve()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_url = f"http://127.0.0.1:{sock.getsockname()[1]}/slow"
+    controller = HostController(backoff_base=0.01, max_retries=2)
+    urls = [f"{server.url}/missing", f"{server.url}/down", closed_url, f"{server.url}/slow"]
+    missing, down, refused, ok = fetch_all(urls, controller=controller)
+
+    assert missing is down is refused is None
+    assert ok[2] == b"ok"
+    # 404 is final, 503 is retried until the controller gives up
+    assert (server.hits["/missing"], server.hits["/down"]) == (1, 3)
+
+
+def test_crawl_sinks_subcategories_as_they_complete(serve, monkeypatch):
+    server = serve(subcategories={"slow": 0.4, "fast": 0.0, "medium": 0.2})
+    monkeypatch.setattr(web_scraper, "TOOLIFY_CATEGORY_URL", f"{server.url}/categories")
+    batches = []
+
+    scraper = AIToolsScraper(start_browser=False, use_cache=False)
+    tools = scraper.scrape_all_toolify_data_async(sink=batches.append)
+
+    # Sunk in completion order, one whole batch per subcategory
+    assert [len(batch) for batch in batches] == [4, 4, 4]
+    assert [batch[0]["url"] for batch in batches] == [f"https://{name}/?utm_source=toolify"
+                                                      for name in ("fast", "medium", "slow")]
+    assert server.hits["/sub/fast"] == server.hits["/sub/medium"] == server.hits["/sub/slow"] == 1
+    assert all(tool["category"] == "Writing" for tool in tools)
+    assert tools == [tool for batch in batches for tool in batch]
@@ -0,0 +1,129 @@
+"""
+- test the tile wait returns after the quiet period when the tile count never changes.
+- test the tile wait follows a growing list and returns its final count once it settles.
+- test the tile wait gives up after its timeout on a list that keeps changing.
+- test pooled browsers are checked out by one page at a time, returned, and the extra ones closed.
+- test a page that raises still returns its browser, so the other pages finish.
+"""
+import threading
+import time
+import pytest
+from web_scraper import AIToolsScraper
+
+
+class FakeDriver:
+    """
+    Stands in for Chrome: the tile count follows `counts`, a function of the
+    seconds since the driver was created.
+    """
+
+    def __init__(self, counts=lambda elapsed: 0):
+        self.counts = counts
+        self.started = time.monotonic()
+        self.quit_called = False
+
+    def find_elements(self, by, selector):
+        return [object()] * self.counts(time.monotonic() - self.started)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def scraper_with(driver):
+    scraper = AIToolsScraper(start_browser=False, use_cache=False)
+    scraper.driver = driver
+    return scraper
+
+
+def timed_wait(scraper, **options):
+    started = time.monotonic()
+    count = scraper.wait_for_tiles_settled(**options)
+    return count, time.monotonic() - started
+
+
+def test_wait_returns_after_quiet_period_when_nothing_changes():
+    count, seconds = timed_wait(scraper_with(FakeDriver(lambda elapsed: 24)), quiet_period=0.3, timeout=3.0)
+
+    assert count == 24
+    assert 0.3 <= seconds < 0.6
+
+
+def test_wait_follows_a_growing_list():
+    # 24 tiles, 12 more every 0.2s until 60
+    driver = FakeDriver(lambda elapsed: min(60, 24 + 12 * int(elapsed / 0.2)))
+    count, seconds = timed_wait(scraper_with(driver), quiet_period=0.3, timeout=3.0)
+
+    assert count == 60
+    assert 0.9 <= seconds < 1.3
+
+
+def test_wait_gives_up_on_a_list_that_keeps_changing():
+    driver = FakeDriver(lambda elapsed: int(elapsed / 0.05))
+    count, seconds = timed_wait(scraper_with(driver), quiet_period=0.3, timeout=0.5)
+
+    assert count > 0
+    assert 0.5 <= seconds < 0.8
+
+
+@pytest.fixture
+def fake_browsers(monkeypatch):
+    """
+    Every AIToolsScraper gets a FakeDriver, and scrape_page records which browser
+    scraped which page, failing if a browser is used by two pages at once.
+    """
+    lock = threading.Lock()
+    in_use, scraped = set(), []
+    failing_pages, delays = set(), {}
+    monkeypatch.setattr(AIToolsScraper, "setup_driver",
+                        lambda self, headless=True: setattr(self, "driver", FakeDriver()))
+
+    def scrape_page(self, url, page_num=1):
+        with lock:
+            assert self not in in_use, "browser checked out twice"
+            in_use.add(self)
+        try:
+            time.sleep(delays.get(page_num, 0.05))
+            with lock:
+                scraped.append((page_num, self))
+            if page_num in failing_pages:
+                raise RuntimeError(f"page {page_num} crashed")
+            return [{"name": f"tool-{page_num}"}]
+        finally:
+            with lock:
+                in_use.discard(self)
+    monkeypatch.setattr(AIToolsScraper, "scrape_page", scrape_page)
+    return scraped, failing_pages, delays
+
+
+def test_pool_checks_out_and_returns_browsers(fake_browsers):
+    scraped, _, _ = fake_browsers
+    owner = AIToolsScraper(start_browser=False, use_cache=False)
+    batches = []
+
+    tools = owner.scrape_multiple_pages_parallel("https://aitoolsdirectory.com/", max_pages=6, pool_size=3,
+                                                 sink=batches.append)
+
+    assert [tool["name"] for tool in tools] == [f"tool-{page}" for page in range(1, 7)]
+    assert sorted(batch[0]["name"] for batch in batches) == sorted(tool["name"] for tool in tools)
+    browsers = {browser for _, browser in scraped}
+    assert len(browsers) == 3 and owner in browsers
+    # The extra browsers are closed, the scraper's own driver is left to its owner
+    assert all(browser.driver.quit_called for browser in browsers - {owner})
+    assert not owner.driver.quit_called
+
+
+def test_failing_page_returns_its_browser(fake_browsers):
+    scraped, failing_pages, delays = fake_browsers
+    # Page 1 holds one of the two browsers while page 2 fails at once
+    failing_pages.add(2)
+    delays.update({1: 0.5, 2: 0.0})
+    owner = AIToolsScraper(start_browser=False, use_cache=False)
+
+    with pytest.raises(RuntimeError, match="page 2 crashed"):
+        owner.scrape_multiple_pages_parallel("https://aitoolsdirectory.com/", max_pages=6, pool_size=2)
+
+    browser_of = dict(scraped)
+    assert sorted(browser_of) == [1, 2, 3, 4, 5, 6]
+    # Pages 3-6 ran on the browser page 2 gave back, while page 1 still held the other one
+    assert {browser_of[page] for page in (3, 4, 5, 6)} == {browser_of[2]} != {browser_of[1]}
+    assert all(browser.driver.quit_called for browser in browser_of.values() if browser is not owner)
@@ -0,0 +1,49 @@
+"""
+- test COPY batches keep empty strings distinct from NULL timestamps.
+- test rows are split into batch_size COPYs in order.
+"""
+import pandas as pd
+from utils.models import copy_rows, enforce_schema, expected_schema
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+
+def agents(n):
+    return enforce_schema(pd.DataFrame({
+        "name": [f"Tool {i}" for i in range(n)],
+        "description": ["" if i == 1 else f"Does, \"thing\" {i}" for i in range(n)],
+        "homepage_url": [f"https://tool{i}.ai" for i in range(n)],
+        "category": ["Writing"] * n,
+        "source": ["https://www.toolify.ai"] * n,
+        "trending": [0] * n,
+        "created_at": pd.to_datetime(["2025-07-01"] * n),
+        "updated_at": pd.to_datetime([None] * n),
+    }), expected_schema)
+
+
+def test_copy_rows_quotes_strings_and_nulls_timestamps():
+    cursor = RecordingCursor()
+    copy_rows(cursor, "agents_load", agents(2))
+
+    [(sql, body)] = cursor.copies
+    assert sql == ("COPY agents_load (name, description, homepage_url, category, source, trending, "
+                   "created_at, updated_at) FROM STDIN WITH (FORMAT csv, FORCE_NULL (created_at, updated_at))")
+    assert body.splitlines() == [
+        '"Tool 0","Does, ""thing"" 0","https://tool0.ai","Writing","https://www.toolify.ai",0,"2025-07-01",""',
+        '"Tool 1","","https://tool1.ai","Writing","https://www.toolify.ai",0,"2025-07-01",""',
+    ]
+
+
+def test_copy_rows_batches():
+    cursor = RecordingCursor()
+    copy_rows(cursor, "agents_load", agents(25), batch_size=10)
+
+    batches = [body.splitlines() for _, body in cursor.copies]
+    assert [len(rows) for rows in batches] == [10, 10, 5]
+    assert batches[2][-1].startswith('"Tool 24"')
@@ -0,0 +1,29 @@
+"""
+- test the vectorized category cleaning matches remove_hashtags() row by row.
+- test clean_data on a committed snapshot keeps the per-row output.
+"""
+from pathlib import Path
+import pandas as pd
+from utils.utils import clean_categories, clean_data, remove_hashtags
+
+SNAPSHOT = sorted((Path(__file__).parent.parent / "downloads").glob("*.csv"))[-1]
+
+
+def test_clean_categories_matches_remove_hashtags():
+    mixed = pd.Series(["#Video", "AI", "Writing & Editing", "abc", "abcd", "", "x#y", "ÉCOLE ÜBER",
+                       ["#Video", "Generative Video", "seo"], ["#only"], [], None, 5], dtype=object)
+    strings = pd.Series(["#Video", "ai", None, "Writing & Editing", "seo", "#Video"], index=[5, 3, 9, 1, 0, 2])
+
+    for tags in (mixed, strings, pd.Series([], dtype=object)):
+        expected = tags.apply(remove_hashtags)
+        actual = clean_categories(tags)
+        assert actual.tolist() == expected.tolist()
+        assert actual.index.equals(tags.index)
+
+
+def test_clean_data_matches_rowwise_cleaning():
+    df = pd.read_csv(SNAPSHOT)
+    expected = df.dropna().reset_index(drop=True)
+    expected["category"] = expected["category"].apply(remove_hashtags)
+
+    pd.testing.assert_frame_equal(clean_data(df), expected)
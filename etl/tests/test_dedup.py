@@ -0,0 +1,60 @@
+"""
+- test URL canonicalization and name normalization.
+- test near-duplicate rows cluster and distinct tools stay apart.
+- test one row per cluster is kept and the report lists every member.
+"""
+import pandas as pd
+from utils.dedup import canonical_url, normalize_name, find_clusters, dedupe_agents
+
+
+def test_canonical_url():
+    assert canonical_url("https://www.Jasper.ai:443/?utm_source=toolify#pricing") == "jasper.ai"
+    assert canonical_url("http://jasper.ai/") == "jasper.ai"
+    assert canonical_url("jasper.ai") == "jasper.ai"
+    assert canonical_url("https://www.aiprm.com/?via=aitoolsdirectory-com") == "aiprm.com"
+    assert canonical_url("https://app.example.com:8443//docs//?b=2&a=1") == "app.example.com:8443/docs?a=1&b=2"
+    assert canonical_url(None) == "" and canonical_url("  ") == ""
+
+
+def test_normalize_name():
+    assert normalize_name("Chat GPT") == normalize_name("ChatGPT") == normalize_name("chat-gpt") == "chatgpt"
+    assert normalize_name("ＡＩ Art") == "aiart"
+    assert normalize_name("秘塔AI搜索") == "秘塔ai搜索"
+    assert normalize_name("!!!") == ""
+
+
+CATALOG = pd.DataFrame([
+    {"name": "ChatGPT", "description": "Conversational assistant from OpenAI for writing and coding",
+     "homepage_url": "https://chat.openai.com", "source": "https://www.toolify.ai"},
+    {"name": "Chat GPT", "description": "OpenAI chatbot",
+     "homepage_url": "https://link.aitoolsdirectory.com/chatgpt", "source": "https://aitoolsdirectory.com"},
+    {"name": "Pictory", "description": "Turn long form content into short branded videos in minutes",
+     "homepage_url": "https://pictory.ai?utm_source=toolify", "source": "https://www.toolify.ai"},
+    {"name": "Pictory Video", "description": "Turn long form content into short branded videos in minutes",
+     "homepage_url": "https://link.aitoolsdirectory.com/pictory", "source": "https://aitoolsdirectory.com"},
+    {"name": "Jasper", "description": "AI copywriter for marketing teams",
+     "homepage_url": "https://www.jasper.ai/", "source": "https://aitoolsdirectory.com"},
+    {"name": "Jasper Marketing", "description": "Brand voice platform",
+     "homepage_url": "https://jasper.ai?ref=toolify", "source": "https://www.toolify.ai"},
+    {"name": "Rytr", "description": "Writes emails and blog posts",
+     "homepage_url": "https://rytr.me", "source": "https://www.toolify.ai"},
+    {"name": "Copy.ai", "description": "Writes sales emails",
+     "homepage_url": "https://link.aitoolsdirectory.com/copy-ai", "source": "https://aitoolsdirectory.com"},
+    {"name": "Copyai", "description": "GTM workflows",
+     "homepage_url": "https://link.aitoolsdirectory.com/copyai", "source": "https://aitoolsdirectory.com"},
+])
+
+
+def test_find_clusters():
+    clusters = find_clusters(CATALOG).tolist()
+    # name, minhash, url, name; Rytr stays on its own and redirect links never match each other
+    assert clusters == [0, 0, 2, 2, 4, 4, 6, 7, 7]
+
+
+def test_dedupe_agents_keeps_direct_homepage():
+    deduped, report = dedupe_agents(CATALOG)
+
+    assert deduped["name"].tolist() == ["ChatGPT", "Pictory", "Jasper Marketing", "Rytr", "Copyai"]
+    assert len(report) == 8
+    assert report.groupby("cluster")["kept"].sum().tolist() == [1, 1, 1, 1]
+    assert set(report.columns) == {"cluster", "size", "name", "homepage_url", "source", "kept"}
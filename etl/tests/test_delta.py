@@ -0,0 +1,132 @@
+"""
+- test added, changed and removed tools are detected per source.
+- test a source that returned nothing is not reported as removed.
+- test the state file round-trips and the delta file lands next to the snapshot.
+- test a tool listed under several categories is not reported as changed when their order varies.
+- test the state only advances once the delta file was uploaded.
+- test a crawl that lost subcategories reports no removals for its source and keeps the old state.
+"""
+from pathlib import Path
+import requests
+import web_scraper
+from web_scraper import AIToolsScraper
+from utils.delta import compute_delta, load_state, save_state, delta_path_for, write_delta, summarize
+from utils.host_controller import HostController
+from utils.sources import run_sources
+
+TOOLIFY = "https://www.toolify.ai"
+AITD = "https://aitoolsdirectory.com"
+PAGE = (Path(__file__).parent / "fixtures" / "toolify_subcategory.html").read_bytes()
+
+
+def tool(name, source=TOOLIFY, description="Writes text", url=None, category="Writing"):
+    return {"name": name, "description": description, "url": url or f"{source}/{name}",
+            "source": source, "category": category}
+
+
+def test_compute_delta_added_changed_removed():
+    _, state = compute_delta([tool("Jasper"), tool("Copy.ai"), tool("Rytr")], {})
+
+    delta, new_state = compute_delta(
+        [tool("Jasper"), tool("Copy.ai", description="Writes marketing copy"), tool("Writesonic")], state)
+
+    changes = {row["name"]: row["change"] for row in delta}
+    assert changes == {"Copy.ai": "changed", "Writesonic": "added", "Rytr": "removed"}
+    assert summarize(delta) == {"added": 1, "changed": 1, "removed": 1}
+    assert set(new_state[TOOLIFY]) == {"Jasper", "Copy.ai", "Writesonic"}
+
+
+def test_first_run_reports_everything_as_added():
+    delta, _ = compute_delta([tool("Jasper"), tool("Pictory", source=AITD)], {})
+    assert [row["change"] for row in delta] == ["added", "added"]
+
+
+def test_source_with_no_tools_keeps_previous_fingerprints():
+    _, state = compute_delta([tool("Jasper"), tool("Pictory", source=AITD)], {})
+
+    delta, new_state = compute_delta([tool("Jasper")], state)
+
+    assert delta == []
+    assert new_state[AITD] == state[AITD]
+
+
+def test_state_round_trip_and_delta_file(tmp_path):
+    _, state = compute_delta([tool("Jasper")], {})
+    state_path = str(tmp_path / "state" / "fingerprints.json")
+    save_state(state, state_path)
+    assert load_state(state_path) == state
+    assert load_state(str(tmp_path / "missing.json")) == {}
+
+    assert delta_path_for("data/20250703_122835_ai_tools_scraped.csv") == "data/20250703_122835_ai_tools_delta.csv"
+    assert delta_path_for("data/20250703_122835_ai_tools_scraped.parquet") == "data/20250703_122835_ai_tools_delta.csv"
+
+    delta_file = tmp_path / "delta.csv"
+    write_delta([{"change": "removed", "name": "Rytr", "url": "u", "source": TOOLIFY}], str(delta_file))
+    assert delta_file.read_text().splitlines() == ["change,name,description,url,source,category",
+                                                   "removed,Rytr,,u,https://www.toolify.ai,"]
+
+
+def test_tool_in_several_categories_is_stable():
+    listings = [tool("Jasper", category="Writing"), tool("Jasper", category="Marketing")]
+    delta, state = compute_delta(listings, {})
+    assert [(row["change"], row["category"]) for row in delta] == [("added", "Marketing")]
+
+    delta, _ = compute_delta(listings[::-1], state)
+    assert delta == []
+
+
+def test_state_advances_only_after_upload(tmp_path, monkeypatch):
+    state_path = str(tmp_path / "fingerprints.json")
+    monkeypatch.setattr(web_scraper, "filename", str(tmp_path / "20250703_122835_ai_tools_scraped.parquet"))
+    uploaded = []
+
+    web_scraper.write_run_delta([tool("Jasper")], state_path, upload=lambda path: False)
+    assert load_state(state_path) == {}
+
+    delta_file = web_scraper.write_run_delta([tool("Jasper")], state_path,
+                                             upload=lambda path: uploaded.append(path) or True)
+    assert uploaded == [delta_file]
+    assert set(load_state(state_path)[TOOLIFY]) == {"Jasper"}
+
+
+def test_incomplete_source_reports_no_removals():
+    _, state = compute_delta([tool("Jasper"), tool("Rytr"), tool("Pictory", source=AITD)], {})
+
+    delta, new_state = compute_delta([tool("Jasper", description="New"), tool("Writesonic"), tool("Midjourney", source=AITD)],
+                                     state, incomplete_sources={TOOLIFY})
+
+    changes = {row["name"]: row["change"] for row in delta}
+    assert changes == {"Jasper": "changed", "Writesonic": "added", "Midjourney": "added", "Pictory": "removed"}
+    assert set(new_state[TOOLIFY]) == {"Jasper", "Rytr", "Writesonic"}
+    assert new_state[TOOLIFY]["Jasper"] != state[TOOLIFY]["Jasper"]
+    assert set(new_state[AITD]) == {"Midjourney"}
+
+
+
+def test_crawl_with_failed_subcategories_keeps_missing_tools(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    urls = [f"{TOOLIFY}/category/sub-{i}" for i in range(3)]
+    monkeypatch.setattr(AIToolsScraper, "scrape_toolify_categories", lambda self: [
+        {"category": "Writing", "sub_categories": [{"link": url, "name": url} for url in urls]}])
+
+    def get(self, url, **kwargs):
+        if url == urls[1]:
+            raise requests.ConnectionError("connection reset")
+        res = requests.Response()
+        res.status_code, res._content = 200, PAGE.replace(b"Jasper", url.rsplit("/", 1)[1].encode())
+        return res
+    monkeypatch.setattr(HostController, "get", get)
+
+    state_path = str(tmp_path / "fingerprints.json")
+    monkeypatch.setattr(web_scraper, "filename", str(tmp_path / "20250703_122835_ai_tools_scraped.parquet"))
+    save_state(compute_delta([tool(f"sub-{i}", url="https://www.jasper.ai/?utm_source=toolify") for i in range(3)],
+                             {})[1], state_path)
+
+    results = run_sources(lambda batch: None, ["toolify"], {"toolify": {"mode": "threaded", "resume": False}})
+    assert results["toolify"]["complete"] is False
+    assert {t["name"] for t in results["toolify"]["tools"]} >= {"sub-0", "sub-2"}
+
+    delta_file = web_scraper.write_run_delta(results["toolify"]["tools"], state_path, upload=lambda path: True,
+                                             incomplete_sources=web_scraper.incomplete_sources(results))
+    assert "removed" not in Path(delta_file).read_text()
+    assert {"sub-0", "sub-1", "sub-2"} <= set(load_state(state_path)[TOOLIFY])
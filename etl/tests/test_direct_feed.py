@@ -0,0 +1,110 @@
+"""
+- test feed records map to the same tool dict shape as the Selenium path.
+- test pagination over recorded feed responses, without network.
+- test that an unreachable feed returns nothing so the caller falls back.
+- test that a feed answering a JSON scalar yields no records instead of raising.
+- test malformed records are skipped, and a payload that cannot be mapped falls back instead of raising.
+"""
+import json
+from pathlib import Path
+import requests
+from utils.direct_feed import map_feed_record, extract_feed_records, fetch_feed_tools, scrape_direct_feed, FEED_URL_RE
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FEED_URL = "https://aitoolsdirectory.com/v1/datasource/airtable/test-block"
+
+
+class RecordedResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class RecordedSession:
+    """
+    Replays recorded feed pages in order and remembers the request bodies.
+    """
+
+    def __init__(self, *fixture_names):
+        self.pages = [json.loads((FIXTURES / name).read_text(encoding="utf-8")) for name in fixture_names]
+        self.bodies = []
+
+    def post(self, url, json=None, timeout=None):
+        self.bodies.append(json)
+        return RecordedResponse(self.pages[len(self.bodies) - 1])
+
+
+class OfflineSession:
+    def get(self, url, timeout=None):
+        raise requests.exceptions.ConnectionError("offline")
+
+    def post(self, url, json=None, timeout=None):
+        raise requests.exceptions.ConnectionError("offline")
+
+
+def test_map_feed_record_matches_tile_shape():
+    record = {"id": "rec1", "fields": {"Name": " Pictory ", "Description": "Video creation tool",
+                                       "Website": "https://link.aitoolsdirectory.com/pictory",
+                                       "Tags": ["#Video", "Generative Video"]}}
+    tool = map_feed_record(record)
+    assert tool == {
+        "name": "Pictory",
+        "description": "Video creation tool",
+        "url": "https://link.aitoolsdirectory.com/pictory",
+        "source": "https://aitoolsdirectory.com",
+        "category": "#Video",
+    }
+    assert list(tool) == ["name", "description", "url", "source", "category"]
+
+
+def test_fetch_feed_tools_follows_offsets():
+    session = RecordedSession("aitoolsdirectory_feed_page1.json", "aitoolsdirectory_feed_page2.json")
+    tools = fetch_feed_tools(session, FEED_URL, page_size=4)
+
+    assert session.bodies == [{"page_size": 4},
+                              {"page_size": 4, "offset": "itrAbc123/rec00000000000003"}]
+    # The draft record without a name is dropped
+    assert len(tools) == 6
+    assert tools[4]["category"] == "Advertising"
+    assert "url" not in tools[5] and "description" not in tools[5]
+    assert all(tool["source"] == "https://aitoolsdirectory.com" for tool in tools)
+
+
+def test_scrape_direct_feed_returns_empty_when_offline():
+    assert scrape_direct_feed(OfflineSession(), FEED_URL) == []
+    assert scrape_direct_feed(OfflineSession()) == []
+
+
+class ScalarSession:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def post(self, url, json=None, timeout=None):
+        return RecordedResponse(self.payload)
+
+
+def test_non_object_payload_has_no_records():
+    for payload in ("Service unavailable", 0, None, True):
+        assert extract_feed_records(payload) == []
+        assert scrape_direct_feed(ScalarSession(payload), FEED_URL) == []
+    assert extract_feed_records({"records": [{"id": "rec1"}]}) == [{"id": "rec1"}]
+
+
+def test_malformed_records_are_skipped_or_fall_back():
+    payload = {"records": [None, "rec2", ["Name"], {"id": "rec4", "fields": None, "Name": "Flat"},
+                           {"id": "rec5", "fields": {"Name": "Pictory"}}]}
+    assert [tool["name"] for tool in scrape_direct_feed(ScalarSession(payload), FEED_URL)] == ["Flat", "Pictory"]
+
+    # `fields` that is not an object cannot be mapped: the caller falls back to Selenium
+    for fields in (["Name", "Pictory"], "Pictory"):
+        assert scrape_direct_feed(ScalarSession({"records": [{"id": "rec1", "fields": fields}]}), FEED_URL) == []
+
+
+def test_feed_url_discovery_pattern():
+    html = '<script>window.blocks = {"dataUrl": "/v1/datasource/airtable/7f3c-list1"};</script>'
+    assert FEED_URL_RE.search(html).group("url") == "/v1/datasource/airtable/7f3c-list1"
@@ -0,0 +1,132 @@
+"""
+- test a killed crawl resumes with only the pending jobs and replays finished tools.
+- test finished and stale crawls are not resumed.
+- test the threaded Toolify crawl checkpoints and resumes through the frontier.
+- test a URL listed under two categories is two jobs, and a resumed crawl returns what a full one does.
+- test a frontier file keyed on the URL alone is replaced.
+"""
+import sqlite3
+import pytest
+from utils.frontier import CrawlFrontier
+from web_scraper import AIToolsScraper
+
+JOBS = [("Writing", f"https://www.toolify.ai/category/sub-{i}", f"sub-{i}") for i in range(4)]
+
+
+def tools_for(url):
+    return [{"name": f"tool-{url.rsplit('-', 1)[1]}", "url": url, "source": "https://www.toolify.ai"}]
+
+
+def test_resume_returns_pending_jobs_and_finished_tools(tmp_path):
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier("toolify", path)
+    assert frontier.resume() is None
+    frontier.start(JOBS)
+    frontier.complete(JOBS[1][0], JOBS[1][1], tools_for(JOBS[1][1]))
+    frontier.close()
+
+    # A new process opens the same file
+    jobs, tools = CrawlFrontier("toolify", path).resume()
+    assert jobs == [JOBS[0], JOBS[2], JOBS[3]]
+    assert tools == tools_for(JOBS[1][1])
+    assert CrawlFrontier("other", path).resume() is None
+
+
+def test_finished_and_stale_crawls_are_discarded(tmp_path):
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier("toolify", path)
+    frontier.start(JOBS)
+    frontier.finish()
+    assert frontier.resume() is None
+
+    frontier.start(JOBS)
+    assert CrawlFrontier("toolify", path, max_age=-1).resume() is None
+    assert frontier.resume() is None
+
+
+class Killed(BaseException):
+    pass
+
+
+def make_scraper(monkeypatch, fetched, jobs=JOBS):
+    scraper = AIToolsScraper(start_browser=False, use_cache=False)
+    categories = {}
+    for category, url, name in jobs:
+        categories.setdefault(category, []).append({"link": url, "name": name})
+    monkeypatch.setattr(scraper, "scrape_toolify_categories", lambda: [
+        {"category": category, "sub_categories": subs} for category, subs in categories.items()])
+
+    def scrape_subcategory(url, category_name="", subcategory_name=""):
+        fetched.append(url)
+        return [{**tool, "category": category_name} for tool in tools_for(url)]
+    monkeypatch.setattr(scraper, "scrape_toolify_subcategory", scrape_subcategory)
+    return scraper
+
+
+def test_threaded_crawl_resumes_after_kill(tmp_path, monkeypatch):
+    path = str(tmp_path / "frontier.sqlite")
+    fetched, sunk = [], []
+
+    def dying_sink(tools):
+        if len(sunk) == 2:
+            raise Killed()
+        sunk.extend(tools)
+
+    with pytest.raises(Killed):
+        make_scraper(monkeypatch, fetched).scrape_all_toolify_data_concurrent(
+            max_workers=1, sink=dying_sink, frontier=CrawlFrontier("toolify", path))
+    assert len(sunk) == 2
+
+    refetched, resumed_sink = [], []
+    scraper = make_scraper(monkeypatch, refetched)
+    monkeypatch.setattr(scraper, "scrape_toolify_categories", lambda: pytest.fail("categories refetched"))
+    tools = scraper.scrape_all_toolify_data_concurrent(
+        max_workers=1, sink=resumed_sink.extend, frontier=CrawlFrontier("toolify", path))
+
+    assert len(refetched) == 2
+    # as_completed yields already finished futures in no fixed order, so compare with what was sunk
+    assert set(refetched).isdisjoint(tool["url"] for tool in sunk)
+    assert sorted(tool["name"] for tool in tools) == [f"tool-{i}" for i in range(4)]
+    assert sorted(tool["name"] for tool in resumed_sink) == [f"tool-{i}" for i in range(4)]
+    assert CrawlFrontier("toolify", path).resume() is None
+
+
+def tool_keys(tools):
+    return sorted((tool["name"], tool["category"]) for tool in tools)
+
+
+def test_resume_keeps_a_url_listed_under_two_categories(tmp_path, monkeypatch):
+    # sub-1 is listed under Writing and Marketing
+    jobs = JOBS + [("Marketing", JOBS[1][1], JOBS[1][2])]
+    uninterrupted = make_scraper(monkeypatch, [], jobs).scrape_all_toolify_data_concurrent(
+        max_workers=1, sink=lambda tools: None)
+
+    path = str(tmp_path / "frontier.sqlite")
+    sunk = []
+
+    def dying_sink(tools):
+        if len(sunk) == 3:
+            raise Killed()
+        sunk.extend(tools)
+
+    with pytest.raises(Killed):
+        make_scraper(monkeypatch, [], jobs).scrape_all_toolify_data_concurrent(
+            max_workers=1, sink=dying_sink, frontier=CrawlFrontier("toolify", path))
+    resumed = make_scraper(monkeypatch, [], jobs).scrape_all_toolify_data_concurrent(
+        max_workers=1, sink=lambda tools: None, frontier=CrawlFrontier("toolify", path))
+
+    assert len(uninterrupted) == 5
+    assert tool_keys(resumed) == tool_keys(uninterrupted)
+
+
+def test_frontier_keyed_on_url_is_replaced(tmp_path):
+    path = str(tmp_path / "frontier.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE frontier (crawl TEXT NOT NULL, url TEXT NOT NULL, position INTEGER NOT NULL, "
+                     "category TEXT, subcategory TEXT, status TEXT NOT NULL, tools TEXT, started_at REAL NOT NULL, "
+                     "PRIMARY KEY (crawl, url))")
+    conn.close()
+
+    frontier = CrawlFrontier("toolify", path)
+    frontier.start([("Writing", JOBS[0][1], "sub-0"), ("Marketing", JOBS[0][1], "sub-0")])
+    assert frontier.resume()[0] == [("Writing", JOBS[0][1], "sub-0"), ("Marketing", JOBS[0][1], "sub-0")]
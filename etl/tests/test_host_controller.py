@@ -0,0 +1,206 @@
+"""
+- test Retry-After pauses the host and the request is retried.
+- test 5xx responses are retried with backoff and retries are bounded.
+- test AIMD: the per-host limit backs off under throttling and grows when the host keeps up.
+- test Retry-After parsing for seconds and HTTP dates.
+- test a request failing with a non-retryable error frees its slot.
+- test Retry-After pauses are capped and non-finite values are ignored.
+- test AsyncFetcher requests share the host limits and are retried like the threaded ones.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from utils.async_fetcher import AsyncFetcher
+from utils.host_controller import HostController, HostLimiter, parse_retry_after
+
+
+class StubSite:
+    """
+    Local HTTP server whose responses are scripted per path:
+    /throttle-once answers 429 with Retry-After once, /flaky answers 503 `failures`
+    times, /down always answers 503 and /capacity answers 429 whenever more than
+    `capacity` requests are in flight.
+    """
+
+    def __init__(self, capacity=3, failures=2, retry_after="0.3", delay=0.02):
+        self.capacity = capacity
+        self.failures = failures
+        self.retry_after = retry_after
+        self.delay = delay
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def respond(self, path):
+        with self.lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            hits = self.hits[path]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            in_flight = self.in_flight
+        try:
+            time.sleep(self.delay)
+            if path == "/throttle-once" and hits == 1:
+                return 429, {"Retry-After": self.retry_after}
+            if path == "/flaky" and hits <= self.failures:
+                return 503, {}
+            if path == "/down":
+                return 503, {}
+            if path == "/capacity" and in_flight > self.capacity:
+                return 429, {}
+            return 200, {}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def stub_site():
+    site = StubSite()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers = site.respond(self.path.split("?")[0])
+            body = b"ok" if status == 200 else b"busy"
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    site.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_after_pauses_host_and_retries(stub_site):
+    controller = HostController(backoff_base=0.01)
+    started = time.monotonic()
+    res = controller.get(f"{stub_site.url}/throttle-once")
+
+    assert res.status_code == 200
+    assert time.monotonic() - started >= 0.3
+    stats = controller.stats()[stub_site.url.split("//")[1]]
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+    assert stats["p50"] is not None
+
+
+def test_server_errors_are_retried_then_given_up(stub_site):
+    controller = HostController(backoff_base=0.01, max_retries=3)
+    assert controller.get(f"{stub_site.url}/flaky").status_code == 200
+    assert stub_site.hits["/flaky"] == 3
+
+    res = controller.get(f"{stub_site.url}/down")
+    assert res.status_code == 503
+    assert stub_site.hits["/down"] == 4
+
+
+def run_burst(controller, url, requests_count=80, workers=16):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda i: controller.get(f"{url}?i={i}").status_code, range(requests_count)))
+
+
+def test_limit_backs_off_under_throttling(stub_site):
+    controller = HostController(initial_limit=12, backoff_base=0.01, max_retries=8, cooldown=0.05)
+    statuses = run_burst(controller, f"{stub_site.url}/capacity")
+
+    assert statuses == [200] * 80
+    stats = controller.stats()[stub_site.url.split("//")[1]]
+    assert stats["decreases"] > 0
+    assert stats["limit"] < 12
+    assert stats["in_flight"] == 0
+
+
+def test_limit_grows_while_host_keeps_up(stub_site):
+    stub_site.capacity = 100
+    controller = HostController(initial_limit=2, max_limit=8)
+    statuses = run_burst(controller, f"{stub_site.url}/capacity")
+
+    assert statuses == [200] * 80
+    stats = controller.stats()[stub_site.url.split("//")[1]]
+    assert stats["limit"] > 2
+    assert stub_site.max_in_flight <= 8
+    assert stats["throttled"] == stats["retries"] == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 01 Jul 2025 10:00:30 GMT", now=1751364000.0) == 30.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("inf") is None
+    assert parse_retry_after("nan") is None
+
+
+def test_retry_after_pause_is_capped():
+    limiter = HostLimiter("www.toolify.ai", max_pause=2.0)
+    limiter.acquire()
+    limiter.release(0.1, throttled=True, retry_after=7200)
+    assert 1.5 < limiter.stats()["paused_for"] <= 2.0
+
+    limiter = HostLimiter("www.toolify.ai")
+    for retry_after in (float("inf"), float("nan")):
+        limiter.acquire()
+        limiter.release(0.1, throttled=True, retry_after=retry_after)
+    assert limiter.stats()["paused_for"] == 0.0
+
+
+def test_non_retryable_error_frees_the_slot():
+    class RedirectLoop:
+        def get(self, url, **kwargs):
+            raise requests.TooManyRedirects("Exceeded 30 redirects")
+
+    controller = HostController(RedirectLoop(), initial_limit=1, min_limit=1, max_limit=1)
+    for _ in range(3):
+        with pytest.raises(requests.TooManyRedirects):
+            controller.get("https://www.toolify.ai/loop")
+    assert controller.stats()["www.toolify.ai"]["in_flight"] == 0
+
+
+def fetch_all(controller, urls, **options):
+    async def crawl():
+        async with AsyncFetcher(controller=controller, **options) as fetcher:
+            return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+    return asyncio.run(crawl())
+
+
+def test_async_fetches_are_retried_through_the_controller(stub_site):
+    controller = HostController(backoff_base=0.01, max_retries=3)
+    started = time.monotonic()
+    throttled, flaky, down = fetch_all(controller, [f"{stub_site.url}/{path}" for path in ("throttle-once", "flaky", "down")])
+
+    assert throttled[0] == flaky[0] == 200 and throttled[2] == b"ok"
+    assert time.monotonic() - started >= 0.3
+    assert down is None
+    assert (stub_site.hits["/throttle-once"], stub_site.hits["/flaky"], stub_site.hits["/down"]) == (2, 3, 4)
+    stats = controller.stats()[stub_site.url.split("//")[1]]
+    # 503 counts as throttling too: one 429, two /flaky and four /down answers
+    assert stats["throttled"] == 1 + 2 + 4
+    assert stats["retries"] == 1 + 2 + 3
+    assert stats["in_flight"] == 0
+
+
+def test_async_fetches_share_the_adaptive_host_limit(stub_site):
+    controller = HostController(initial_limit=12, backoff_base=0.01, max_retries=8, cooldown=0.05)
+    responses = fetch_all(controller, [f"{stub_site.url}/capacity?i={i}" for i in range(80)], per_host_limit=16)
+
+    assert [response[0] for response in responses] == [200] * 80
+    stats = controller.stats()[stub_site.url.split("//")[1]]
+    assert stats["decreases"] > 0
+    assert stats["limit"] < 12
+    assert stats["in_flight"] == 0
@@ -0,0 +1,107 @@
+"""
+- test unchanged pages (304 or same body) skip parsing.
+- test conditional headers are built from stored validators.
+- test size-bounded LRU eviction.
+- test a 304 for an evicted entry asks for a refetch, and a failed parse leaves nothing pending.
+- test a subcategory listed under two categories gets the right category on a cache hit.
+"""
+import pytest
+import web_scraper
+from utils.http_cache import HTTPCache, NotModifiedMiss
+from web_scraper import AIToolsScraper
+
+URL = "https://www.toolify.ai/category/ai-writing"
+
+
+def counting_parser(calls):
+    def parse(body):
+        calls.append(body)
+        return [{"name": body.decode()}]
+    return parse
+
+
+def test_not_modified_and_same_body_skip_parsing(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.sqlite"))
+    calls = []
+    parse = counting_parser(calls)
+
+    assert cache.request_headers(URL) == {}
+    first = cache.resolve(URL, 200, {"ETag": '"v1"'}, b"page", parse)
+    assert cache.request_headers(URL) == {"If-None-Match": '"v1"'}
+
+    assert cache.resolve(URL, 304, {}, b"", parse) == first
+    assert cache.resolve(URL, 200, {}, b"page", parse) == first
+    assert len(calls) == 1
+
+    assert cache.resolve(URL, 200, {}, b"new page", parse) == [{"name": "new page"}]
+    assert len(calls) == 2
+    assert cache.stats["not_modified"] == 1
+    assert cache.stats["unchanged_body"] == 1
+    assert cache.stats["misses"] == 2
+
+
+def test_cache_persists_between_runs(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = HTTPCache(path)
+    cache.resolve(URL, 200, {"Last-Modified": "Wed, 01 Jul 2025 10:00:00 GMT"}, b"page", counting_parser([]))
+    cache.close()
+
+    reopened = HTTPCache(path)
+    assert reopened.request_headers(URL) == {"If-Modified-Since": "Wed, 01 Jul 2025 10:00:00 GMT"}
+
+
+def test_eviction_keeps_cache_under_max_bytes(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.sqlite"), max_bytes=200)
+    for i in range(20):
+        cache.resolve(f"{URL}?page={i}", 200, {}, f"page {i}".encode(), counting_parser([]))
+
+    assert cache.size_bytes() <= 200
+    assert cache.stats["evictions"] > 0
+    # Most recent entries survive
+    assert cache.request_headers(f"{URL}?page=19") == {}
+    assert cache.lookup(f"{URL}?page=19", 200, {}, b"page 19") == [{"name": "page 19"}]
+    assert cache.lookup(f"{URL}?page=0", 200, {}, b"page 0") is None
+
+
+def test_evicted_304_and_failed_parse(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.sqlite"))
+    with pytest.raises(NotModifiedMiss):
+        cache.resolve(URL, 304, {}, b"", counting_parser([]))
+
+    def failing_parser(body):
+        raise ValueError("bad page")
+    with pytest.raises(ValueError):
+        cache.resolve(URL, 200, {"ETag": '"v1"'}, b"page", failing_parser)
+    cache.store(URL, [{"name": "stale"}])
+    assert cache.request_headers(URL) == {}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code, self.content, self.headers = status_code, body, headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_cached_subcategory_gets_category_of_each_listing(tmp_path, monkeypatch):
+    scraper = AIToolsScraper(start_browser=False, use_cache=False)
+    scraper.http_cache = HTTPCache(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(web_scraper, "parse_toolify_subcategory",
+                        lambda body: [{"name": body.decode(), "category": ""}])
+    requests = []
+
+    def get(url, headers=None):
+        requests.append(headers)
+        return FakeResponse(304) if headers else FakeResponse(200, b"Tool", {"ETag": '"v1"'})
+    monkeypatch.setattr(scraper.controller, "get", get)
+
+    assert scraper.scrape_toolify_subcategory(URL, "Writing") == [{"name": "Tool", "category": "Writing"}]
+    assert scraper.scrape_toolify_subcategory(URL, "Marketing") == [{"name": "Tool", "category": "Marketing"}]
+    assert scraper.http_cache.stats["not_modified"] == 1
+
+    # The entry is evicted between sending the validators and reading the 304
+    monkeypatch.setattr(scraper, "cache_headers", lambda url: {"If-None-Match": '"v1"'})
+    scraper.http_cache._conn.execute("DELETE FROM entries")
+    assert scraper.scrape_toolify_subcategory(URL, "Writing") == [{"name": "Tool", "category": "Writing"}]
+    assert requests[-2:] == [{"If-None-Match": '"v1"'}, None]
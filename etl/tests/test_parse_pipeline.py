@@ -0,0 +1,93 @@
+"""
+- test every parser backend gives the same tools for a Toolify subcategory page.
+- test the pipeline parses every fetched page in worker processes and tags each job's category.
+- test failed fetches and parser errors are counted and skipped without stopping the run.
+- test a second run over unchanged pages is answered from the HTTP cache without parsing.
+- test the worker entrypoint returns tools without a category and its parse time.
+"""
+import threading
+from pathlib import Path
+import pytest
+from utils.http_cache import HTTPCache
+from utils.parse_pipeline import ParsePipeline, parse_page_timed
+from utils.parsers import PARSER_BACKENDS, parse_toolify_subcategory, resolve_parser_backend
+
+PAGE = (Path(__file__).parent / "fixtures" / "toolify_subcategory.html").read_bytes()
+
+EXPECTED = [
+    {"name": "Jasper", "description": "Jasper writes blog posts, ads & emails in your brand voice.",
+     "url": "https://www.jasper.ai/?utm_source=toolify"},
+    {"name": "Copy.ai", "description": "GTM workflows <powered> by AI", "url": "https://www.copy.ai/"},
+    {"name": "Rytr", "description": "Écrivez plus vite — 40+ use cases", "url": ""},
+    {"name": "Anyword", "description": "", "url": ""},
+]
+
+
+def expected_tools(category=""):
+    return [{**tool, "source": "https://www.toolify.ai", "category": category} for tool in EXPECTED]
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_backends_parse_subcategory_identically(backend):
+    if resolve_parser_backend(backend) != backend:
+        pytest.skip(f"{backend} is not installed")
+
+    assert parse_toolify_subcategory(PAGE, "Writing", backend=backend) == expected_tools("Writing")
+    assert parse_toolify_subcategory(PAGE.decode("utf-8"), backend=backend) == expected_tools()
+
+
+def test_pipeline_parses_pages_and_sets_categories():
+    pages = {f"https://www.toolify.ai/category/{i}": PAGE for i in range(6)}
+    jobs = [("Writing" if i % 2 else "Marketing", url, f"sub-{i}") for i, url in enumerate(pages)]
+    delivered = {}
+
+    pipeline = ParsePipeline(pages.get, fetch_workers=3, parse_workers=2, queue_size=2)
+    tools = pipeline.run(jobs, on_result=lambda label, batch: delivered.setdefault(label, batch))
+
+    assert len(tools) == 6 * len(EXPECTED)
+    for category, _, label in jobs:
+        assert delivered[label] == expected_tools(category)
+    stats = pipeline.stats.as_dict()
+    assert (stats["pages_fetched"], stats["fetch_failures"], stats["pages_parsed"]) == (6, 0, 6)
+    assert stats["parse_seconds"] > 0
+
+
+def test_pipeline_skips_failed_fetches_and_parser_errors():
+    fetched = {"ok": PAGE, "unpicklable": threading.Lock()}
+    jobs = [("Writing", url, url) for url in ("ok", "missing", "unpicklable")]
+
+    pipeline = ParsePipeline(fetched.get, fetch_workers=2, parse_workers=1)
+    tools = pipeline.run(jobs)
+
+    # `unpicklable` fails on its way to the parser process, `missing` was never fetched
+    assert tools == expected_tools("Writing")
+    stats = pipeline.stats.as_dict()
+    assert (stats["pages_fetched"], stats["fetch_failures"], stats["pages_parsed"]) == (2, 1, 1)
+
+
+def test_unchanged_pages_come_from_the_cache(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.sqlite"))
+    url = "https://www.toolify.ai/category/ai-copywriting"
+
+    def fetch_page(page_url):
+        return cache.lookup(page_url, 200, {"ETag": '"v1"'}, PAGE) or PAGE
+
+    # The same subcategory is listed under two categories
+    jobs = [("Writing", url, "copywriting"), ("Marketing", url, "copywriting")]
+    first = ParsePipeline(fetch_page, fetch_workers=1, parse_workers=1, cache=cache)
+    first.run(jobs[:1])
+    second = ParsePipeline(fetch_page, fetch_workers=1, parse_workers=1, cache=cache)
+    tools = second.run(jobs)
+
+    assert first.stats.pages_parsed == 1
+    assert second.stats.pages_parsed == 0
+    assert sorted(tools, key=lambda tool: tool["category"]) == expected_tools("Marketing") + expected_tools("Writing")
+    assert cache.stats["unchanged_body"] == 2
+    cache.close()
+
+
+def test_parse_page_timed_returns_uncategorized_tools():
+    tools, seconds = parse_page_timed(PAGE, "html.parser")
+
+    assert tools == expected_tools()
+    assert seconds > 0
@@ -0,0 +1,70 @@
+"""
+- test the pandas row hash matches what ROW_HASH_SQL computes in Postgres.
+- test both hash sides agree on a boolean trending value.
+- test only new or changed scraped agents are kept for the upsert.
+"""
+import hashlib
+import re
+import pandas as pd
+import pytest
+from utils.models import ROW_HASH_SQL
+from utils.utils import row_hash, changed_agents
+
+# Postgres casts used in ROW_HASH_SQL; a boolean cast to text is 'true'/'false'
+PG_CASTS = {"int": int, "text": lambda v: ("true" if v else "false") if isinstance(v, bool) else str(v)}
+
+
+def agents(*rows):
+    return pd.DataFrame([{"name": name, "description": desc, "homepage_url": f"https://{name.lower()}.ai",
+                          "category": "Writing", "source": "https://www.toolify.ai", "trending": 0}
+                         for name, desc in rows])
+
+
+def test_row_hash_matches_concat_ws():
+    df = agents(("Jasper", "Writes copy"))
+    # md5(concat_ws(E'\x1f', description, homepage_url, category, source, trending::int::text))
+    expected = hashlib.md5("Writes copy\x1fhttps://jasper.ai\x1fWriting\x1fhttps://www.toolify.ai\x1f0"
+                           .encode()).hexdigest()
+    assert row_hash(df).tolist() == [expected]
+
+    # concat_ws skips NULLs instead of leaving an empty field
+    df.loc[0, "description"] = None
+    assert row_hash(df).tolist() == [
+        hashlib.md5("https://jasper.ai\x1fWriting\x1fhttps://www.toolify.ai\x1f0".encode()).hexdigest()]
+
+
+def postgres_row_hash(row: dict) -> str:
+    """
+    ROW_HASH_SQL evaluated the way Postgres does for one stored row.
+    """
+    arguments = re.fullmatch(r"md5\(concat_ws\(E'\\x1f', (.*)\)\)", ROW_HASH_SQL).group(1)
+    parts = []
+    for argument in arguments.split(", "):
+        column, *casts = argument.split("::")
+        value = row[column]
+        if value is None:
+            continue
+        for cast in casts:
+            value = PG_CASTS[cast](value)
+        parts.append(str(value))
+    return hashlib.md5("\x1f".join(parts).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("trending", [True, False])
+def test_row_hash_matches_postgres_on_boolean_trending(trending):
+    # agents.trending is a Boolean column; the scraped frame may hold bools or 0/1
+    stored = {"description": "Writes copy", "homepage_url": "https://jasper.ai", "category": "Writing",
+              "source": "https://www.toolify.ai", "trending": trending}
+    for scraped in (trending, int(trending)):
+        df = pd.DataFrame([{**stored, "name": "Jasper", "trending": scraped}])
+        assert row_hash(df).tolist() == [postgres_row_hash(stored)]
+
+
+def test_changed_agents_keeps_new_and_changed_rows():
+    stored = agents(("Jasper", "Writes copy"), ("Rytr", "Writes emails"), ("Removed", "Gone from the site"))
+    fingerprints = pd.DataFrame({"name": stored["name"], "row_hash": row_hash(stored)})
+
+    scraped = agents(("Jasper", "Writes copy"), ("Rytr", "Writes emails and blogs"), ("Writesonic", "New"))
+    assert changed_agents(scraped, fingerprints)["name"].tolist() == ["Rytr", "Writesonic"]
+
+    assert changed_agents(stored.iloc[:2], fingerprints).empty
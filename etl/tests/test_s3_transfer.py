@@ -0,0 +1,114 @@
+"""
+- test uploads point the manifest at the newest snapshot and delta, so no listing is needed.
+- test the listing fallback pages past the first 1000 keys.
+- test large files go up as multipart uploads.
+- test CSV and Parquet objects are read whole or in chunks without a local copy.
+- test Parquet chunks are read row group by row group through ranged GETs.
+"""
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
+from utils import s3_transfer
+from utils.snapshots import SnapshotWriter
+
+BUCKET = "scraped-ai-agent"
+TOOLS = [{"name": f"Tool {i}", "description": "Writes copy", "url": f"https://tool{i}.ai",
+          "source": "https://www.toolify.ai", "category": "Writing"} for i in range(10)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def write_file(tmp_path, name, snapshot_format=None):
+    path = tmp_path / name
+    if snapshot_format:
+        writer = SnapshotWriter(str(path), snapshot_format)
+        writer.write(TOOLS)
+        writer.close()
+    else:
+        path.write_text("change,name,description,url,source,category\nadded,Tool 0,,,,\n")
+    return str(path)
+
+
+def test_manifest_tracks_latest_snapshot_and_delta(client, tmp_path, monkeypatch):
+    s3_transfer.upload(client, BUCKET, write_file(tmp_path, "20250701_000000_ai_tools_scraped.parquet", "parquet"))
+    s3_transfer.upload(client, BUCKET, write_file(tmp_path, "20250702_000000_ai_tools_scraped.parquet", "parquet"))
+    s3_transfer.upload(client, BUCKET, write_file(tmp_path, "20250702_000000_ai_tools_delta.csv"))
+
+    manifest = s3_transfer.read_manifest(client, BUCKET)
+    assert manifest["snapshot"]["key"] == "20250702_000000_ai_tools_scraped.parquet"
+    assert manifest["delta"]["key"] == "20250702_000000_ai_tools_delta.csv"
+
+    monkeypatch.setattr(client, "get_paginator", lambda name: pytest.fail("bucket was listed"))
+    assert s3_transfer.latest_key(client, BUCKET) == "20250702_000000_ai_tools_scraped.parquet"
+    assert s3_transfer.latest_key(client, BUCKET, "delta") == "20250702_000000_ai_tools_delta.csv"
+
+
+def test_listing_fallback_pages_past_1000_keys(client):
+    for i in range(1001):
+        client.put_object(Bucket=BUCKET, Key=f"logs/{i:04d}.log", Body=b"")
+    client.put_object(Bucket=BUCKET, Key="zz_ai_tools_scraped.csv", Body=b"name\n")
+
+    assert s3_transfer.read_manifest(client, BUCKET) == {}
+    assert s3_transfer.latest_key(client, BUCKET) == "zz_ai_tools_scraped.csv"
+    assert s3_transfer.latest_key(client, BUCKET, "delta") is None
+
+
+def test_large_files_use_multipart(client, tmp_path):
+    path = tmp_path / "big_ai_tools_scraped.csv"
+    path.write_bytes(b"x" * (11 * 1024 * 1024))
+    config = TransferConfig(multipart_threshold=5 * 1024 * 1024, multipart_chunksize=5 * 1024 * 1024)
+
+    entry = s3_transfer.upload(client, BUCKET, str(path), config=config)
+    # Multipart ETags end with the number of parts
+    assert entry["etag"].endswith("-3")
+    assert entry["size"] == 11 * 1024 * 1024
+
+
+@pytest.mark.parametrize("snapshot_format", ["parquet", "csv"])
+def test_read_object_without_local_copy(client, tmp_path, snapshot_format):
+    name = f"20250701_000000_ai_tools_scraped.{snapshot_format}"
+    s3_transfer.upload(client, BUCKET, write_file(tmp_path, name, snapshot_format))
+
+    df = s3_transfer.read_object(client, BUCKET, name)
+    assert df["name"].tolist() == [tool["name"] for tool in TOOLS]
+
+    chunks = list(s3_transfer.iter_object_chunks(client, BUCKET, name, chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+
+def test_parquet_chunks_use_ranged_reads(client, tmp_path, monkeypatch):
+    rows = [{"name": f"Tool {i}", "description": f"Writes copy #{i * 7919 % 10007}"} for i in range(50_000)]
+    path = tmp_path / "20250701_000000_ai_tools_scraped.parquet"
+    pq.write_table(pa.Table.from_pylist(rows), path, row_group_size=5000)
+    s3_transfer.upload(client, BUCKET, str(path))
+    size = path.stat().st_size
+
+    ranges = []
+    get_object = client.get_object
+
+    def ranged_get(**kwargs):
+        ranges.append(kwargs.get("Range"))
+        return get_object(**kwargs)
+
+    monkeypatch.setattr(s3_transfer, "RANGE_SIZE", 1024)
+    monkeypatch.setattr(client, "get_object", ranged_get)
+    monkeypatch.setattr(client, "download_fileobj", lambda *a, **kw: pytest.fail("object was downloaded whole"))
+    chunks = list(s3_transfer.iter_object_chunks(client, BUCKET, path.name, chunksize=5000))
+
+    assert sum(len(chunk) for chunk in chunks) == 50_000
+    assert chunks[-1]["name"].iloc[-1] == "Tool 49999"
+    assert all(ranges)
+    # Requests cover the footer or one column chunk, never the whole object
+    largest = max(int(end) - int(start) + 1 for start, end in (r[len("bytes="):].split("-") for r in ranges))
+    assert largest < size / 4
@@ -0,0 +1,52 @@
+"""
+- test the compiled tile plan matches extract_tool_data on a saved page.
+- test the learned selector cut-off falls back for tiles with another layout.
+- test link and tag resolution edge cases.
+"""
+from pathlib import Path
+from bs4 import BeautifulSoup
+from utils.parsers import extract_tool_data
+from utils.selector_plan import ToolTilePlan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def tiles_from(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.select_one("div.sv-tiles-list").find_all(recursive=False)
+
+
+def extract_page(tiles):
+    plan = ToolTilePlan()
+    state = plan.new_page()
+    return [plan.extract(tile, state) for tile in tiles]
+
+
+def test_plan_matches_reference_on_saved_page():
+    tiles = tiles_from((FIXTURES / "aitoolsdirectory_page.html").read_text(encoding="utf-8"))
+    expected = [extract_tool_data(tile) for tile in tiles]
+    actual = extract_page(tiles)
+    assert actual == expected
+    assert [list(tool) for tool in actual] == [list(tool) for tool in expected]
+
+
+def test_learned_cutoff_falls_back_for_odd_tiles():
+    regular = ('<div><h3>Tool {i}</h3><p class="sv-tile__description">A long enough description for tool {i}</p>'
+               '<span class="sv-tag">Writing</span><a href="https://tool{i}.ai">Visit</a></div>')
+    odd = ('<div><strong>Odd Tool</strong><div class="summary">Summary text that is long enough here</div>'
+           '<span class="chip">Video</span><a href="/tool/odd">Details</a>'
+           '<a href="//aitoolsdirectory.com/odd">More</a></div>')
+    html = '<div class="sv-tiles-list">' + ''.join(regular.format(i=i) for i in range(8)) + odd + '</div>'
+    tiles = tiles_from(html)
+    assert extract_page(tiles) == [extract_tool_data(tile) for tile in tiles]
+    assert extract_page(tiles)[-1]["category"] == "Video"
+
+
+def test_descendant_selector_and_fallback_text():
+    html = ('<div class="sv-tiles-list">'
+            '<div><b>Hi</b><sv-tile__description><sv-text-reset>Custom element description text'
+            '</sv-text-reset></sv-tile__description><a href="#x">x</a></div>'
+            '<div><h2>Only Title</h2><div><span>Longest free text in this tile wins</span></div></div>'
+            '</div>')
+    tiles = tiles_from(html)
+    assert extract_page(tiles) == [extract_tool_data(tile) for tile in tiles]
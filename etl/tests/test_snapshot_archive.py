@@ -0,0 +1,91 @@
+"""
+- test unchanged (source, category) chunks are stored once across runs.
+- test any archived snapshot is rebuilt with the snapshot schema.
+- test Parquet and CSV snapshot files archive to the same chunks.
+- test archived snapshots are read through the S3 manifest like plain snapshots.
+"""
+import boto3
+from moto import mock_aws
+from utils import s3_transfer
+from utils.snapshot_archive import (
+    S3Store,
+    LocalStore,
+    archive_snapshot,
+    list_snapshots,
+    load_snapshot,
+    read_snapshot_tools,
+)
+from utils.snapshots import SNAPSHOT_SCHEMA, SnapshotWriter
+
+RUN_1 = [
+    {"name": f"Writer {i}", "description": "Writes copy", "url": f"https://writer{i}.ai",
+     "source": "https://www.toolify.ai", "category": "Writing"} for i in range(50)
+] + [
+    {"name": f"Video {i}", "description": "Edits video", "url": f"https://video{i}.ai",
+     "source": "https://www.toolify.ai", "category": "Video"} for i in range(50)
+] + [
+    {"name": "Pictory", "description": None, "url": "https://pictory.ai",
+     "source": "https://aitoolsdirectory.com", "category": None},
+]
+# Same tools in another order, with one Video tool changed
+RUN_2 = list(reversed(RUN_1[:50])) + [dict(RUN_1[50], description="Edits and captions video")] + RUN_1[51:]
+
+
+def names(table):
+    return sorted(table.column("name").to_pylist())
+
+
+def test_unchanged_chunks_are_stored_once(tmp_path):
+    store = LocalStore(str(tmp_path / "archive"))
+    first = archive_snapshot(RUN_1, store, "20250701_000000_ai_tools_scraped")
+    second = archive_snapshot(RUN_2, store, "20250702_000000_ai_tools_scraped")
+    third = archive_snapshot(RUN_2, store, "20250703_000000_ai_tools_scraped")
+
+    assert (first["new_chunks"], second["new_chunks"], third["new_chunks"]) == (3, 1, 0)
+    assert len(list((tmp_path / "archive" / "chunks").rglob("*.zst"))) == 4
+    assert list_snapshots(store) == ["20250701_000000_ai_tools_scraped", "20250702_000000_ai_tools_scraped",
+                                     "20250703_000000_ai_tools_scraped"]
+
+
+def test_archived_snapshots_are_rebuilt(tmp_path):
+    store = LocalStore(str(tmp_path / "archive"))
+    archive_snapshot(RUN_1, store, "run_1")
+    archive_snapshot(RUN_2, store, "run_2")
+
+    old = load_snapshot(store, "run_1")
+    assert old.schema.equals(SNAPSHOT_SCHEMA)
+    assert names(old) == sorted(tool["name"] for tool in RUN_1)
+    video = load_snapshot(store, "run_2").to_pandas().set_index("name")
+    assert video.loc["Video 0", "description"] == "Edits and captions video"
+    assert old.to_pandas().set_index("name").loc["Video 0", "description"] == "Edits video"
+
+
+def test_parquet_and_csv_snapshots_share_chunks(tmp_path):
+    paths = []
+    for snapshot_format in ("parquet", "csv"):
+        writer = SnapshotWriter(str(tmp_path / f"snapshot.{snapshot_format}"), snapshot_format)
+        writer.write(RUN_1)
+        paths.append(writer.close())
+
+    store = LocalStore(str(tmp_path / "archive"))
+    assert archive_snapshot(read_snapshot_tools(paths[0]), store, "from_parquet")["new_chunks"] == 3
+    assert archive_snapshot(read_snapshot_tools(paths[1]), store, "from_csv")["new_chunks"] == 0
+
+
+def test_archived_snapshot_read_through_s3_manifest(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="scraped-ai-agent")
+        archive_snapshot(RUN_1, S3Store(client, "scraped-ai-agent"), "run_1")
+        s3_transfer.update_manifest(client, "scraped-ai-agent", "snapshot",
+                                    {"key": "archive/snapshots/run_1.json"})
+
+        key = s3_transfer.latest_key(client, "scraped-ai-agent")
+        df = s3_transfer.read_object(client, "scraped-ai-agent", key)
+        chunks = list(s3_transfer.iter_object_chunks(client, "scraped-ai-agent", key, chunksize=40))
+
+    assert sorted(df["name"]) == sorted(tool["name"] for tool in RUN_1)
+    assert sum(len(chunk) for chunk in chunks) == len(RUN_1)
+    assert max(len(chunk) for chunk in chunks) == 40
@@ -0,0 +1,139 @@
+"""
+- test Parquet snapshots keep the fixed schema across appended row groups.
+- test read_data returns the stored dtypes and the ETL output matches the CSV path.
+- test CSV export and the CSV snapshot format keep the historical layout.
+- test the batched sink never blocks producers on disk and merges queued batches.
+- test an unfinished snapshot only exists as a synced .part file.
+- test a Parquet .part left by a crashed run cannot be read.
+- test the scraper opens no sink at import and save_tools raises outside a run.
+"""
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from utils.snapshots import SNAPSHOT_SCHEMA, BatchedSink, SnapshotWriter, export_csv
+from utils.utils import read_data, clean_data, transform_data
+
+TOOLS = [
+    {"name": "Jasper", "description": "Writes copy", "url": "https://jasper.ai",
+     "source": "https://www.toolify.ai", "category": "Writing & Editing"},
+    {"name": "Pictory", "description": "Video creation tool", "url": "https://pictory.ai",
+     "source": "https://aitoolsdirectory.com", "category": "#Video"},
+    {"name": "Draft", "source": "https://aitoolsdirectory.com"},
+    {"name": None, "description": "No name, dropped"},
+]
+
+
+def write_snapshot(path, snapshot_format="parquet", row_group_size=2):
+    writer = SnapshotWriter(str(path), snapshot_format, row_group_size=row_group_size)
+    for tool in TOOLS:
+        writer.write([tool])
+    return writer.close()
+
+
+def test_parquet_snapshot_schema_and_row_groups(tmp_path):
+    path = write_snapshot(tmp_path / "snapshot.parquet")
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.schema_arrow.equals(SNAPSHOT_SCHEMA)
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.metadata.num_rows == 3
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_read_data_parquet_matches_csv_etl(tmp_path):
+    df = read_data(write_snapshot(tmp_path / "snapshot.parquet"))
+    assert df["trending"].dtype == "int64"
+    assert df["created_at"].dtype == "datetime64[ns]"
+
+    csv_df = read_data(write_snapshot(tmp_path / "snapshot.csv", "csv"))
+    columns = ["name", "description", "homepage_url", "category", "source", "trending"]
+    from_parquet = transform_data(clean_data(df))[columns].astype(object)
+    from_csv = transform_data(clean_data(csv_df))[columns].astype(object)
+    assert from_parquet.values.tolist() == from_csv.values.tolist()
+
+
+def test_export_csv_layout(tmp_path):
+    snapshot_path = write_snapshot(tmp_path / "snapshot.parquet")
+    csv_path = export_csv(snapshot_path)
+
+    assert csv_path.endswith("snapshot.csv")
+    csv_snapshot_path = write_snapshot(tmp_path / "scraped.csv", "csv")
+    assert open(csv_path).read().splitlines() == open(csv_snapshot_path).read().splitlines()
+    assert list(pd.read_csv(csv_path).columns) == ["name", "description", "url", "source", "category"]
+
+
+def test_close_without_rows_returns_none(tmp_path):
+    assert SnapshotWriter(str(tmp_path / "empty.parquet")).close() is None
+
+
+class SlowWriter(SnapshotWriter):
+    def write(self, tools):
+        time.sleep(0.05)
+        super().write(tools)
+
+
+def test_batched_sink_does_not_block_producers(tmp_path):
+    sink = BatchedSink(SlowWriter(str(tmp_path / "snapshot.parquet")), fsync_interval=0.01)
+    started = time.perf_counter()
+    for _ in range(20):
+        sink.put(TOOLS)
+    assert time.perf_counter() - started < 0.05
+
+    path = sink.close()
+    assert pq.ParquetFile(path).metadata.num_rows == 60
+    # Queued batches are merged into fewer, larger writes
+    assert sink.stats["batches"] == 20
+    assert sink.stats["writes"] < 20
+
+
+def test_unfinished_snapshot_stays_part_file(tmp_path):
+    path = tmp_path / "snapshot.csv"
+    writer = SnapshotWriter(str(path), "csv")
+    writer.write(TOOLS)
+    writer.sync()
+
+    # A run killed here leaves only the synced .part file
+    assert not path.exists()
+    assert open(writer.part_path).read().count("\n") == 4
+
+    assert writer.close() == str(path)
+    assert path.exists() and not os.path.exists(writer.part_path)
+
+
+def test_unfinished_parquet_part_is_not_readable(tmp_path):
+    path = tmp_path / "snapshot.parquet"
+    writer = SnapshotWriter(str(path), row_group_size=2)
+    writer.write(TOOLS)
+    writer.sync()
+
+    # The row groups are on disk, but the footer is only written by close()
+    assert os.path.getsize(writer.part_path) > 0
+    with pytest.raises(pa.ArrowInvalid):
+        pq.ParquetFile(writer.part_path)
+
+    assert pq.ParquetFile(writer.close()).metadata.num_rows == 3
+
+
+def test_batched_sink_surfaces_write_errors(tmp_path):
+    class BrokenWriter(SnapshotWriter):
+        def write(self, tools):
+            raise OSError("disk full")
+
+    sink = BatchedSink(BrokenWriter(str(tmp_path / "snapshot.parquet")))
+    sink.put(TOOLS)
+    with pytest.raises(RuntimeError, match="disk full"):
+        sink.close()
+    assert not (tmp_path / "snapshot.parquet").exists()
+
+
+def test_scraper_sink_only_open_during_run():
+    import web_scraper
+
+    assert web_scraper.snapshot is None
+    assert not any(thread.name == "snapshot-sink" for thread in threading.enumerate())
+    with pytest.raises(RuntimeError, match="No snapshot is open"):
+        web_scraper.save_tools(TOOLS)
@@ -0,0 +1,115 @@
+"""
+- test registered sources run concurrently, so wall time is the slowest source.
+- test batches reach the shared sink while other sources are still running.
+- test a failing source is reported without stopping the others.
+- test duplicate source names are rejected.
+- test a source without scrape() cannot be instantiated.
+"""
+import threading
+import time
+import pytest
+from utils import sources
+from utils.sources import Source, register_source, run_sources
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(sources, "SOURCES", {})
+
+
+def make_source(name, batches, delay):
+    def scrape(self, sink):
+        tools = []
+        for i in range(batches):
+            time.sleep(delay)
+            batch = [{"name": f"{self.name}-{i}", "source": self.name}]
+            sink(batch)
+            tools.extend(batch)
+        return tools
+
+    return register_source(type(f"{name}Source", (Source,), {"name": name, "fetch_strategy": "fake",
+                                                             "scrape": scrape}))
+
+
+def test_sources_run_concurrently_and_stream_into_sink():
+    make_source("slow", batches=3, delay=0.2)
+    make_source("fast", batches=3, delay=0.15)
+    received = []
+    sink_threads = set()
+
+    def sink(tools):
+        sink_threads.add(threading.current_thread().name)
+        received.extend(tool["name"] for tool in tools)
+
+    started = time.perf_counter()
+    results = run_sources(sink)
+    wall = time.perf_counter() - started
+
+    # Slowest source takes 0.6s, running them one after the other would take 1.05s
+    assert wall < 0.9
+    assert len(results["slow"]["tools"]) == 3
+    assert len(results["fast"]["tools"]) == 3
+    # Batches are written as they arrive, not per source once it is done
+    assert received.index("fast-1") < received.index("slow-1")
+    assert sorted(received) == ["fast-0", "fast-1", "fast-2", "slow-0", "slow-1", "slow-2"]
+    assert len(sink_threads) == 2
+
+
+def test_failing_source_does_not_stop_others():
+    make_source("ok", batches=1, delay=0)
+
+    @register_source
+    class Broken(Source):
+        name = "broken"
+
+        def scrape(self, sink):
+            raise RuntimeError("site down")
+
+    received = []
+    results = run_sources(received.extend)
+
+    assert results["broken"] == {"tools": [], "seconds": results["broken"]["seconds"], "error": "site down",
+                                 "complete": False}
+    assert results["ok"]["complete"] is True
+    assert [tool["name"] for tool in received] == ["ok-0"]
+
+
+def test_options_and_selection():
+    seen = {}
+
+    @register_source
+    class Configurable(Source):
+        name = "configurable"
+
+        def scrape(self, sink):
+            seen.update(self.options)
+            return []
+
+    make_source("skipped", batches=1, delay=0)
+    results = run_sources(lambda tools: None, ["configurable"], {"configurable": {"max_pages": 2}})
+
+    assert list(results) == ["configurable"]
+    assert seen == {"max_pages": 2}
+    with pytest.raises(ValueError):
+        run_sources(lambda tools: None, ["missing"])
+
+
+def test_duplicate_source_name_rejected():
+    class First(Source):
+        name = "dup"
+
+    class Second(Source):
+        name = "dup"
+
+    register_source(First)
+    register_source(First)
+    with pytest.raises(ValueError):
+        register_source(Second)
+
+
+def test_source_must_implement_scrape():
+    class Unfinished(Source):
+        name = "unfinished"
+
+    with pytest.raises(TypeError, match="scrape"):
+        Unfinished()
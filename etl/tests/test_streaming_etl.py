@@ -0,0 +1,73 @@
+"""
+- test chunked reads return the same rows as a whole-file read for csv, jsonl and parquet.
+- test the streaming job upserts every chunk with the same rows as the whole-file transform.
+- test per-stage stats are reported.
+- test every job returns early when S3 holds nothing to load.
+"""
+import contextlib
+import pandas as pd
+import pytest
+import idempotent_etl_job
+from utils.utils import read_data, read_data_chunks, clean_data, transform_data
+
+
+@pytest.fixture
+def scraped_df():
+    rows = [{"name": f"Tool {i % 90}", "description": f"Does thing {i}", "url": f"https://tool{i}.ai",
+             "source": "https://www.toolify.ai", "category": "#Video" if i % 7 == 0 else "Writing"}
+            for i in range(100)]
+    rows[3]["description"] = None
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".jsonl", ".parquet"])
+def test_read_data_chunks_matches_whole_file(tmp_path, scraped_df, ext):
+    path = str(tmp_path / f"scraped{ext}")
+    if ext == ".csv":
+        scraped_df.to_csv(path, index=False)
+    elif ext == ".jsonl":
+        scraped_df.to_json(path, orient="records", lines=True)
+    else:
+        scraped_df.to_parquet(path, index=False)
+
+    chunks = list(read_data_chunks(path, chunksize=30))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    streamed = pd.concat(chunks, ignore_index=True)
+    assert streamed["name"].tolist() == scraped_df["name"].tolist()
+    if ext != ".jsonl":
+        pd.testing.assert_frame_equal(streamed, read_data(path))
+
+
+def test_streaming_etl_upserts_chunks(tmp_path, scraped_df, monkeypatch):
+    path = str(tmp_path / "scraped.csv")
+    scraped_df.to_csv(path, index=False)
+    upserted = []
+    conn = object()
+    monkeypatch.setattr(idempotent_etl_job, "pooled_connection", lambda: contextlib.nullcontext(conn))
+    monkeypatch.setattr(idempotent_etl_job, "bulk_upsert_agents", lambda df, conn: upserted.append(df))
+
+    stats = idempotent_etl_job.run_streaming_etl(path, chunksize=25)
+
+    assert len(upserted) == 4
+    # Applying the chunks in order leaves the same final row per name as the whole-file job
+    final = pd.concat(upserted).drop_duplicates(subset=["name"], keep="last").sort_values("name")
+    expected = transform_data(clean_data(read_data(path))).sort_values("name")
+    assert final[["name", "description", "homepage_url", "category"]].values.tolist() == \
+        expected[["name", "description", "homepage_url", "category"]].values.tolist()
+
+    assert stats["chunks"] == 4
+    assert stats["read"]["rows"] == 100
+    assert stats["clean"]["rows"] == 99
+    assert stats["upsert"]["rows"] == sum(len(df) for df in upserted)
+    assert stats["upsert"]["peak_rss_mb"] > 0
+
+
+def test_jobs_return_early_without_input(monkeypatch):
+    monkeypatch.setattr(idempotent_etl_job, "read_latest_from_s3", lambda kind="snapshot", chunksize=None: None)
+    monkeypatch.setattr(idempotent_etl_job, "pooled_connection", lambda: pytest.fail("connected to the database"))
+
+    assert idempotent_etl_job.run_basic_etl().empty
+    assert idempotent_etl_job.run_delta_etl(apply_removals=True).empty
+    stats = idempotent_etl_job.run_basic_etl(streaming=True)
+    assert stats["chunks"] == 0
+    assert stats["upsert"]["rows"] == 0
@@ -0,0 +1,147 @@
+"""
+Asyncio HTTP engine for the request-based scrapers.
+
+One aiohttp session is shared by the whole crawl, so connections are pooled
+and kept alive per host instead of paying a new TCP+TLS handshake for every
+page. Concurrency is capped globally and per host, and each host can be given
+its own request rate. Every request also goes through a HostController, so the
+async crawl gets the same adaptive per-host limit, Retry-After pauses and
+jittered retries as the threaded one.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from utils.host_controller import HostController
+from utils.logger_config import logger
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HostRateLimiter:
+    """
+    Spaces out request starts so a host never sees more than `rate` requests per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncFetcher:
+    """
+    Pooled, keep-alive HTTP client for concurrent crawls.
+
+    Args:
+        max_concurrency (int): Upper bound on requests in flight across all hosts.
+        per_host_limit (int): Upper bound on open connections to any single host.
+        rate_limits (dict): Requests per second keyed by host, e.g. {'www.toolify.ai': 5}.
+        default_rate (float): Requests per second for hosts missing from `rate_limits`.
+            None means no rate limit beyond the concurrency caps.
+        timeout (int): Total timeout in seconds for a single request.
+        controller (HostController): Per-host limits and retry policy, e.g. the one the
+            threaded crawl uses; a new one capped at `per_host_limit` when None.
+    """
+
+    def __init__(self, max_concurrency=20, per_host_limit=10, rate_limits=None,
+                 default_rate=None, timeout=50, headers=None, controller=None):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.rate_limits = rate_limits or {}
+        self.default_rate = default_rate
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.controller = controller or HostController(max_limit=per_host_limit)
+        self._limiters = {}
+        self._semaphore = None
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def _limiter_for(self, host: str) -> HostRateLimiter:
+        if host not in self._limiters:
+            self._limiters[host] = HostRateLimiter(self.rate_limits.get(host, self.default_rate))
+        return self._limiters[host]
+
+    async def fetch(self, url: str, headers=None):
+        """
+        GET a page, retrying throttled and failed requests like HostController.get.
+        Args:
+            url (str): Page URL
+            headers (dict): Extra request headers, e.g. conditional-GET validators
+
+        Returns:
+            tuple | None: (status, response headers, body bytes), or None when the request
+                failed or ended with an error status after its retries.
+        """
+        host = urlsplit(url).netloc
+        limiter = self.controller.host(host)
+        for attempt in range(self.controller.max_retries + 1):
+            await self._limiter_for(host).acquire()
+            await limiter.acquire_async()
+            started = time.monotonic()
+            try:
+                async with self._semaphore, self.session.get(url, headers=headers) as res:
+                    response = res.status, res.headers, await res.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                limiter.release(error=True)
+                response, reason = None, e
+            except BaseException:
+                limiter.release(error=True)
+                raise
+            else:
+                if not self.controller.record_response(limiter, started, response[0], response[1]):
+                    break
+                reason = f"HTTP {response[0]}"
+
+            delay = self.controller.retry_delay(limiter, url, attempt, reason)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        if response is None or response[0] >= 400:
+            logger.error(f"Failed to fetch {url}: {reason if response is None else f'HTTP {response[0]}'}")
+            return None
+        logger.info(f"Successfully fetched {url}, status code: {response[0]}")
+        return response
+
+    async def fetch_text(self, url: str):
+        """
+        GET a page and return its decoded body, or None when the request failed.
+        """
+        response = await self.fetch(url)
+        if response is None:
+            return None
+        return response[2].decode("utf-8", errors="replace")
@@ -0,0 +1,262 @@
+"""
+Near-duplicate agent detection.
+
+Rows are clustered when any of these hold:
+- their homepage URLs are the same after canonicalization (scheme, `www.`,
+  default ports, tracking parameters, fragments and trailing slashes ignored),
+- their names are the same after Unicode case folding and dropping punctuation
+  and spaces ("Chat GPT" == "ChatGPT" == "chatgpt"),
+- the MinHash signatures of their name + description shingles agree on at least
+  `threshold` of their slots.
+
+Candidate pairs for the last rule come from LSH banding, so only rows sharing a
+band bucket are ever compared and the whole stage stays close to linear in the
+number of rows. One row per cluster is kept.
+"""
+
+import os
+import re
+import unicodedata
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import numpy as np
+import pandas as pd
+from utils.logger_config import logger
+
+# Hosts that only redirect to the real homepage; their URLs identify nothing on their own
+REDIRECT_HOSTS = {"link.aitoolsdirectory.com"}
+TRACKING_PARAMS = {"ref", "ref_src", "via", "fbclid", "gclid", "source", "utm"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+NUM_PERM = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.7
+MAX_BUCKET = 200
+_NAME_STRIP_RE = re.compile(r"[\W_]+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def canonical_url(url) -> str:
+    """
+    Canonical key for a homepage URL, or "" when there is none.
+
+    https://www.Jasper.ai:443/?utm_source=x#pricing -> jasper.ai
+    """
+    if not isinstance(url, str) or not url.strip():
+        return ""
+    parts = urlsplit(url.strip() if "//" in url else f"//{url.strip()}")
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return ""
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")]
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    key = f"{host}{path}"
+    if query:
+        key += "?" + urlencode(sorted(query))
+    return key
+
+
+def normalize_name(name) -> str:
+    if not isinstance(name, str):
+        return ""
+    return _NAME_STRIP_RE.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+def shingles(name, description) -> set:
+    """
+    Character 3-grams of the normalized name plus word 2-grams of the description.
+    """
+    grams = set()
+    name = normalize_name(name)
+    if name:
+        padded = f"^{name}$"
+        grams.update("n:" + padded[i:i + 3] for i in range(max(len(padded) - 2, 1)))
+    if isinstance(description, str):
+        words = _WORD_RE.findall(description.casefold())
+        if len(words) == 1:
+            grams.add("d:" + words[0])
+        grams.update(f"d:{words[i]} {words[i + 1]}" for i in range(len(words) - 1))
+    return grams
+
+
+def minhash_signatures(shingle_sets: list, num_perm=NUM_PERM, seed=1, chunk_size=2000) -> np.ndarray:
+    """
+    MinHash signature per shingle set, as a (len(shingle_sets), num_perm) uint64
+    array. Empty sets get a row of all-max values and never match anything.
+    """
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hashing: (a * h + b) mod 2**64 with odd a, keeping the high 32 bits
+    a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64)
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    for start in range(0, len(shingle_sets), chunk_size):
+        chunk = shingle_sets[start:start + chunk_size]
+        lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        if not lengths.any():
+            continue
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for s in chunk for g in s),
+                             dtype=np.uint64, count=int(lengths.sum()))
+        permuted = (hashes[:, None] * a + b) >> np.uint64(32)
+        non_empty = np.flatnonzero(lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+        signatures[start + non_empty] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j) -> bool:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+        self.parent[max(root_i, root_j)] = min(root_i, root_j)
+        return True
+
+
+def _union_on_key(union_find, keys, reason, edges):
+    first_seen = {}
+    for i, key in enumerate(keys):
+        if not key:
+            continue
+        if key in first_seen:
+            if union_find.union(first_seen[key], i):
+                edges.append(reason)
+        else:
+            first_seen[key] = i
+
+
+def lsh_candidate_buckets(signatures: np.ndarray, bands=BANDS):
+    """
+    Yield arrays of row indexes that share a band of their signature.
+    """
+    rows_per_band = signatures.shape[1] // bands
+    empty = np.all(signatures == np.iinfo(np.uint64).max, axis=1)
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows_per_band))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = counts[inverse] > 1
+        shared &= ~empty
+        if not shared.any():
+            continue
+        members = np.flatnonzero(shared)
+        order = np.argsort(inverse[members], kind="stable")
+        members = members[order]
+        splits = np.flatnonzero(np.diff(inverse[members])) + 1
+        yield from np.split(members, splits)
+
+
+def find_clusters(df: pd.DataFrame, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS,
+                  max_bucket=MAX_BUCKET) -> np.ndarray:
+    """
+    Cluster near-duplicate agents.
+    Args:
+        df (pd.DataFrame): Rows with `name`, `description` and `homepage_url` (or `url`)
+        threshold (float): Minimum estimated Jaccard similarity of name + description shingles
+        max_bucket (int): LSH buckets larger than this are skipped; they come from
+            boilerplate descriptions and would only add quadratic work
+
+    Returns:
+        np.ndarray: Cluster id per row (the position of the cluster's first row).
+    """
+    url_column = "homepage_url" if "homepage_url" in df.columns else "url"
+    union_find = _UnionFind(len(df))
+    edges = []
+
+    urls = [canonical_url(url) for url in df[url_column].tolist()]
+    urls = [key if key.split("/", 1)[0] not in REDIRECT_HOSTS else "" for key in urls]
+    _union_on_key(union_find, urls, "url", edges)
+    _union_on_key(union_find, [normalize_name(name) for name in df["name"].tolist()], "name", edges)
+
+    sets = [shingles(name, desc) for name, desc in zip(df["name"].tolist(), df["description"].tolist())]
+    signatures = minhash_signatures(sets, num_perm)
+    skipped = 0
+    min_equal = int(np.ceil(threshold * num_perm))
+    for bucket in lsh_candidate_buckets(signatures, bands):
+        if len(bucket) > max_bucket:
+            skipped += 1
+            continue
+        roots = np.array([union_find.find(i) for i in bucket])
+        if (roots == roots[0]).all():
+            continue
+        # All pairs of the bucket at once; only pairs not already in one cluster are checked
+        block = signatures[bucket]
+        equal = (block[:, None, :] == block[None, :, :]).sum(axis=2)
+        first, second = np.nonzero(np.triu(equal >= min_equal, k=1) & (roots[:, None] != roots[None, :]))
+        for i, j in zip(bucket[first], bucket[second]):
+            if union_find.union(i, j):
+                edges.append("minhash")
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} LSH buckets larger than {max_bucket} rows")
+    logger.info(f"Dedup merges: {pd.Series(edges, dtype=object).value_counts().to_dict()}")
+    return np.array([union_find.find(i) for i in range(len(df))])
+
+
+def dedupe_agents(df: pd.DataFrame, threshold=DEFAULT_THRESHOLD, **kwargs):
+    """
+    Drop near-duplicate agents, keeping one row per cluster: the last row whose
+    homepage is not a redirect link, else the last row.
+
+    Returns:
+        tuple: (deduplicated DataFrame, cluster report DataFrame with one row per
+            member of every cluster that had more than one row)
+    """
+    if df.empty:
+        return df, pd.DataFrame(columns=["cluster", "size", "name", "homepage_url", "source", "kept"])
+
+    url_column = "homepage_url" if "homepage_url" in df.columns else "url"
+    clusters = find_clusters(df, threshold, **kwargs)
+    hosts = df[url_column].map(lambda url: canonical_url(url).split("/", 1)[0])
+    direct = ~hosts.isin(REDIRECT_HOSTS).to_numpy()
+
+    # Sort so the preferred row comes last in each cluster, then keep the last
+    position = np.arange(len(df))
+    order = np.lexsort((position, direct, clusters))
+    keep = np.zeros(len(df), dtype=bool)
+    last_in_cluster = np.append(clusters[order][1:] != clusters[order][:-1], True)
+    keep[order[last_in_cluster]] = True
+
+    sizes = pd.Series(clusters).map(pd.Series(clusters).value_counts()).to_numpy()
+    report = pd.DataFrame({
+        "cluster": clusters,
+        "size": sizes,
+        "name": df["name"].to_numpy(),
+        "homepage_url": df[url_column].to_numpy(),
+        "source": df["source"].to_numpy() if "source" in df.columns else None,
+        "kept": keep,
+    })
+    report = report[report["size"] > 1].sort_values(["cluster", "kept"]).reset_index(drop=True)
+
+    deduped = df[keep]
+    logger.info(f"Dedup: {len(df)} rows -> {len(deduped)} agents, "
+                f"{report['cluster'].nunique()} clusters merged")
+    return deduped, report
+
+
+def write_cluster_report(report: pd.DataFrame, path: str) -> str:
+    """
+    Save the merged clusters for review and print a one-line summary.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    report.to_csv(path, index=False)
+    merged = int((~report["kept"]).sum())
+    print(f"[DEDUP] {report['cluster'].nunique()} clusters, {merged} near-duplicate rows dropped -> {path}")
+    return path
@@ -0,0 +1,135 @@
+"""
+Incremental scraping: per-source tool fingerprints and delta files.
+
+The state file keeps, per source, one compact fingerprint per tool name:
+its URL and a short hash of its description. The category is left out: a
+Toolify tool listed in several subcategories is scraped once per listing, in
+no fixed order, and would otherwise look changed on most runs. Each run compares
+the scraped tools against it and emits only the added, changed and removed
+tools, so the ETL can apply changes proportional to churn instead of
+re-processing the whole catalog.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from utils.logger_config import logger
+
+DEFAULT_STATE_PATH = os.path.join("state", "scrape_fingerprints.json")
+DELTA_FIELDS = ["change", "name", "description", "url", "source", "category"]
+ADDED, CHANGED, REMOVED = "added", "changed", "removed"
+
+
+def content_hash(tool: dict) -> str:
+    return hashlib.sha1((tool.get("description") or "").encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint(tool: dict) -> list:
+    return [tool.get("url") or "", content_hash(tool)]
+
+
+def load_state(path=DEFAULT_STATE_PATH) -> dict:
+    """
+    Returns:
+        dict: {source: {name: [url, content_hash]}}, empty on the first run.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path=DEFAULT_STATE_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compute_delta(tools: list, previous_state: dict, incomplete_sources=()):
+    """
+    Compare a run's tools with the previous fingerprints.
+    Args:
+        tools (list): Tool dicts scraped this run, from any number of sources.
+        previous_state (dict): State returned by load_state().
+        incomplete_sources (set): `source` values of tools whose scrape missed some
+            pages this run. Their added and changed tools are reported, but a missing
+            tool may only be on a page that failed: nothing is reported as removed and
+            its previous fingerprint is kept.
+
+    Returns:
+        tuple: (delta rows, new state). Delta rows are tool dicts with a `change`
+            column. A source that returned no tools this run is assumed to have
+            failed: its previous fingerprints are carried over and nothing from it
+            is reported as removed. A tool scraped under several categories is
+            reported once, with the first category in sort order.
+    """
+    current = {}
+    latest = {}
+    for tool in tools:
+        name = tool.get("name")
+        if not name:
+            continue
+        source = tool.get("source") or ""
+        seen = latest.get((source, name))
+        if seen is not None and (seen.get("category") or "") <= (tool.get("category") or ""):
+            continue
+        current.setdefault(source, {})[name] = fingerprint(tool)
+        latest[(source, name)] = tool
+
+    delta = []
+    for source, fingerprints in current.items():
+        previous = previous_state.get(source, {})
+        for name, print_ in fingerprints.items():
+            if name not in previous:
+                change = ADDED
+            elif previous[name] != print_:
+                change = CHANGED
+            else:
+                continue
+            delta.append({"change": change, **latest[(source, name)]})
+        if source in incomplete_sources:
+            continue
+        for name, (url, _) in previous.items():
+            if name not in fingerprints:
+                delta.append({"change": REMOVED, "name": name, "url": url, "source": source})
+
+    new_state = dict(current)
+    for source in incomplete_sources:
+        if source in current and source in previous_state:
+            logger.warning(f"Scrape of {source} was incomplete, not reporting its missing tools as removed")
+            new_state[source] = {**previous_state[source], **current[source]}
+    for source, fingerprints in previous_state.items():
+        if source not in current:
+            logger.warning(f"No tools scraped from {source} this run, keeping its previous fingerprints")
+            new_state[source] = fingerprints
+
+    return delta, new_state
+
+
+def delta_path_for(snapshot_path: str) -> str:
+    """
+    data/20250703_122835_ai_tools_scraped.parquet -> data/20250703_122835_ai_tools_delta.csv
+    Deltas are small and always written as CSV, whatever the snapshot format.
+    """
+    base = os.path.splitext(snapshot_path)[0]
+    if base.endswith("_scraped"):
+        base = base[:-len("_scraped")]
+    return f"{base}_delta.csv"
+
+
+def write_delta(delta: list, path: str):
+    with open(path, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=DELTA_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(delta)
+
+
+def summarize(delta: list) -> dict:
+    counts = {ADDED: 0, CHANGED: 0, REMOVED: 0}
+    for row in delta:
+        counts[row["change"]] += 1
+    return counts
@@ -0,0 +1,187 @@
+"""
+Direct feed scraping for aitoolsdirectory.com.
+
+The directory is a Softr site: the tiles the Selenium scraper waits for are
+rendered from JSON that the page fetches from a `/v1/datasource/...` endpoint.
+Replaying that request with plain HTTP returns the same records without
+starting Chrome. The records are mapped straight into the tool dict shape
+produced by extract_tool_data(), so save_tools() and the ETL see no difference.
+
+The feed URL is read from the AITOOLSDIRECTORY_FEED_URL environment variable,
+or discovered from the directory page's HTML.
+"""
+
+import os
+import re
+import requests
+from utils.logger_config import logger
+from utils.parsers import AITOOLSDIRECTORY_URL
+
+FEED_URL_ENV = "AITOOLSDIRECTORY_FEED_URL"
+FEED_URL_RE = re.compile(r'''["'](?P<url>(?:https://[\w.-]+)?/v1/datasource/[^"'\s]+)["']''')
+
+# Tool dict field -> record field names to try, in order (case-insensitive)
+FEED_FIELD_MAP = {
+    "name": ["Name", "Tool Name", "Title"],
+    "description": ["Description", "Short Description", "Summary", "Tagline"],
+    "url": ["Website", "URL", "Link", "Homepage", "Affiliate Link"],
+    "category": ["Category", "Categories", "Tags", "Tag"],
+}
+
+
+def _first_text(value):
+    """
+    Airtable/Softr fields can be strings, lists of strings or lists of {'name': ...} options.
+    """
+    if isinstance(value, list):
+        for item in value:
+            text = _first_text(item)
+            if text:
+                return text
+        return None
+    if isinstance(value, dict):
+        return _first_text(value.get("name") or value.get("label") or value.get("url"))
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def map_feed_record(record: dict) -> dict:
+    """
+    Map one feed record to a tool dict.
+    Args:
+        record (dict): Either a flat record or an Airtable-style {'id': ..., 'fields': {...}}
+
+    Returns:
+        dict: name, description, url, source and category, in extract_tool_data() key order.
+            Keys with no value in the record are left out, like extract_tool_data() does.
+    """
+    # `"fields": null` falls back to the record itself, like a flat record
+    fields = record.get("fields") or record
+    lowered = {str(key).strip().lower(): value for key, value in fields.items()}
+
+    tool_data = {}
+    for tool_field in ("name", "description", "url"):
+        for candidate in FEED_FIELD_MAP[tool_field]:
+            text = _first_text(lowered.get(candidate.lower()))
+            if text:
+                tool_data[tool_field] = text
+                break
+
+    tool_data["source"] = AITOOLSDIRECTORY_URL
+
+    for candidate in FEED_FIELD_MAP["category"]:
+        text = _first_text(lowered.get(candidate.lower()))
+        if text:
+            tool_data["category"] = text
+            break
+
+    return tool_data
+
+
+def extract_feed_records(payload) -> list:
+    """
+    Pull the record list out of a feed response body. Anything but a list or an
+    object (e.g. a JSON string or null) holds no records.
+    """
+    if isinstance(payload, list):
+        return payload
+    if not isinstance(payload, dict):
+        return []
+    for key in ("records", "data", "items", "rows"):
+        records = payload.get(key)
+        if isinstance(records, list):
+            return records
+        if isinstance(records, dict) and isinstance(records.get("records"), list):
+            return records["records"]
+    return []
+
+
+def next_feed_offset(payload):
+    if isinstance(payload, dict):
+        return payload.get("offset") or payload.get("next_offset")
+    return None
+
+
+def discover_feed_url(session, page_url=AITOOLSDIRECTORY_URL, timeout=30):
+    """
+    Find the datasource endpoint referenced by the directory page.
+
+    Returns:
+        str | None: Absolute feed URL, or None when the page does not reference one.
+    """
+    try:
+        res = session.get(page_url, timeout=timeout)
+        res.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Could not fetch {page_url} to discover the data feed: {e}")
+        return None
+
+    match = FEED_URL_RE.search(res.text)
+    if not match:
+        logger.info("No datasource endpoint referenced in the directory page")
+        return None
+    url = match.group("url")
+    return url if url.startswith("http") else f"{AITOOLSDIRECTORY_URL}{url}"
+
+
+def fetch_feed_tools(session, feed_url, page_size=100, max_requests=200, timeout=30) -> list:
+    """
+    Replay the feed request page by page and map every record.
+    Args:
+        session (requests.Session): HTTP session
+        feed_url (str): Datasource endpoint
+        page_size (int): Records requested per call
+        max_requests (int): Safety cap on pagination
+
+    Returns:
+        list: Tool dicts. Records without a name are dropped, as in the Selenium path,
+            and so are records that are not objects.
+    """
+    tools = []
+    offset = None
+    for _ in range(max_requests):
+        body = {"page_size": page_size}
+        if offset:
+            body["offset"] = offset
+        res = session.post(feed_url, json=body, timeout=timeout)
+        res.raise_for_status()
+        payload = res.json()
+
+        for record in extract_feed_records(payload):
+            if not isinstance(record, dict):
+                logger.debug(f"Skipping feed record that is not an object: {record!r}")
+                continue
+            tool_data = map_feed_record(record)
+            if tool_data.get("name"):
+                tools.append(tool_data)
+
+        offset = next_feed_offset(payload)
+        if not offset:
+            break
+    return tools
+
+
+def scrape_direct_feed(session=None, feed_url=None) -> list:
+    """
+    Scrape aitoolsdirectory without a browser.
+
+    Returns:
+        list: Tool dicts, or an empty list when the feed is unavailable, so callers
+            can fall back to Selenium.
+    """
+    session = session or requests.Session()
+    feed_url = feed_url or os.environ.get(FEED_URL_ENV) or discover_feed_url(session)
+    if not feed_url:
+        return []
+
+    try:
+        tools = fetch_feed_tools(session, feed_url)
+    except (requests.exceptions.RequestException, ValueError, TypeError, AttributeError) as e:
+        # TypeError/AttributeError: records shaped unlike any we map, fall back rather than crash the run
+        logger.warning(f"Direct feed scrape failed for {feed_url}: {e}")
+        return []
+
+    logger.info(f"Direct feed returned {len(tools)} tools from {feed_url}")
+    return tools
@@ -0,0 +1,90 @@
+"""
+Throughput and memory counters for the streaming ETL.
+
+Each stage (read, clean, transform, upsert) records the rows it handled, the
+time spent in it and the highest resident set size seen right after it ran,
+so a run shows both rows/sec and whether memory stays flat as input grows.
+"""
+
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from utils.logger_config import logger
+
+STAGES = ("read", "clean", "transform", "upsert")
+
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process right now, in MiB.
+    Falls back to the peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """
+    Highest resident set size of this process so far, in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageStats:
+    """
+    Per-stage counters for a streaming ETL run.
+    """
+
+    def __init__(self):
+        self.rows = {stage: 0 for stage in STAGES}
+        self.seconds = {stage: 0.0 for stage in STAGES}
+        self.peak_rss = {stage: 0.0 for stage in STAGES}
+        self.chunks = 0
+        self.wall_seconds = 0.0
+
+    @contextmanager
+    def track(self, stage: str):
+        """
+        Time a block of work for `stage`. Set the yielded dict's "rows" to the
+        number of rows the block produced.
+        """
+        record = {"rows": 0}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.seconds[stage] += time.perf_counter() - started
+            self.rows[stage] += record["rows"]
+            self.peak_rss[stage] = max(self.peak_rss[stage], current_rss_mb())
+
+    def as_dict(self) -> dict:
+        stats = {"chunks": self.chunks, "wall_seconds": round(self.wall_seconds, 3),
+                 "peak_rss_mb": round(peak_rss_mb(), 1)}
+        for stage in STAGES:
+            seconds = self.seconds[stage]
+            stats[stage] = {
+                "rows": self.rows[stage],
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(self.rows[stage] / seconds) if seconds else 0,
+                "peak_rss_mb": round(self.peak_rss[stage], 1),
+            }
+        return stats
+
+    def report(self):
+        stats = self.as_dict()
+        logger.info(f"Streaming ETL stats: {stats}")
+        for stage in STAGES:
+            s = stats[stage]
+            print(f"[STATS] {stage:<9} {s['rows']} rows in {s['seconds']}s "
+                  f"({s['rows_per_sec']} rows/s), peak RSS {s['peak_rss_mb']} MiB")
+        print(f"[STATS] {stats['chunks']} chunks, wall {stats['wall_seconds']}s, "
+              f"process peak RSS {stats['peak_rss_mb']} MiB")
+        return stats
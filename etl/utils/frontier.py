@@ -0,0 +1,139 @@
+"""
+Checkpointed crawl frontier.
+
+A crawl records its job list (category, URL, subcategory) in a small SQLite
+file before it starts, and every finished job is committed together with its
+parsed tools. When a run is killed partway through (e.g. the CI job times out),
+the next run finds the unfinished crawl, replays the tools already scraped and
+only fetches the jobs still pending. Jobs are keyed by category and URL, since
+the same subcategory page can be listed under several categories. A crawl that ran to the end is cleared,
+and one older than `max_age` is discarded instead of resumed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.logger_config import logger
+
+DEFAULT_FRONTIER_PATH = os.path.join("cache", "crawl_frontier.sqlite")
+# Runs are scheduled every 6 hours; an unfinished crawl older than two runs is stale
+DEFAULT_MAX_AGE = 12 * 3600
+PENDING, DONE = "pending", "done"
+PRIMARY_KEY = ["crawl", "category", "url"]
+
+
+class CrawlFrontier:
+    """
+    Args:
+        crawl (str): Name of the crawl, e.g. 'toolify'. Several crawls can share a file.
+        path (str): SQLite file holding the frontier.
+        max_age (float): Seconds after which an unfinished crawl is no longer resumed.
+    """
+
+    def __init__(self, crawl, path=DEFAULT_FRONTIER_PATH, max_age=DEFAULT_MAX_AGE):
+        self.crawl = crawl
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL keeps each commit a cheap append, and a kill never corrupts the file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # table_info rows are (cid, name, type, notnull, default, position in the primary key)
+        columns = sorted(self._conn.execute("PRAGMA table_info(frontier)"), key=lambda column: column[5])
+        primary_key = [column[1] for column in columns if column[5]]
+        if primary_key and primary_key != PRIMARY_KEY:
+            # Written by a version keyed on the URL alone; a checkpoint is cheap to lose
+            logger.warning(f"Dropping crawl frontier in {path} keyed on {primary_key}")
+            self._conn.execute("DROP TABLE frontier")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS frontier (
+                crawl TEXT NOT NULL,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                subcategory TEXT,
+                status TEXT NOT NULL,
+                tools TEXT,
+                started_at REAL NOT NULL,
+                PRIMARY KEY ({", ".join(PRIMARY_KEY)})
+            )
+        """)
+        self._conn.commit()
+
+    def resume(self):
+        """
+        Pick up an unfinished crawl.
+
+        Returns:
+            tuple | None: (pending jobs as (category, url, subcategory) tuples, tool
+                dicts of the finished jobs), or None when there is nothing to resume.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(started_at), SUM(status = ?), COUNT(*) FROM frontier WHERE crawl = ?",
+                (PENDING, self.crawl),
+            ).fetchone()
+            started_at, pending, total = row
+            if not total:
+                return None
+            if not pending or time.time() - started_at > self.max_age:
+                logger.info(f"Discarding finished or stale {self.crawl} frontier ({pending}/{total} pending)")
+                self._clear()
+                return None
+
+            jobs = [tuple(job) for job in self._conn.execute(
+                "SELECT category, url, subcategory FROM frontier WHERE crawl = ? AND status = ? ORDER BY position",
+                (self.crawl, PENDING),
+            )]
+            tools = [tool for (done,) in self._conn.execute(
+                "SELECT tools FROM frontier WHERE crawl = ? AND status = ? ORDER BY position",
+                (self.crawl, DONE),
+            ) for tool in json.loads(done)]
+        logger.info(f"Resuming {self.crawl} crawl: {total - len(jobs)}/{total} jobs done, {len(jobs)} pending")
+        print(f"[RESUME] {self.crawl}: {total - len(jobs)}/{total} jobs already done, "
+              f"{len(tools)} tools replayed, {len(jobs)} jobs left")
+        return jobs, tools
+
+    def start(self, jobs: list):
+        """
+        Record a fresh crawl's (category, url, subcategory) jobs, replacing any previous one.
+        """
+        now = time.time()
+        with self._lock:
+            self._clear()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO frontier VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                [(self.crawl, url, position, category, subcategory, PENDING, now)
+                 for position, (category, url, subcategory) in enumerate(jobs)],
+            )
+            self._conn.commit()
+
+    def complete(self, category, url, tools: list):
+        """
+        Checkpoint the finished (category, url) job with its parsed tools.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE frontier SET status = ?, tools = ? WHERE crawl = ? AND category = ? AND url = ?",
+                (DONE, json.dumps(tools), self.crawl, category, url),
+            )
+            self._conn.commit()
+
+    def finish(self):
+        """
+        Forget the crawl once it has run to the end.
+        """
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._conn.execute("DELETE FROM frontier WHERE crawl = ?", (self.crawl,))
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
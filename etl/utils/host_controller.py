@@ -0,0 +1,298 @@
+"""
+Adaptive per-host concurrency and retries for the requests-based scrapers.
+
+Every host gets its own concurrency limit, adjusted AIMD-style from how the
+host responds: each fast, successful response adds 1/limit (about +1 per round
+of requests), while a 429/5xx, a timeout, a connection error or a response
+slower than `slow_latency` halves it, at most once per `cooldown`. A
+`Retry-After` header pauses the whole host for as long as it asks, and failed
+requests are retried with full-jitter exponential backoff. The crawl therefore
+runs as fast as a site allows and backs off as soon as it pushes back.
+
+The limiters are shared by threads and asyncio tasks: `HostController.get` is
+the blocking client, and AsyncFetcher takes its slots and retries through the
+same controller with `HostLimiter.acquire_async`.
+"""
+
+import asyncio
+import email.utils
+import math
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+import requests
+from utils.logger_config import logger
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+# (connect, read) seconds; a stalled read is retried instead of blocking a worker for 50s
+DEFAULT_TIMEOUT = (10, 30)
+LATENCY_WINDOW = 200
+
+
+def parse_retry_after(value, now=None):
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or an HTTP date),
+    or None when the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # "inf" and "nan" parse as floats but are not a usable wait
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0, rng=random):
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)].
+    """
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(fraction * len(values)))], 3)
+
+
+class HostLimiter:
+    """
+    AIMD concurrency limit, Retry-After pause and counters for one host.
+    A Retry-After longer than `max_pause` seconds pauses the host for `max_pause`.
+    """
+
+    def __init__(self, host, initial_limit=8, min_limit=1, max_limit=32, slow_latency=10.0, cooldown=1.0,
+                 max_pause=30.0):
+        self.host = host
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.slow_latency = slow_latency
+        self.cooldown = cooldown
+        self.max_pause = max_pause
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {"requests": 0, "successes": 0, "retries": 0, "throttled": 0, "errors": 0, "decreases": 0}
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        # (loop, future) of coroutines blocked in acquire_async, woken by release()
+        self._async_waiters = []
+
+    def _try_take(self):
+        """
+        Take a slot if the host is not paused and below its limit; otherwise return
+        how long to wait (None: until a release). Must hold self._cond.
+        """
+        wait = self.paused_until - time.monotonic()
+        if wait <= 0 and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            self.counts["requests"] += 1
+            return 0.0
+        return wait if wait > 0 else None
+
+    def acquire(self):
+        with self._cond:
+            while (wait := self._try_take()) != 0.0:
+                self._cond.wait(timeout=wait)
+
+    async def acquire_async(self):
+        """
+        acquire() for asyncio tasks: waits on the event loop instead of blocking it.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._try_take()
+                if wait == 0.0:
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await asyncio.wait([waiter[1]], timeout=wait)
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    def _notify(self):
+        self._cond.notify_all()
+        for loop, future in self._async_waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        self._async_waiters.clear()
+
+    def release(self, latency=None, throttled=False, error=False, retry_after=None):
+        """
+        Record the outcome of a request and adjust the limit.
+        Args:
+            latency (float): Seconds until the response arrived; None when there was none.
+            throttled (bool): The host answered 429 or 503.
+            error (bool): Other server error, timeout or connection error.
+            retry_after (float): Seconds the host asked us to wait before the next request.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if latency is not None:
+                self.latencies.append(latency)
+            if retry_after is not None and math.isfinite(retry_after) and retry_after > 0:
+                self.paused_until = max(self.paused_until, now + min(retry_after, self.max_pause))
+            self.counts["throttled" if throttled else "errors" if error else "successes"] += 1
+
+            if not (throttled or error) and (latency is None or latency <= self.slow_latency):
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                # One decrease per cooldown, so a burst of failures from one round counts once
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+                    self.counts["decreases"] += 1
+            self._notify()
+
+    def record_retry(self):
+        with self._cond:
+            self.counts["retries"] += 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            latencies = sorted(self.latencies)
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+                **self.counts,
+            }
+
+
+class HostController:
+    """
+    Thread-safe GET with a HostLimiter per host and retries.
+
+    Args:
+        session (requests.Session): Session used for every request.
+        initial_limit (int): Concurrent requests allowed per host before any feedback.
+        min_limit (int) / max_limit (int): Bounds for each host's limit.
+        max_retries (int): Retries after the first attempt for 429/5xx, timeouts
+            and connection errors.
+        backoff_base (float) / backoff_cap (float): Backoff parameters in seconds; the cap
+            also bounds how long a Retry-After header can pause a host.
+        slow_latency (float): Responses slower than this count as congestion.
+        cooldown (float): Minimum seconds between two decreases of a host's limit.
+        timeout: requests timeout used when the caller gives none.
+    """
+
+    def __init__(self, session=None, initial_limit=8, min_limit=1, max_limit=32, max_retries=4,
+                 backoff_base=0.5, backoff_cap=30.0, slow_latency=10.0, cooldown=1.0, timeout=DEFAULT_TIMEOUT):
+        self.session = session or requests.Session()
+        self.limiter_options = {"initial_limit": initial_limit, "min_limit": min_limit, "max_limit": max_limit,
+                                "slow_latency": slow_latency, "cooldown": cooldown, "max_pause": backoff_cap}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, host) -> HostLimiter:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostLimiter(host, **self.limiter_options)
+            return self._hosts[host]
+
+    def get(self, url, **kwargs) -> requests.Response:
+        """
+        GET `url` within its host's limit, retrying throttled and failed requests.
+
+        Returns:
+            requests.Response: The first response that is not retryable, or the last
+                response once retries are exhausted; callers still raise_for_status().
+        Raises:
+            requests.RequestException: When the last attempt failed without a response, or
+                at once for errors other than connection errors and timeouts.
+        """
+        limiter = self.host(urlsplit(url).netloc)
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            started = time.monotonic()
+            try:
+                res = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                limiter.release(error=True)
+                res, reason = None, e
+            except BaseException:
+                # Not retryable (e.g. TooManyRedirects, InvalidURL), but the slot must still be freed
+                limiter.release(error=True)
+                raise
+            else:
+                if not self.record_response(limiter, started, res.status_code, res.headers):
+                    return res
+                reason = f"HTTP {res.status_code}"
+
+            delay = self.retry_delay(limiter, url, attempt, reason)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        if res is not None:
+            return res
+        raise reason
+
+    def record_response(self, limiter, started, status, headers) -> bool:
+        """
+        Release `limiter` with the outcome of a response that arrived, and return
+        whether its status should be retried.
+        """
+        throttled = status in THROTTLE_STATUSES
+        retry_after = parse_retry_after(headers.get("Retry-After")) if throttled else None
+        limiter.release(time.monotonic() - started, throttled=throttled,
+                        error=status in RETRY_STATUSES and not throttled, retry_after=retry_after)
+        return status in RETRY_STATUSES
+
+    def retry_delay(self, limiter, url, attempt, reason):
+        """
+        Backoff before retrying failed attempt number `attempt` (0-based), or None
+        once retries are exhausted.
+        """
+        if attempt == self.max_retries:
+            logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts: {reason}")
+            return None
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        limiter.record_retry()
+        logger.warning(f"Retrying {url} in {delay:.2f}s (attempt {attempt + 2}/{self.max_retries + 1}): {reason}")
+        return delay
+
+    def stats(self) -> dict:
+        """
+        Live per-host stats: limit, in-flight requests, p50/p95 latency and counters.
+        """
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: limiter.stats() for host, limiter in hosts.items()}
+
+    def report(self):
+        stats = self.stats()
+        for host, host_stats in stats.items():
+            logger.info(f"Host stats for {host}: {host_stats}")
+            print(f"[HOSTS] {host}: limit {host_stats['limit']}, {host_stats['in_flight']} in flight, "
+                  f"p50 {host_stats['p50']}s, p95 {host_stats['p95']}s, {host_stats['retries']} retries, "
+                  f"{host_stats['throttled']} throttled, {host_stats['errors']} errors")
+        return stats
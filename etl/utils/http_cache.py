@@ -0,0 +1,219 @@
+"""
+Conditional-GET cache for scraper fetches.
+
+Per URL it keeps the ETag/Last-Modified validators, a hash of the body and the
+parsed result of that body in a small SQLite file. Requests are sent with
+If-None-Match/If-Modified-Since; when the server answers 304, or answers 200
+with an identical body, the cached parse result is returned and the page is
+never parsed again. Entries are evicted least-recently-used once the cache
+grows past `max_bytes`; a 304 that arrives for an entry evicted after its
+validators were sent raises NotModifiedMiss, and the caller fetches the page
+again without validators.
+
+Entries are keyed by URL only, so a stored result must not depend on where the
+URL was found: Toolify subcategory pages are cached parsed without a category,
+which the caller sets on every hit.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.logger_config import logger
+
+DEFAULT_CACHE_PATH = os.path.join("cache", "http_cache.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class NotModifiedMiss(Exception):
+    """
+    A 304 for a URL whose entry is no longer cached. Fetch it again without validators.
+    """
+
+
+class HTTPCache:
+    """
+    Args:
+        path (str): SQLite file holding the cache.
+        max_bytes (int): Size bound for the stored parse results.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "unchanged_body": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "parse_seconds_saved": 0.0,
+        }
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                body_size INTEGER NOT NULL,
+                parsed TEXT NOT NULL,
+                parse_seconds REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(body) -> str:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return hashlib.sha256(body).hexdigest()
+
+    def _entry(self, url):
+        return self._conn.execute(
+            "SELECT etag, last_modified, content_hash, body_size, parsed, parse_seconds FROM entries WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+    def request_headers(self, url) -> dict:
+        """
+        Conditional request headers for `url`; empty when nothing is cached.
+        """
+        with self._lock:
+            entry = self._entry(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry[0]:
+            headers["If-None-Match"] = entry[0]
+        if entry[1]:
+            headers["If-Modified-Since"] = entry[1]
+        return headers
+
+    def lookup(self, url, status, headers, body):
+        """
+        Check a response against the cache.
+
+        Returns:
+            The cached parse result when the page is unchanged (304 or same body hash),
+            else None. On a miss the response validators are kept until store() or discard().
+
+        Raises:
+            NotModifiedMiss: On a 304 whose entry was evicted after the request was sent.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            entry = self._entry(url)
+
+            if status == 304:
+                if not entry:
+                    logger.warning(f"Got 304 for {url} but the entry was evicted meanwhile")
+                    raise NotModifiedMiss(url)
+                self.stats["not_modified"] += 1
+                self.stats["bytes_saved"] += entry[3]
+                return self._hit(url, entry)
+
+            body = body or b""
+            self.stats["bytes_downloaded"] += len(body)
+            digest = self.content_hash(body)
+            etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+            if entry and entry[2] == digest:
+                self.stats["unchanged_body"] += 1
+                self._conn.execute(
+                    "UPDATE entries SET etag = ?, last_modified = ? WHERE url = ?",
+                    (etag, last_modified, url),
+                )
+                return self._hit(url, entry)
+
+            self.stats["misses"] += 1
+            self._pending[url] = (etag, last_modified, digest, len(body))
+            return None
+
+    def _hit(self, url, entry):
+        self.stats["parse_seconds_saved"] += entry[5]
+        self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+        self._conn.commit()
+        return json.loads(entry[4])
+
+    def store(self, url, parsed, parse_seconds=0.0):
+        """
+        Save the parse result for the response last passed to lookup() for `url`.
+        """
+        with self._lock:
+            pending = self._pending.pop(url, None)
+            if pending is None:
+                return
+            etag, last_modified, digest, body_size = pending
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, body_size, json.dumps(parsed), parse_seconds, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def discard(self, url):
+        """
+        Forget the validators lookup() kept for `url`, e.g. when parsing its body failed.
+        """
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def resolve(self, url, status, headers, body, parse):
+        """
+        Return the parse result for a response, parsing only when the page changed.
+        Args:
+            parse (callable): body -> JSON-serialisable parse result
+
+        Raises:
+            NotModifiedMiss: See lookup().
+        """
+        cached = self.lookup(url, status, headers, body)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        try:
+            parsed = parse(body)
+            self.store(url, parsed, time.perf_counter() - started)
+        finally:
+            self.discard(url)
+        return parsed
+
+    def size_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(LENGTH(parsed)), 0) FROM entries").fetchone()[0]
+
+    def _evict(self):
+        total = self.size_bytes()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT url, LENGTH(parsed) FROM entries ORDER BY last_access").fetchall()
+        for url, size in rows:
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def report(self):
+        stats = dict(self.stats)
+        hits = stats["not_modified"] + stats["unchanged_body"]
+        stats["hit_rate"] = round(hits / stats["requests"], 3) if stats["requests"] else 0.0
+        stats["parse_seconds_saved"] = round(stats["parse_seconds_saved"], 3)
+        logger.info(f"HTTP cache stats: {stats}")
+        print(f"[CACHE] {hits}/{stats['requests']} unchanged ({stats['not_modified']} x 304, "
+              f"{stats['unchanged_body']} same hash), {stats['bytes_saved']} bytes not downloaded, "
+              f"{stats['parse_seconds_saved']}s of parsing skipped, {stats['evictions']} evictions")
+        return stats
+
+    def close(self):
+        self._conn.close()
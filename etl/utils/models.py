@@ -1,10 +1,15 @@
+import csv
+import io
 import os
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 import psycopg2
 from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import pandas as pd
 from utils.logger_config import logger
 
@@ -18,6 +23,11 @@ DB_NAME = os.environ.get('DB_NAME')# or os.getenv("DB_NAME")
 DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 Base = declarative_base()
 
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 4))
+DEFAULT_COPY_BATCH_SIZE = 50_000
+_pool = None
+_pool_lock = threading.Lock()
+
 expected_schema = {
     'name': str,
     'description': str,
@@ -52,9 +62,67 @@ def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
     return df[list(schema.keys())]
 
 
-def upsert_agents(df: pd.DataFrame):
+def _conn_info() -> dict:
+    return {
+        'dbname': DB_NAME,
+        'user': DB_USER,
+        'password': DB_PASSWORD,
+        'host': DB_HOST,
+        'port': DB_PORT
+    }
+
+
+def get_connection():
+    """
+    Open a psycopg2 connection to the agents database.
+    """
+    return psycopg2.connect(**_conn_info())
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """
+    Process-wide connection pool, created on first use. psycopg2 keeps `minconn`
+    connections open between borrows and closes any extra ones on return.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = ThreadedConnectionPool(1, DB_POOL_SIZE, **_conn_info())
+    return _pool
+
+
+@contextmanager
+def pooled_connection(conn=None):
+    """
+    Yield `conn` when given, else borrow a connection from the pool and hand it
+    back afterwards. The transaction is rolled back if the block raises.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_pool().getconn()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        if owns_conn:
+            get_pool().putconn(conn)
+
+
+def upsert_agents(df: pd.DataFrame, conn=None, page_size: int = 1000):
+    """
+    Insert or update agents by name.
+    Args:
+        df (pd.DataFrame): Transformed ai_tools rows
+        conn: Open psycopg2 connection to reuse across batches. One is borrowed
+            from the pool when omitted.
+        page_size (int): Rows per INSERT statement
+    """
     df = enforce_schema(df, expected_schema)
-    data = [tuple(row) for row in df.to_numpy()]
+    # Rows are handed to execute_values lazily, one page at a time
+    data = df.itertuples(index=False, name=None)
     columns = list(expected_schema.keys())
 
     insert_query = f"""
@@ -70,20 +138,200 @@ def upsert_agents(df: pd.DataFrame):
             updated_at = NOW();
     """
 
-    conn_info = {
-        'dbname': DB_NAME,
-        'user': DB_USER,
-        'password': DB_PASSWORD,
-        'host': DB_HOST,
-        'port': DB_PORT
-    }
+    # agents.trending is BOOLEAN and the frame holds 0/1, which only converts with an explicit cast
+    template = "(" + ", ".join("%s::boolean" if col == "trending" else "%s" for col in columns) + ")"
 
     try:
-        with psycopg2.connect(**conn_info) as conn:
+        with pooled_connection(conn) as conn:
             with conn.cursor() as cursor:
-                execute_values(cursor, insert_query, data)
+                execute_values(cursor, insert_query, data, template=template, page_size=page_size)
             conn.commit()
         logger.info("Upsert completed successfully.")
     except Exception as e:
         logger.error('Data upsert failed! %s', e, exc_info=True)
         raise RuntimeError(f"Upsert failed: {e}")
+
+
+def copy_rows(cursor, table: str, df: pd.DataFrame, batch_size: int = DEFAULT_COPY_BATCH_SIZE):
+    """
+    Stream a DataFrame into `table` with COPY FROM STDIN, one COPY per `batch_size` rows.
+
+    Strings are always quoted so an empty string stays '' rather than NULL;
+    empty timestamps are turned into NULL with FORCE_NULL.
+    """
+    columns = list(df.columns)
+    timestamp_columns = [col for col in columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    options = "FORMAT csv"
+    if timestamp_columns:
+        options += f", FORCE_NULL ({', '.join(timestamp_columns)})"
+    copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH ({options})"
+
+    for start in range(0, len(df), batch_size):
+        buffer = io.StringIO()
+        df.iloc[start:start + batch_size].to_csv(buffer, header=False, index=False,
+                                                 quoting=csv.QUOTE_NONNUMERIC)
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)
+
+
+# Column definitions shared by the staging tables, in expected_schema order. trending is
+# BOOLEAN like agents.trending: COPY reads the 0/1 values, and integer -> boolean is no assignment cast
+STAGE_COLUMNS_SQL = """
+    seq BIGSERIAL,
+    name TEXT,
+    description TEXT,
+    homepage_url TEXT,
+    category TEXT,
+    source TEXT,
+    trending BOOLEAN,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP
+"""
+
+
+def bulk_upsert_agents(df: pd.DataFrame, conn=None, batch_size: int = DEFAULT_COPY_BATCH_SIZE) -> int:
+    """
+    Bulk-load counterpart of upsert_agents with the same end result: rows are
+    COPY'd into a session temp table, dropped at commit, and merged with one
+    INSERT ... SELECT ... ON CONFLICT, all in one transaction. Each load has its
+    own staging table, so concurrent runs never see each other's rows.
+    Args:
+        df (pd.DataFrame): Transformed ai_tools rows
+        conn: Open psycopg2 connection to reuse. One is borrowed from the pool when omitted.
+        batch_size (int): Rows per COPY
+
+    Returns:
+        int: Rows merged into agents.
+    """
+    df = enforce_schema(df, expected_schema)
+    column_list = ', '.join(expected_schema.keys())
+
+    # DISTINCT ON keeps the last loaded row per name, like drop_duplicates(keep='last')
+    merge_query = f"""
+        INSERT INTO agents ({column_list})
+        SELECT DISTINCT ON (name) {column_list}
+        FROM agents_load
+        ORDER BY name, seq DESC
+        ON CONFLICT (name)
+        DO UPDATE SET
+            description = EXCLUDED.description,
+            homepage_url = EXCLUDED.homepage_url,
+            category = EXCLUDED.category,
+            source = EXCLUDED.source,
+            trending = EXCLUDED.trending,
+            updated_at = NOW();
+    """
+
+    try:
+        with pooled_connection(conn) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"CREATE TEMP TABLE agents_load ({STAGE_COLUMNS_SQL}) ON COMMIT DROP")
+                copy_rows(cursor, "agents_load", df, batch_size)
+                cursor.execute(merge_query)
+                merged = cursor.rowcount
+            conn.commit()
+        logger.info(f"Bulk upsert completed: {merged} agents merged from {len(df)} rows.")
+        return merged
+    except Exception as e:
+        logger.error('Bulk upsert failed! %s', e, exc_info=True)
+        raise RuntimeError(f"Bulk upsert failed: {e}")
+
+
+# Columns that decide whether a scraped agent differs from the stored one
+COMPARED_COLUMNS = ['description', 'homepage_url', 'category', 'source', 'trending']
+
+# Same text as row_hash() in utils.utils builds in pandas: concat_ws skips NULLs, and
+# trending is a boolean column, hashed as '1'/'0' rather than Postgres' 'true'/'false'
+ROW_HASH_SQL = "md5(concat_ws(E'\\x1f', description, homepage_url, category, source, trending::int::text))"
+
+
+def merge_agents_via_staging(df: pd.DataFrame, conn=None, batch_size: int = DEFAULT_COPY_BATCH_SIZE) -> dict:
+    """
+    Stage the scraped agents in a temp table and let Postgres write only the rows
+    that are new or changed. Unchanged agents and agents missing from the scrape
+    are never read back or rewritten.
+    Args:
+        df (pd.DataFrame): Transformed ai_tools rows
+        conn: Open psycopg2 connection to reuse. One is borrowed from the pool when omitted.
+        batch_size (int): Rows per COPY into the staging table
+
+    Returns:
+        dict: Counts of staged, inserted and updated agents.
+    """
+    df = enforce_schema(df, expected_schema)
+    column_list = ', '.join(expected_schema.keys())
+    changed = ' OR '.join(f"agents.{col} IS DISTINCT FROM EXCLUDED.{col}" for col in COMPARED_COLUMNS)
+
+    # DISTINCT ON keeps the last staged row per name, like drop_duplicates(keep='last');
+    # the DO UPDATE ... WHERE skips rows whose compared columns are unchanged.
+    merge_query = f"""
+        INSERT INTO agents ({column_list})
+        SELECT DISTINCT ON (name) {column_list}
+        FROM agents_stage
+        ORDER BY name, seq DESC
+        ON CONFLICT (name)
+        DO UPDATE SET
+            description = EXCLUDED.description,
+            homepage_url = EXCLUDED.homepage_url,
+            category = EXCLUDED.category,
+            source = EXCLUDED.source,
+            trending = EXCLUDED.trending,
+            updated_at = NOW()
+        WHERE {changed}
+        RETURNING (xmax = 0) AS inserted;
+    """
+
+    try:
+        with pooled_connection(conn) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"CREATE TEMP TABLE agents_stage ({STAGE_COLUMNS_SQL}) ON COMMIT DROP")
+                copy_rows(cursor, "agents_stage", df, batch_size)
+                cursor.execute(merge_query)
+                written = [row[0] for row in cursor.fetchall()]
+            conn.commit()
+    except Exception as e:
+        logger.error('Staged merge failed! %s', e, exc_info=True)
+        raise RuntimeError(f"Staged merge failed: {e}")
+
+    counts = {"staged": len(df), "inserted": sum(written), "updated": len(written) - sum(written)}
+    logger.info(f"Staged merge completed: {counts}")
+    return counts
+
+
+def fetch_agent_fingerprints(conn=None) -> pd.DataFrame:
+    """
+    Fetch only the key and a row hash of every agent, for comparing in-process
+    when a staging table can't be used.
+
+    Returns:
+        pd.DataFrame: Columns `name` and `row_hash`.
+    """
+    with pooled_connection(conn) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT name, {ROW_HASH_SQL} FROM agents")
+            rows = cursor.fetchall()
+        conn.commit()
+    return pd.DataFrame(rows, columns=['name', 'row_hash'])
+
+
+def delete_agents(names: list, source: str):
+    """
+    Delete agents that a source no longer lists. Only rows from that source are touched.
+    """
+    if not names:
+        return 0
+
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM agents WHERE name = ANY(%s) AND source = %s",
+                    (list(names), source),
+                )
+                deleted = cursor.rowcount
+            conn.commit()
+        logger.info(f"Deleted {deleted} agents no longer listed on {source}.")
+        return deleted
+    except Exception as e:
+        logger.error('Agent delete failed! %s', e, exc_info=True)
+        raise RuntimeError(f"Delete failed: {e}")
@@ -0,0 +1,196 @@
+"""
+Fetch/parse pipeline for the request-based scrapers.
+
+Fetching is I/O bound and parsing is CPU bound, so the two run in separate
+pools: fetcher threads push raw HTML bytes onto a bounded queue and a
+ProcessPoolExecutor of parsers turns them into tool dicts. The bounded queue
+keeps fetchers from running arbitrarily far ahead of the parsers, and the
+timings collected per stage tell how to size each pool.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.logger_config import logger
+from utils.parsers import parse_toolify_subcategory, resolve_parser_backend, with_category
+
+_DONE = object()
+
+
+def parse_page_timed(html: bytes, backend: str):
+    """
+    Parser worker entrypoint. Runs in a child process. Tools are returned without
+    a category, so the result can be cached for the URL.
+
+    Returns:
+        tuple: (tool dicts, wall-clock seconds spent parsing in the worker)
+    """
+    started = time.perf_counter()
+    tools = parse_toolify_subcategory(html, backend=backend)
+    return tools, time.perf_counter() - started
+
+
+class PipelineStats:
+    """
+    Per-stage counters for a pipeline run. Times are wall-clock seconds summed over
+    the workers of a stage, so a busy machine inflates them.
+    """
+
+    def __init__(self):
+        self.pages_fetched = 0
+        self.fetch_failures = 0
+        self.pages_parsed = 0
+        self.fetch_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.queue_wait_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_fetch(self, seconds, ok=True):
+        with self._lock:
+            self.fetch_seconds += seconds
+            if ok:
+                self.pages_fetched += 1
+            else:
+                self.fetch_failures += 1
+
+    def add_queue_wait(self, seconds):
+        with self._lock:
+            self.queue_wait_seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "pages_fetched": self.pages_fetched,
+            "fetch_failures": self.fetch_failures,
+            "pages_parsed": self.pages_parsed,
+            "fetch_seconds": round(self.fetch_seconds, 3),
+            "parse_seconds": round(self.parse_seconds, 3),
+            "avg_fetch_ms": round(1000 * self.fetch_seconds / max(self.pages_fetched, 1), 1),
+            "avg_parse_ms": round(1000 * self.parse_seconds / max(self.pages_parsed, 1), 1),
+            "fetcher_queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+        }
+
+    def report(self):
+        stats = self.as_dict()
+        logger.info(f"Fetch/parse pipeline stats: {stats}")
+        print(f"[STATS] fetched {stats['pages_fetched']} pages ({stats['fetch_failures']} failed), "
+              f"avg fetch {stats['avg_fetch_ms']}ms, avg parse {stats['avg_parse_ms']}ms, "
+              f"fetchers blocked on full queue {stats['fetcher_queue_wait_seconds']}s, "
+              f"wall {stats['wall_seconds']}s")
+
+
+class ParsePipeline:
+    """
+    Runs fetchers on threads and parsers on processes, connected by a bounded queue.
+
+    Args:
+        fetch_page (callable): url -> raw HTML bytes, None when the fetch failed, or an
+            already parsed list of tool dicts when the page is unchanged in `cache`.
+            The category of each job is set on its tools after parsing.
+            Must be thread-safe.
+        fetch_workers (int): Number of fetcher threads.
+        parse_workers (int): Number of parser processes. Defaults to the CPU count.
+        queue_size (int): Max fetched pages waiting to be parsed.
+        backend (str): HTML parser backend, see utils.parsers.resolve_parser_backend().
+        cache (HTTPCache): When given, every parse result is stored in it.
+    """
+
+    def __init__(self, fetch_page, fetch_workers=16, parse_workers=None, queue_size=64, backend=None,
+                 cache=None):
+        self.fetch_page = fetch_page
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 2
+        self.queue_size = queue_size
+        self.backend = resolve_parser_backend(backend)
+        self.cache = cache
+        self.stats = PipelineStats()
+
+    def _fetch_into(self, pages: queue.Queue, url, category_name, label):
+        started = time.perf_counter()
+        html = self.fetch_page(url)
+        self.stats.add_fetch(time.perf_counter() - started, ok=html is not None)
+        if html is None:
+            return
+        put_started = time.perf_counter()
+        pages.put((label, category_name, url, html))
+        self.stats.add_queue_wait(time.perf_counter() - put_started)
+
+    def run(self, jobs, on_result=None) -> list:
+        """
+        Fetch and parse every job.
+        Args:
+            jobs (list): (category_name, url, label) tuples, as built by build_toolify_jobs().
+            on_result (callable): Called as on_result(label, tools) in the calling thread
+                as soon as each page is parsed.
+
+        Returns:
+            list: All tool dicts, in completion order.
+        """
+        started = time.perf_counter()
+        pages = queue.Queue(maxsize=self.queue_size)
+        all_tools = []
+        logger.info(f"Starting fetch/parse pipeline: {self.fetch_workers} fetchers, "
+                    f"{self.parse_workers} '{self.backend}' parsers, queue size {self.queue_size}")
+
+        # Spawned, not forked: the pipeline runs on a source thread next to other sources'
+        # threads, and a forked child can inherit a lock one of them held (e.g. logging's)
+        parsers = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                      mp_context=multiprocessing.get_context("spawn"))
+
+        def produce():
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetchers:
+                for category_name, url, label in jobs:
+                    fetchers.submit(self._fetch_into, pages, url, category_name, label)
+            pages.put(_DONE)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        def deliver(label, tools):
+            all_tools.extend(tools)
+            if on_result:
+                on_result(label, tools)
+
+        def collect(done_futures):
+            for future in done_futures:
+                label, category_name, url = in_flight.pop(future)
+                try:
+                    tools, parse_seconds = future.result()
+                except Exception as e:
+                    logger.error(f"Parser failed on {label}: {e}")
+                    if self.cache:
+                        self.cache.discard(url)
+                    continue
+                self.stats.parse_seconds += parse_seconds
+                self.stats.pages_parsed += 1
+                if self.cache:
+                    self.cache.store(url, tools, parse_seconds)
+                deliver(label, with_category(tools, category_name))
+
+        in_flight = {}
+        with parsers:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    break
+                label, category_name, url, html = item
+                if isinstance(html, list):
+                    # Unchanged page, parse result came from the cache
+                    deliver(label, with_category(html, category_name))
+                    continue
+                in_flight[parsers.submit(parse_page_timed, html, self.backend)] = (label, category_name, url)
+                collect([future for future in in_flight if future.done()])
+                # Keep at most ~2 pages per parser submitted so the bounded queue applies back-pressure
+                if len(in_flight) >= 2 * self.parse_workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(in_flight))
+
+        producer.join()
+        self.stats.wall_seconds = time.perf_counter() - started
+        self.stats.report()
+        return all_tools
@@ -0,0 +1,370 @@
+"""
+HTML parsers for the scraped sources.
+
+Kept free of any network or browser code so the same functions can be
+used by the threaded, async and offline (fixture) scraping paths, and can
+be shipped to parser worker processes.
+"""
+
+import re
+import bs4
+from utils.logger_config import logger
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+AITOOLSDIRECTORY_URL = "https://aitoolsdirectory.com"
+TOOLIFY_BASE_URL = "https://www.toolify.ai"
+TOOLIFY_CATEGORY_URL = f"{TOOLIFY_BASE_URL}/category"
+
+PARSER_BACKENDS = ("selectolax", "lxml", "html.parser")
+
+TOOL_CARD_CLASS = 'tool-card bg-white p-6 flex gap-4 items-center'
+CARD_TEXT_CLASS = 'card-text-content flex flex-col justify-between flex-1 h-full w-0'
+
+
+# Selector lists for aitoolsdirectory tiles, tried in priority order by extract_tool_data.
+TITLE_SELECTORS = [
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    # Missing comma in the original list: these two selectors were always one compound selector
+    '[class*="sv-tile__title sv-text-reset sv-is-link"]' ".title",  # Standard headings
+    ".name",
+    ".tool-name",
+    ".product-name",  # Common title classes
+    '[class*="title"]',
+    '[class*="name"]',  # Partial class matches
+    "a[href]",  # Links often contain tool names
+    "strong",
+    "b",  # Bold text
+    ".sv-tile-title",
+    ".sv-title",  # SV-specific classes
+]
+
+DESC_SELECTORS = [
+    ".description",
+    ".desc",
+    ".summary",
+    ".overview",
+    '[class*="desc"]',
+    '[class*="summary"]',
+    "p",  # Paragraphs
+    "sv-tile__description sv-text-reset",
+    ".sv-tile-description",
+    ".sv-description",  # SV-specific
+]
+
+TAG_SELECTORS = [
+    ".tag",
+    ".category",
+    ".badge",
+    ".label",
+    ".chip",
+    '[class*="tag"]',
+    '[class*="category"]',
+    '[class*="badge"]',
+    ".sv-tag",
+    ".sv-category",  # SV-specific
+]
+
+
+def is_valid_title(text: str) -> bool:
+    # Skip very short or very long titles
+    return 3 <= len(text) <= 100
+
+
+def is_valid_description(text: str, name: str) -> bool:
+    # Look for meaningful descriptions (not too short, not the same as title)
+    return len(text) > 20 and text != name
+
+
+def is_valid_tag(text: str) -> bool:
+    return 2 <= len(text) <= 30  # Reasonable tag length
+
+
+def resolve_tile_href(href: str):
+    """
+    Classify a tile link.
+
+    Returns:
+        tuple: (url or None, final) where `final` means no later link can override it.
+    """
+    if href and not href.startswith("#"):
+        if href.startswith("http"):
+            return href, True
+        elif href.startswith("/") and "aitoolsdirectory.com" not in href:
+            # Skip internal directory links, look for external ones
+            return None, False
+        elif href.startswith("/"):
+            return f"{AITOOLSDIRECTORY_URL}{href}", False
+    return None, False
+
+
+def extract_tool_data(element):
+    """
+    Extract one aitoolsdirectory tile by trying every selector with select_one.
+
+    This is the reference implementation; the scraper uses the compiled
+    utils.selector_plan.ToolTilePlan, which gives the same output.
+    """
+    tool_data = {}
+
+    for selector in TITLE_SELECTORS:
+        title_elem = element.select_one(selector)
+        if title_elem and title_elem.get_text(strip=True):
+            title_text = title_elem.get_text(strip=True)
+            if is_valid_title(title_text):
+                tool_data["name"] = title_text
+                break
+
+    for selector in DESC_SELECTORS:
+        desc_elem = element.select_one(selector)
+        if desc_elem and desc_elem.get_text(strip=True):
+            desc_text = desc_elem.get_text(strip=True)
+            if is_valid_description(desc_text, tool_data.get("name", "")):
+                tool_data["description"] = desc_text
+                break
+
+    if not tool_data.get("description"):
+        all_text_elements = element.find_all(string=True)
+        text_contents = [text.strip() for text in all_text_elements if text.strip()]
+        if text_contents:
+            # Find the longest text that's not the title
+            longest_text = max(text_contents, key=len, default="")
+            if is_valid_description(longest_text, tool_data.get("name", "")):
+                tool_data["description"] = longest_text
+
+    link_elements = element.select("a[href]")
+    for link_elem in link_elements:
+        url, final = resolve_tile_href(link_elem.get("href", ""))
+        if url:
+            tool_data["url"] = url
+        if final:
+            break
+
+    tool_data["source"] = AITOOLSDIRECTORY_URL
+
+    tags = []
+    for selector in TAG_SELECTORS:
+        tag_elements = element.select(selector)
+        for tag_elem in tag_elements:
+            tag_text = tag_elem.get_text(strip=True)
+            if tag_text and is_valid_tag(tag_text):
+                tags.append(tag_text)
+
+    if tags:
+        tool_data['category'] = tags[0]
+
+    return tool_data
+
+
+def resolve_parser_backend(backend=None) -> str:
+    """
+    Pick an available HTML parser backend.
+    Args:
+        backend (str): 'selectolax', 'lxml' or 'html.parser'. None picks the fastest installed one.
+
+    Returns:
+        str: The requested backend if it is installed, else the pure-Python 'html.parser'.
+    """
+    available = {
+        "selectolax": HAS_SELECTOLAX,
+        "lxml": HAS_LXML,
+        "html.parser": True,
+    }
+    if backend is None:
+        return next(name for name in PARSER_BACKENDS if available[name])
+    if backend not in available:
+        raise ValueError(f"Unknown parser backend '{backend}'. Use one of {PARSER_BACKENDS}")
+    if not available[backend]:
+        logger.warning(f"Parser backend '{backend}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return backend
+
+
+def parse_toolify_categories(html) -> list:
+    """
+    Parse the Toolify category index page.
+    Args:
+        html (str | bytes): Raw HTML of https://www.toolify.ai/category
+
+    Returns:
+        list: [{'category': str, 'sub_categories': [{'name': str, 'link': str}]}]
+    """
+    data = []
+    try:
+        logger.info("Starting HTML parsing")
+        soup = bs4.BeautifulSoup(html, 'html.parser')
+        table = soup.find_all('div', id=re.compile(r'^group-'))
+        logger.info(f"Found {len(table)} category groups")
+
+        if not table:
+            logger.warning("No category groups found with id starting with 'group-'")
+
+        for i, row in enumerate(table):
+            logger.debug(f"Processing category group {i + 1}/{len(table)}")
+            try:
+                title = row.find('h3').get_text(strip=True)
+                logger.debug(f"Found category: {title}")
+                sub_categories = []
+
+                sub_links = row.find_all('a', class_='go-category-link')
+                logger.debug(f"Found {len(sub_links)} subcategories for '{title}'")
+
+                for j, sub_row in enumerate(sub_links):
+                    href = sub_row.get('href', '')
+                    full_link = f"{TOOLIFY_BASE_URL}{href}" if href.startswith('/') else href
+
+                    name_span = sub_row.find('span',
+                                             class_='text-base text-gray-1000 flex-1 w-0 truncate font-medium')
+                    if name_span:
+                        name = name_span.get_text(strip=True)
+                        sub_categories.append({
+                            'name': name,
+                            'link': full_link,
+                        })
+                        logger.debug(f"Added subcategory: {name}")
+                    else:
+                        logger.info(f"Skipping subcategory {j + 1} in '{title}' - no expected span found")
+
+                data.append({
+                    'category': title,
+                    'sub_categories': sub_categories
+                })
+                logger.info(f"Successfully processed category '{title}' with {len(sub_categories)} subcategories")
+            except AttributeError as e:
+                logger.warning(f"Could not extract category block {i + 1} properly: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected parsing error: {e}")
+
+    return data
+
+
+def parse_toolify_subcategory(html, category_name="", backend="html.parser") -> list:
+    """
+    Parse one Toolify subcategory page into tool dicts.
+    Args:
+        html (str | bytes): Raw HTML of a subcategory page
+        category_name (str): Parent category stored on every tool
+        backend (str): HTML parser backend, see resolve_parser_backend()
+
+    Returns:
+        list: Tool dicts with name, description, url, source and category.
+    """
+    if backend == "selectolax":
+        return _parse_toolify_subcategory_selectolax(html, category_name)
+
+    sub_data = []
+    try:
+        logger.info("Starting HTML parsing for subcategory")
+        soup = bs4.BeautifulSoup(html, backend)
+        table = soup.find_all('div', class_='mb-12')
+        logger.info(f"Found {len(table)} tool items in subcategory")
+
+        for i, row in enumerate(table):
+            logger.debug(f"Processing tool item {i + 1}/{len(table)}")
+            try:
+                row_class = row.find('div', class_=TOOL_CARD_CLASS)
+                agent = row_class.find('div', class_=CARD_TEXT_CLASS)
+
+                name = agent.find('a').find('h2').get_text(strip=True)
+                description = agent.find('p').get_text(strip=True)
+                full_url = ''
+                visit_btn_parent = row.find('div', class_='visit-btn')
+                if visit_btn_parent:
+                    visit_link_tag = visit_btn_parent.find_parent('a')  # Get the <a> that wraps the button
+                    if visit_link_tag and visit_link_tag.has_attr('href'):
+                        visit_url = visit_link_tag['href']
+                        full_url = visit_url
+
+                tool_data = {
+                    "name": name,
+                    "description": description,
+                    "url": full_url,
+                    "source": TOOLIFY_BASE_URL,
+                    "category": category_name
+                }
+
+                sub_data.append(tool_data)
+                logger.debug(f"Successfully extracted tool: {name}")
+
+            except AttributeError as e:
+                logger.warning(f"Could not parse tool item {i + 1}: {e}")
+
+    except Exception as e:
+        logger.error(f"Unexpected parsing error in subcategory scraping: {e}")
+
+    return sub_data
+
+
+def _parse_toolify_subcategory_selectolax(html, category_name="") -> list:
+    """
+    selectolax (lexbor) implementation of parse_toolify_subcategory with identical output.
+    """
+    sub_data = []
+    try:
+        tree = LexborHTMLParser(html)
+        table = tree.css('div.mb-12')
+        logger.info(f"Found {len(table)} tool items in subcategory")
+
+        for i, row in enumerate(table):
+            try:
+                agent = row.css_first(f'div[class="{TOOL_CARD_CLASS}"] div[class="{CARD_TEXT_CLASS}"]')
+                name = agent.css_first('a').css_first('h2').text(strip=True)
+                description = agent.css_first('p').text(strip=True)
+                full_url = ''
+                visit_btn = row.css_first('div.visit-btn')
+                if visit_btn is not None:
+                    parent = visit_btn.parent
+                    while parent is not None and parent.tag != 'a':
+                        parent = parent.parent
+                    if parent is not None and 'href' in parent.attributes:
+                        full_url = parent.attributes['href'] or ''
+
+                sub_data.append({
+                    "name": name,
+                    "description": description,
+                    "url": full_url,
+                    "source": TOOLIFY_BASE_URL,
+                    "category": category_name
+                })
+            except AttributeError as e:
+                logger.warning(f"Could not parse tool item {i + 1}: {e}")
+
+    except Exception as e:
+        logger.error(f"Unexpected parsing error in subcategory scraping: {e}")
+
+    return sub_data
+
+
+def with_category(tools: list, category_name: str) -> list:
+    """
+    Copies of parsed tool dicts with `category` set. Subcategory pages are parsed
+    and cached without a category, since the same page can be listed under several.
+    """
+    return [{**tool, "category": category_name} for tool in tools]
+
+
+def build_toolify_jobs(categories: list) -> list:
+    """
+    Flatten parsed categories into (category, subcategory_url, subcategory_name) jobs.
+    """
+    subcat_jobs = []
+    for category in categories:
+        category_name = category['category']
+        for subcat in category.get('sub_categories', []):
+            subcat_jobs.append((category_name, subcat['link'], subcat['name']))
+    return subcat_jobs
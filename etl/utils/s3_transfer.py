@@ -0,0 +1,225 @@
+"""
+S3 transfer layer for scrape snapshots and deltas.
+
+Uploads and downloads run as parallel multipart transfers. Every upload also
+records the object in a small manifest (`manifest/latest.json`) per kind
+(snapshot or delta), so finding the newest file is one GET instead of a bucket
+listing. Buckets written before the manifest existed fall back to a full,
+paginated listing. Objects can be read straight into DataFrames, so the ETL
+needs no local copy: CSV is streamed from the response body, and Parquet is
+read whole through an in-memory buffer or, in chunks, row group by row group
+through ranged GETs. The manifest may also point at an archived snapshot
+(utils.snapshot_archive), which is then rebuilt from its chunks.
+"""
+
+import io
+import json
+import os
+from datetime import datetime, timezone
+import pandas as pd
+import pyarrow.parquet as pq
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from utils.logger_config import logger
+from utils.snapshot_archive import ARCHIVE_PREFIX, S3Store, iter_snapshot_tables, load_snapshot
+
+MB = 1024 * 1024
+# 8 parts of 16 MB in flight: large snapshots saturate the runner's link, small files stay single-part
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=16 * MB, multipart_chunksize=16 * MB,
+                                 max_concurrency=8, use_threads=True)
+# Smallest ranged GET when reading Parquet in chunks; larger column chunks are fetched in one request
+RANGE_SIZE = 8 * MB
+MANIFEST_KEY = "manifest/latest.json"
+ARCHIVED_SNAPSHOTS = f"{ARCHIVE_PREFIX}snapshots/"
+SNAPSHOT, DELTA = "snapshot", "delta"
+
+
+def object_kind(key: str):
+    """
+    'delta' for per-run change files, 'snapshot' for full scrapes, None for anything else.
+    """
+    if key.endswith("_delta.csv"):
+        return DELTA
+    if key.startswith(ARCHIVED_SNAPSHOTS):
+        return SNAPSHOT if key.endswith(".json") else None
+    if key.startswith(ARCHIVE_PREFIX):
+        return None
+    if key.endswith((".parquet", ".csv")) and not key.startswith("manifest/"):
+        return SNAPSHOT
+    return None
+
+
+def read_manifest(client, bucket) -> dict:
+    """
+    Returns:
+        dict: {kind: {"key", "size", "etag", "uploaded_at"}}, empty when there is no manifest yet.
+    """
+    try:
+        body = client.get_object(Bucket=bucket, Key=MANIFEST_KEY)["Body"].read()
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return {}
+        raise
+    return json.loads(body)
+
+
+def upload(client, bucket, file_path, key=None, config=TRANSFER_CONFIG) -> dict:
+    """
+    Upload a file as a parallel multipart transfer and point the manifest at it.
+    Args:
+        client: boto3 S3 client
+        bucket (str): Bucket name
+        file_path (str): Local file
+        key (str): Object key, the file name by default
+
+    Returns:
+        dict: The manifest entry of the uploaded object.
+    """
+    key = key or os.path.basename(file_path)
+    client.upload_file(file_path, bucket, key, Config=config)
+    head = client.head_object(Bucket=bucket, Key=key)
+    entry = {
+        "key": key,
+        "size": head["ContentLength"],
+        "etag": head["ETag"].strip('"'),
+        "uploaded_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    kind = object_kind(key)
+    if kind:
+        update_manifest(client, bucket, kind, entry)
+    logger.info(f"Uploaded {file_path} to s3://{bucket}/{key} ({entry['size']} bytes)")
+    return entry
+
+
+def update_manifest(client, bucket, kind, entry: dict):
+    """
+    Point the manifest's `kind` entry at a new object.
+    """
+    manifest = read_manifest(client, bucket)
+    manifest[kind] = entry
+    client.put_object(Bucket=bucket, Key=MANIFEST_KEY, Body=json.dumps(manifest, indent=2).encode("utf-8"),
+                      ContentType="application/json")
+
+
+def _archived_name(key):
+    return key[len(ARCHIVED_SNAPSHOTS):-len(".json")]
+
+
+def _latest_by_listing(client, bucket, kind):
+    latest = None
+    for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket):
+        for obj in page.get("Contents", []):
+            if object_kind(obj["Key"]) == kind and (latest is None or obj["LastModified"] > latest["LastModified"]):
+                latest = obj
+    return latest["Key"] if latest else None
+
+
+def latest_key(client, bucket, kind=SNAPSHOT):
+    """
+    Key of the newest object of `kind`, from the manifest, or from a paginated
+    listing of the whole bucket when the manifest has no entry for it.
+    """
+    entry = read_manifest(client, bucket).get(kind)
+    if entry:
+        return entry["key"]
+    logger.warning(f"No {kind} in the S3 manifest, listing s3://{bucket} instead")
+    return _latest_by_listing(client, bucket, kind)
+
+
+def download(client, bucket, key, download_dir, config=TRANSFER_CONFIG) -> str:
+    """
+    Download an object with parallel ranged GETs. Returns the local path.
+    """
+    os.makedirs(download_dir, exist_ok=True)
+    local_path = os.path.join(download_dir, os.path.basename(key))
+    client.download_file(bucket, key, local_path, Config=config)
+    return local_path
+
+
+def _parquet_buffer(client, bucket, key, config):
+    # Parquet needs random access to its footer, so it is fetched into memory rather than streamed
+    buffer = io.BytesIO()
+    client.download_fileobj(bucket, key, buffer, Config=config)
+    buffer.seek(0)
+    return buffer
+
+
+class S3ObjectReader(io.RawIOBase):
+    """
+    Read-only, seekable file over an S3 object. Every read is a ranged GET, so
+    pyarrow can read a Parquet footer and then one row group at a time without
+    the whole object in memory.
+    """
+
+    def __init__(self, client, bucket, key):
+        super().__init__()
+        self.client, self.bucket, self.key = client, bucket, key
+        self.size = client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.position = offset
+        return self.position
+
+    def readinto(self, buffer):
+        end = min(self.position + len(buffer), self.size)
+        if end <= self.position:
+            return 0
+        body = self.client.get_object(Bucket=self.bucket, Key=self.key,
+                                      Range=f"bytes={self.position}-{end - 1}")["Body"].read()
+        buffer[:len(body)] = body
+        self.position += len(body)
+        return len(body)
+
+
+def read_object(client, bucket, key, config=TRANSFER_CONFIG) -> pd.DataFrame:
+    """
+    Read a CSV or Parquet object, or an archived snapshot manifest, into a
+    DataFrame without writing it to disk.
+    """
+    if key.startswith(ARCHIVED_SNAPSHOTS):
+        return load_snapshot(S3Store(client, bucket), _archived_name(key)).to_pandas()
+    if key.endswith(".parquet"):
+        return pq.read_table(_parquet_buffer(client, bucket, key, config)).to_pandas()
+    if key.endswith(".csv"):
+        return pd.read_csv(client.get_object(Bucket=bucket, Key=key)["Body"])
+    raise ValueError(f"Unsupported file format for {key}! Use csv or parquet")
+
+
+def iter_object_chunks(client, bucket, key, chunksize, config=TRANSFER_CONFIG):
+    """
+    Yield an object as DataFrames of at most `chunksize` rows. CSV rows are parsed
+    while the body is still downloading, Parquet is fetched one row group at a time
+    and archived snapshots are rebuilt chunk by chunk, so memory stays bounded by a
+    row group or chunk rather than the object.
+    """
+    if key.startswith(ARCHIVED_SNAPSHOTS):
+        for table in iter_snapshot_tables(S3Store(client, bucket), _archived_name(key)):
+            for batch in table.to_batches(max_chunksize=chunksize):
+                yield batch.to_pandas()
+        return
+    if key.endswith(".parquet"):
+        # Without pre_buffer, pyarrow reads one column chunk at a time instead of coalescing the whole file
+        with io.BufferedReader(S3ObjectReader(client, bucket, key), buffer_size=RANGE_SIZE) as source:
+            for batch in pq.ParquetFile(source, pre_buffer=False).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+    elif key.endswith(".csv"):
+        yield from pd.read_csv(client.get_object(Bucket=bucket, Key=key)["Body"], chunksize=chunksize)
+    else:
+        raise ValueError(f"Unsupported file format for {key}! Use csv or parquet")
@@ -0,0 +1,262 @@
+"""
+Compiled extraction plan for aitoolsdirectory tiles.
+
+extract_tool_data() in utils.parsers runs ~40 select_one/select calls per
+tile, each walking the tile's subtree again. ToolTilePlan parses the selector
+lists once into cheap matchers, walks every tile a single time to resolve the
+title, description, URL and tags together, and remembers which selectors won
+on the first tiles of a page so later tiles only evaluate the selectors that
+can still win. The output is identical to extract_tool_data().
+"""
+
+import re
+import soupsieve
+from bs4 import NavigableString, Tag
+from utils.parsers import (
+    AITOOLSDIRECTORY_URL,
+    DESC_SELECTORS,
+    TAG_SELECTORS,
+    TITLE_SELECTORS,
+    is_valid_description,
+    is_valid_tag,
+    is_valid_title,
+    resolve_tile_href,
+)
+
+_COMPOUND_RE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$')
+_PART_RE = re.compile(r'\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)(?:\*="(?P<value>[^"]*)")?\]')
+
+
+class Matcher:
+    """
+    A single compound CSS selector (tag, .class, [attr] and [attr*="value"] parts).
+    Anything more complex (e.g. descendant combinators) is delegated to soupsieve.
+    """
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self.tag = None
+        self.classes = ()
+        self.attrs = ()
+        self._compiled = None
+
+        match = _COMPOUND_RE.match(selector)
+        if not match:
+            self._compiled = soupsieve.compile(selector)
+            return
+        parts = list(_PART_RE.finditer(match.group('rest')))
+        if ''.join(part.group(0) for part in parts) != match.group('rest'):
+            self._compiled = soupsieve.compile(selector)
+            return
+        self.tag = match.group('tag')
+        classes, attrs = [], []
+        for part in parts:
+            if part.group('cls'):
+                classes.append(part.group('cls'))
+            else:
+                attrs.append((part.group('attr'), part.group('value')))
+        self.classes = tuple(classes)
+        self.attrs = tuple(attrs)
+
+    def matches(self, node: Tag, classes: list, class_attr: str) -> bool:
+        if self._compiled is not None:
+            return self._compiled.match(node)
+        if self.tag and node.name != self.tag:
+            return False
+        for cls in self.classes:
+            if cls not in classes:
+                return False
+        for attr, value in self.attrs:
+            if attr not in node.attrs:
+                return False
+            if value is None:
+                continue
+            actual = class_attr if attr == 'class' else node.attrs[attr]
+            if isinstance(actual, list):
+                actual = ' '.join(actual)
+            if not value or value not in actual:
+                return False
+        return True
+
+
+class PlanState:
+    """
+    Selector statistics for one page. After `learn_tiles` tiles the highest winning
+    selector index per field becomes the cut-off for the rest of the page.
+    """
+
+    def __init__(self, learn_tiles=5):
+        self.learn_tiles = learn_tiles
+        self.tiles_seen = 0
+        self.winners = {'title': set(), 'desc': set(), 'tag': set()}
+
+    def record(self, field: str, index):
+        if self.tiles_seen < self.learn_tiles:
+            self.winners[field].add(index)
+
+    def cutoff(self, field: str, total: int) -> int:
+        """
+        Number of leading selectors to evaluate in the single walk for `field`.
+        """
+        if self.tiles_seen < self.learn_tiles:
+            return total
+        seen = self.winners[field]
+        if not seen or None in seen:
+            return total
+        return min(max(seen) + 1, total)
+
+
+class ToolTilePlan:
+    """
+    Compiled version of extract_tool_data().
+
+    Usage:
+        plan = ToolTilePlan()
+        state = plan.new_page()
+        tools = [plan.extract(tile, state) for tile in tiles]
+    """
+
+    def __init__(self, title_selectors=None, desc_selectors=None, tag_selectors=None, learn_tiles=5):
+        self.title_matchers = [Matcher(s) for s in (title_selectors or TITLE_SELECTORS)]
+        self.desc_matchers = [Matcher(s) for s in (desc_selectors or DESC_SELECTORS)]
+        self.tag_matchers = [Matcher(s) for s in (tag_selectors or TAG_SELECTORS)]
+        self.link_matcher = Matcher("a[href]")
+        self.learn_tiles = learn_tiles
+
+    def new_page(self) -> PlanState:
+        return PlanState(self.learn_tiles)
+
+    def extract(self, element: Tag, state: PlanState = None) -> dict:
+        """
+        Extract one tile. Passing the same `state` for every tile of a page enables
+        the learned selector cut-offs.
+        """
+        state = state or self.new_page()
+        title_cut = state.cutoff('title', len(self.title_matchers))
+        desc_cut = state.cutoff('desc', len(self.desc_matchers))
+        tag_cut = state.cutoff('tag', len(self.tag_matchers))
+
+        # First matching element per title/description selector: select_one semantics
+        title_first = [None] * title_cut
+        title_pending = list(range(title_cut))
+        desc_first = [None] * desc_cut
+        desc_pending = list(range(desc_cut))
+        # First tag element with valid text per tag selector; lower index wins
+        tag_best = None
+        tag_pending = list(range(tag_cut))
+        strings = []
+        url = None
+        url_final = False
+
+        for node in element.descendants:
+            if not isinstance(node, Tag):
+                if isinstance(node, NavigableString):
+                    strings.append(node)
+                continue
+
+            classes = node.get('class') or []
+            class_attr = ' '.join(classes) if isinstance(classes, list) else classes
+
+            if title_pending:
+                still_pending = []
+                for i in title_pending:
+                    if not self.title_matchers[i].matches(node, classes, class_attr):
+                        still_pending.append(i)
+                        continue
+                    title_first[i] = node
+                    if is_valid_title(node.get_text(strip=True)):
+                        # Lower-priority selectors can no longer win
+                        break
+                title_pending = still_pending
+
+            if desc_pending:
+                for i in list(desc_pending):
+                    if self.desc_matchers[i].matches(node, classes, class_attr):
+                        desc_first[i] = node
+                        desc_pending.remove(i)
+
+            if tag_pending:
+                for i in tag_pending:
+                    if self.tag_matchers[i].matches(node, classes, class_attr):
+                        text = node.get_text(strip=True)
+                        if text and is_valid_tag(text):
+                            tag_best = (i, text)
+                            tag_pending = [j for j in tag_pending if j < i]
+                            break
+
+            if not url_final and self.link_matcher.matches(node, classes, class_attr):
+                link_url, url_final = resolve_tile_href(node.get("href", ""))
+                if link_url:
+                    url = link_url
+
+        tool_data = {}
+
+        name = None
+        for i, node in enumerate(title_first):
+            if node is not None and is_valid_title(node.get_text(strip=True)):
+                name = node.get_text(strip=True)
+                state.record('title', i)
+                break
+        else:
+            name = self._select_rest(element, self.title_matchers, title_cut, is_valid_title)
+            state.record('title', None)
+        if name:
+            tool_data["name"] = name
+
+        description = None
+        for i, node in enumerate(desc_first):
+            text = node.get_text(strip=True) if node is not None else ''
+            if text and is_valid_description(text, tool_data.get("name", "")):
+                description = text
+                state.record('desc', i)
+                break
+        else:
+            description = self._select_rest(element, self.desc_matchers, desc_cut,
+                                            lambda text: is_valid_description(text, tool_data.get("name", "")))
+            state.record('desc', None)
+        if not description:
+            text_contents = [text.strip() for text in strings if text.strip()]
+            if text_contents:
+                # Find the longest text that's not the title
+                longest_text = max(text_contents, key=len, default="")
+                if is_valid_description(longest_text, tool_data.get("name", "")):
+                    description = longest_text
+        if description:
+            tool_data["description"] = description
+
+        if url:
+            tool_data["url"] = url
+
+        tool_data["source"] = AITOOLSDIRECTORY_URL
+
+        if tag_best is not None:
+            state.record('tag', tag_best[0])
+            tool_data['category'] = tag_best[1]
+        else:
+            state.record('tag', None)
+            category = self._select_rest_all(element, self.tag_matchers, tag_cut)
+            if category:
+                tool_data['category'] = category
+
+        state.tiles_seen += 1
+        return tool_data
+
+    @staticmethod
+    def _select_rest(element, matchers, start, is_valid):
+        # Slow path for tiles that do not look like the ones the cut-off was learned on
+        for matcher in matchers[start:]:
+            node = element.select_one(matcher.selector)
+            if node is not None:
+                text = node.get_text(strip=True)
+                if text and is_valid(text):
+                    return text
+        return None
+
+    @staticmethod
+    def _select_rest_all(element, matchers, start):
+        for matcher in matchers[start:]:
+            for node in element.select(matcher.selector):
+                text = node.get_text(strip=True)
+                if text and is_valid_tag(text):
+                    return text
+        return None
@@ -0,0 +1,203 @@
+"""
+Content-addressed archive of scrape snapshots.
+
+A snapshot is split into one chunk per (source, category). Each chunk is
+serialized canonically (tools sorted, fixed fields, one JSON object per line),
+named by the SHA-256 of those bytes and stored zstd-compressed under
+`chunks/`. A snapshot itself is only a small manifest listing its chunk hashes.
+Consecutive runs share almost all of their chunks, and a chunk that already
+exists is never uploaded or stored again, so the archive grows with the
+volume of change rather than the number of runs. load_snapshot() rebuilds any
+archived snapshot.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from datetime import datetime
+import pyarrow as pa
+from botocore.exceptions import ClientError
+from utils.logger_config import logger
+from utils.snapshots import CSV_FIELDS, read_snapshot_table, tools_to_table
+
+ARCHIVE_PREFIX = "archive/"
+CHUNKS_DIR = "chunks"
+SNAPSHOTS_DIR = "snapshots"
+
+
+class LocalStore:
+    """
+    Archive store in a local directory.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def put(self, key, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def list(self, prefix) -> list:
+        directory = self._path(prefix)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f"{prefix}/{name}" for name in os.listdir(directory))
+
+
+class S3Store:
+    """
+    Archive store under a prefix of an S3 bucket.
+    """
+
+    def __init__(self, client, bucket, prefix=ARCHIVE_PREFIX):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def exists(self, key) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, key, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+    def get(self, key) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+
+    def list(self, prefix) -> list:
+        keys = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket,
+                                                                          Prefix=f"{self.prefix}{prefix}/"):
+            keys.extend(obj["Key"][len(self.prefix):] for obj in page.get("Contents", []))
+        return sorted(keys)
+
+
+def compress(data: bytes) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, "zstd") as stream:
+        stream.write(data)
+    return sink.getvalue().to_pybytes()
+
+
+def decompress(data: bytes) -> bytes:
+    return pa.CompressedInputStream(pa.BufferReader(data), "zstd").read()
+
+
+def read_snapshot_tools(path: str) -> list:
+    """
+    Tool dicts (CSV_FIELDS) from a Parquet or CSV snapshot file.
+    """
+    if path.endswith(".parquet"):
+        table = read_snapshot_table(path)
+        table = table.rename_columns(["url" if name == "homepage_url" else name for name in table.column_names])
+        return table.select(CSV_FIELDS).to_pylist()
+    # Empty CSV cells become None, as Parquet nulls do, so both formats archive to the same chunks
+    with open(path, newline="", encoding="utf-8") as f:
+        return [{field: row.get(field) or None for field in CSV_FIELDS} for row in csv.DictReader(f)]
+
+
+def chunk_tools(tools: list) -> dict:
+    """
+    Group tools per (source, category) and serialize every group canonically.
+
+    Returns:
+        dict: {(source, category): canonical JSON-lines bytes}
+    """
+    groups = {}
+    for tool in tools:
+        if not tool.get("name"):
+            continue
+        row = {field: tool.get(field) for field in CSV_FIELDS}
+        groups.setdefault((row["source"] or "", row["category"] or ""), []).append(row)
+    return {
+        key: "".join(json.dumps(row, sort_keys=True, ensure_ascii=False) + "\n"
+                     for row in sorted(rows, key=lambda row: json.dumps(row, sort_keys=True))).encode("utf-8")
+        for key, rows in sorted(groups.items())
+    }
+
+
+def _chunk_key(digest):
+    return f"{CHUNKS_DIR}/{digest[:2]}/{digest}.jsonl.zst"
+
+
+def _snapshot_key(name):
+    return f"{SNAPSHOTS_DIR}/{name}.json"
+
+
+def archive_snapshot(tools: list, store, name: str, created_at: datetime = None) -> dict:
+    """
+    Store a snapshot's chunks (only those not already archived) and its manifest.
+    Args:
+        tools (list): Tool dicts of the snapshot
+        store: LocalStore or S3Store
+        name (str): Snapshot name, e.g. '20250703_122835_ai_tools_scraped'
+
+    Returns:
+        dict: The snapshot manifest, with `new_chunks` / `new_bytes` for this call.
+    """
+    created_at = created_at or datetime.now()
+    chunks = []
+    new_chunks = new_bytes = 0
+    for (source, category), data in chunk_tools(tools).items():
+        digest = hashlib.sha256(data).hexdigest()
+        if not store.exists(_chunk_key(digest)):
+            compressed = compress(data)
+            store.put(_chunk_key(digest), compressed)
+            new_chunks += 1
+            new_bytes += len(compressed)
+        chunks.append({"source": source, "category": category, "hash": digest, "rows": data.count(b"\n")})
+
+    manifest = {"name": name, "created_at": created_at.isoformat(), "chunks": chunks}
+    store.put(_snapshot_key(name), json.dumps(manifest, indent=2).encode("utf-8"))
+    logger.info(f"Archived snapshot {name}: {len(chunks)} chunks, {new_chunks} new ({new_bytes} bytes)")
+    print(f"[ARCHIVE] {name}: {len(chunks)} chunks, {new_chunks} new, {new_bytes} bytes stored")
+    return {**manifest, "new_chunks": new_chunks, "new_bytes": new_bytes}
+
+
+def list_snapshots(store) -> list:
+    """
+    Names of the archived snapshots, oldest first.
+    """
+    return [os.path.basename(key)[:-len(".json")] for key in store.list(SNAPSHOTS_DIR) if key.endswith(".json")]
+
+
+def iter_snapshot_tables(store, name: str):
+    """
+    Yield an archived snapshot one chunk at a time, as tables with SNAPSHOT_SCHEMA.
+    """
+    manifest = json.loads(store.get(_snapshot_key(name)))
+    # Snapshot rows are stamped with the scrape date, as SnapshotWriter does
+    scraped_at = datetime.fromisoformat(manifest["created_at"]).replace(hour=0, minute=0, second=0, microsecond=0)
+    for chunk in manifest["chunks"]:
+        data = decompress(store.get(_chunk_key(chunk["hash"])))
+        yield tools_to_table([json.loads(line) for line in data.splitlines()], scraped_at)
+
+
+def load_snapshot(store, name: str) -> pa.Table:
+    """
+    Rebuild an archived snapshot as one table with SNAPSHOT_SCHEMA.
+    """
+    tables = list(iter_snapshot_tables(store, name))
+    if not tables:
+        return tools_to_table([])
+    return pa.concat_tables(tables)
@@ -0,0 +1,259 @@
+"""
+Columnar scrape snapshots.
+
+Scraped tools are written as zstd-compressed Parquet with a fixed schema that
+mirrors `expected_schema` in utils.models, so the ETL reads typed columns
+straight from the file instead of re-parsing text and guessing dtypes. Rows
+are buffered and flushed as row groups, so appending per scraped page stays
+cheap. CSV is still available as an export format.
+
+A snapshot is written to `<path>.part` and only renamed to `<path>` once it is
+complete, so a crashed run never leaves a torn snapshot under the final name.
+A CSV `.part` holds every row up to the last sync and can be read as is. A
+Parquet `.part` cannot: the footer that indexes its row groups is only written
+by close(), so the tools of a crashed Parquet run have to be scraped again.
+BatchedSink moves the disk writes off the scraping threads.
+"""
+
+import csv
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.logger_config import logger
+
+SNAPSHOT_FORMATS = ("parquet", "csv")
+SNAPSHOT_SCHEMA = pa.schema([
+    pa.field("name", pa.string(), nullable=False),
+    pa.field("description", pa.string()),
+    pa.field("homepage_url", pa.string()),
+    pa.field("category", pa.string()),
+    pa.field("source", pa.string()),
+    pa.field("trending", pa.int64()),
+    pa.field("created_at", pa.timestamp("ns")),
+    pa.field("updated_at", pa.timestamp("ns")),
+])
+CSV_FIELDS = ["name", "description", "url", "source", "category"]
+ROW_GROUP_SIZE = 10_000
+MAX_PENDING_BATCHES = 256
+FSYNC_INTERVAL = 5.0
+
+
+def _text(value):
+    # Missing fields may arrive as None or NaN; anything else is stored as text
+    if value is None or value != value:
+        return None
+    return str(value)
+
+
+def tools_to_table(tools: list, scraped_at: datetime = None) -> pa.Table:
+    """
+    Convert scraped tool dicts (name, description, url, source, category) to a
+    table with SNAPSHOT_SCHEMA. Tools without a name are dropped.
+    """
+    scraped_at = scraped_at or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    tools = [tool for tool in tools if _text(tool.get("name"))]
+    columns = {
+        "name": [_text(tool["name"]) for tool in tools],
+        "description": [_text(tool.get("description")) for tool in tools],
+        "homepage_url": [_text(tool.get("url")) for tool in tools],
+        "category": [_text(tool.get("category")) for tool in tools],
+        "source": [_text(tool.get("source")) for tool in tools],
+        "trending": [0] * len(tools),
+        "created_at": [scraped_at] * len(tools),
+        "updated_at": [scraped_at] * len(tools),
+    }
+    return pa.table(columns, schema=SNAPSHOT_SCHEMA)
+
+
+class SnapshotWriter:
+    """
+    Append scraped tools to one snapshot file.
+
+    Rows go to `<path>.part`, which close() syncs and atomically renames to `path`.
+
+    Args:
+        path (str): Output file, .parquet or .csv
+        snapshot_format (str): 'parquet' (default) or 'csv'
+        row_group_size (int): Rows buffered before a Parquet row group is written
+    """
+
+    def __init__(self, path, snapshot_format="parquet", row_group_size=ROW_GROUP_SIZE):
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unsupported snapshot format {snapshot_format}! Use parquet or csv")
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.snapshot_format = snapshot_format
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer = []
+        self._file = None
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self.snapshot_format == "csv":
+            self._file = open(self.part_path, mode="w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self._writer.writeheader()
+        else:
+            self._file = open(self.part_path, mode="wb")
+            self._writer = pq.ParquetWriter(self._file, SNAPSHOT_SCHEMA, compression="zstd")
+
+    def write(self, tools: list):
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self.snapshot_format == "csv":
+                self._writer.writerows(tool for tool in tools if _text(tool.get("name")))
+            else:
+                self._buffer.extend(tools)
+                if len(self._buffer) >= self.row_group_size:
+                    self._flush()
+            self.rows_written += len(tools)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        self._writer.write_table(tools_to_table(self._buffer))
+        self._buffer = []
+
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def sync(self):
+        """
+        Force everything written so far to disk. Buffered Parquet rows stay in
+        memory until their row group is full, and a Parquet `.part` has no
+        footer before close(), so only a CSV `.part` is readable after a crash.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._fsync()
+
+    def close(self):
+        """
+        Flush buffered rows, finish the file and move it to its final path.
+        Returns the path, or None when nothing was written.
+        """
+        with self._lock:
+            if self._file is None:
+                return None
+            self._flush()
+            if self.snapshot_format == "parquet":
+                self._writer.close()
+            self._fsync()
+            self._file.close()
+            self._file = self._writer = None
+            os.replace(self.part_path, self.path)
+            _fsync_dir(self.path)
+        logger.info(f"Snapshot {self.path} closed with {self.rows_written} tools.")
+        return self.path
+
+
+def _fsync_dir(path):
+    # Persist the rename itself, not just the file contents
+    fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BatchedSink:
+    """
+    Hand scraped batches to a SnapshotWriter on a background thread.
+
+    put() only enqueues, so scraping threads never wait on disk unless
+    `max_pending` batches are already queued. The writer thread merges every
+    queued batch into one write and syncs the file every `fsync_interval` seconds.
+    """
+
+    _STOP = object()
+
+    def __init__(self, writer: SnapshotWriter, max_pending=MAX_PENDING_BATCHES, fsync_interval=FSYNC_INTERVAL):
+        self.writer = writer
+        self.fsync_interval = fsync_interval
+        self.stats = {"batches": 0, "writes": 0, "syncs": 0}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name="snapshot-sink", daemon=True)
+        self._thread.start()
+
+    def put(self, tools: list):
+        if self._error is not None:
+            raise RuntimeError(f"Snapshot sink stopped: {self._error}") from self._error
+        if tools:
+            self._queue.put(list(tools))
+            self.stats["batches"] += 1
+
+    def _drain(self, item):
+        rows = []
+        while item is not self._STOP:
+            rows.extend(item)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows, False
+        return rows, True
+
+    def _run(self):
+        last_sync = time.monotonic()
+        stop = False
+        try:
+            while not stop:
+                try:
+                    rows, stop = self._drain(self._queue.get(timeout=self.fsync_interval))
+                except queue.Empty:
+                    rows = []
+                if rows:
+                    self.writer.write(rows)
+                    self.stats["writes"] += 1
+                if not stop and time.monotonic() - last_sync >= self.fsync_interval:
+                    self.writer.sync()
+                    self.stats["syncs"] += 1
+                    last_sync = time.monotonic()
+        except Exception as e:
+            logger.error(f"Snapshot sink failed writing {self.writer.part_path}: {e}")
+            self._error = e
+            # Keep consuming so producers blocked on a full queue are released
+            while not stop:
+                stop = self._queue.get() is self._STOP
+
+    def close(self):
+        """
+        Write everything still queued and close the snapshot.
+        Returns the snapshot path, or None when nothing was written.
+        """
+        self.closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError(f"Snapshot sink failed: {self._error}") from self._error
+        logger.info(f"Snapshot sink stats: {self.stats}")
+        return self.writer.close()
+
+
+def read_snapshot_table(path: str) -> pa.Table:
+    """
+    Memory-map a Parquet snapshot and return it with its stored schema.
+    """
+    return pq.read_table(path, memory_map=True)
+
+
+def export_csv(snapshot_path: str, csv_path: str = None) -> str:
+    """
+    Export a Parquet snapshot in the scraper's historical CSV layout
+    (name, description, url, source, category).
+    """
+    csv_path = csv_path or os.path.splitext(snapshot_path)[0] + ".csv"
+    df = read_snapshot_table(snapshot_path).to_pandas()
+    df = df.rename(columns={"homepage_url": "url"})[CSV_FIELDS]
+    df.to_csv(csv_path, index=False)
+    logger.info(f"Exported {len(df)} tools from {snapshot_path} to {csv_path}")
+    return csv_path
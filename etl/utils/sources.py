@@ -0,0 +1,137 @@
+"""
+Scrape source plugins and the orchestrator that runs them side by side.
+
+Each source declares how it fetches (`fetch_strategy`, reported in the run
+log) and how much concurrency it may use against its own site
+(`max_concurrency`). Sources register themselves with
+@register_source; run_sources() starts every registered source at once on its
+own thread and hands each batch of tools to one shared sink as soon as the
+source produces it. A run takes as long as its slowest source, and adding a
+source is one new class that touches none of the others.
+"""
+
+import abc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger_config import logger
+
+SOURCES = {}
+
+
+class Source(abc.ABC):
+    """
+    Base class for a scrape source.
+
+    Subclasses set the class attributes and implement scrape(). Keyword
+    arguments given to the constructor (from run_sources' `options`) are kept
+    in `self.options`.
+    """
+
+    name = None
+    fetch_strategy = None
+    max_concurrency = 1
+
+    def __init__(self, **options):
+        self.options = options
+
+    @abc.abstractmethod
+    def scrape(self, sink) -> list:
+        """
+        Scrape the source, calling `sink(tools)` with every batch as it arrives.
+
+        Returns:
+            list: All tool dicts scraped by this source.
+        """
+
+    def complete(self) -> bool:
+        """
+        Whether the last scrape() fetched every page it planned to. Sources that can
+        lose pages to failed requests override this, so that the tools on those
+        pages are not taken as removed from the site.
+        """
+        return True
+
+    def close(self):
+        pass
+
+
+def register_source(cls):
+    """
+    Class decorator adding a Source subclass to the registry under its `name`.
+    """
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no source name")
+    if SOURCES.get(cls.name, cls) is not cls:
+        raise ValueError(f"Source '{cls.name}' is already registered by {SOURCES[cls.name].__name__}")
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def _serialized(sink):
+    lock = threading.Lock()
+
+    def write(tools):
+        if not tools:
+            return
+        with lock:
+            sink(tools)
+    return write
+
+
+def _run_source(cls, options, sink):
+    started = time.perf_counter()
+    source = cls(**options)
+    try:
+        tools = source.scrape(sink) or []
+        error = None
+        complete = source.complete()
+    except Exception as e:
+        logger.error(f"Source {cls.name} failed: {e}")
+        tools, error, complete = [], str(e), False
+    finally:
+        source.close()
+    seconds = time.perf_counter() - started
+    logger.info(f"Source {cls.name} ({cls.fetch_strategy}, concurrency {cls.max_concurrency}): "
+                f"{len(tools)} tools in {seconds:.1f}s{'' if complete else ', incomplete'}")
+    return {"tools": tools, "seconds": seconds, "error": error, "complete": complete}
+
+
+def run_sources(sink, sources=None, options=None) -> dict:
+    """
+    Run scrape sources concurrently, one thread per source.
+    Args:
+        sink (callable): Called with each non-empty batch of tool dicts as a source
+            produces it. Calls are serialized, so the sink need not be thread-safe.
+        sources (list): Names of the sources to run; every registered source by default.
+        options (dict): {source name: keyword arguments for that source's constructor}
+
+    Returns:
+        dict: {source name: {"tools": list, "seconds": float, "error": str | None,
+            "complete": bool}}. A failing source is reported with no tools and does
+            not stop the others; `complete` is False when it failed or missed pages.
+    """
+    names = list(SOURCES) if sources is None else list(sources)
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown sources {unknown}, registered: {sorted(SOURCES)}")
+    options = options or {}
+    if not names:
+        return {}
+
+    write = _serialized(sink)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="source") as executor:
+        futures = {name: executor.submit(_run_source, SOURCES[name], options.get(name, {}), write)
+                   for name in names}
+        results = {name: future.result() for name, future in futures.items()}
+
+    wall = time.perf_counter() - started
+    for name, result in results.items():
+        status = f"failed: {result['error']}" if result["error"] else f"{len(result['tools'])} tools"
+        if not result["error"] and not result["complete"]:
+            status += " (incomplete)"
+        print(f"[SOURCES] {name}: {status} in {result['seconds']:.1f}s")
+    print(f"[SOURCES] {len(names)} sources in {wall:.1f}s "
+          f"(sequential would be {sum(r['seconds'] for r in results.values()):.1f}s)")
+    return results
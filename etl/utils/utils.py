@@ -5,12 +5,16 @@ Utils function for ETL Job.
 """
 
 from pathlib import Path
+import hashlib
 import os
 from datetime import datetime, timezone
 import boto3
 from dotenv import load_dotenv
 from utils.logger_config import logger
-from utils.models import connect_db
+from utils.models import connect_db, COMPARED_COLUMNS
+from utils.snapshots import read_snapshot_table
+from utils import s3_transfer
+from utils.snapshot_archive import ARCHIVE_PREFIX, S3Store, archive_snapshot, read_snapshot_tools
 import pandas as pd
 
 load_dotenv()
@@ -22,6 +26,7 @@ s3 = boto3.client("s3", region_name=AWS_REGION,
                   aws_secret_access_key=AWS_SECRET_KEY)
 print(AWS_REGION)
 bucket_name = 'scraped-ai-agent'
+DEFAULT_CHUNKSIZE = 50_000
 
 def read_data(source_path: str) -> pd.DataFrame:
     """
@@ -43,7 +48,8 @@ def read_data(source_path: str) -> pd.DataFrame:
         elif ext == ".json":
             return pd.read_json(source_path)
         elif ext == ".parquet":
-            return pd.read_parquet(source_path)
+            # Typed columns straight from the snapshot schema, no dtype inference
+            return read_snapshot_table(source_path).to_pandas()
         logger.info("Data successfully read!")
     except Exception as e:
         logger.error(
@@ -53,6 +59,38 @@ def read_data(source_path: str) -> pd.DataFrame:
         )
 
 
+def read_data_chunks(source_path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Stream a data file as DataFrames of at most `chunksize` rows.
+    Args:
+        source_path (str): Data Path
+        chunksize (int): Rows per chunk
+
+    Raises:
+        ValueError: Raises error for unsupported data type.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+    ext = Path(source_path).suffix
+    if ext == ".csv":
+        yield from pd.read_csv(source_path, chunksize=chunksize)
+    elif ext == ".jsonl":
+        yield from pd.read_json(source_path, lines=True, chunksize=chunksize)
+    elif ext == ".json":
+        # A JSON array can't be parsed incrementally, only sliced once loaded
+        logger.warning(f"{source_path} is a JSON array and is loaded whole; use .jsonl to stream it")
+        df = pd.read_json(source_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].reset_index(drop=True)
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source_path, memory_map=True).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file format {ext}! Use csv, jsonl, json or parquet")
+
+
 def remove_hashtags(tags):
     """
     Method to clean category column from "https://aitoolsdirectory.com/"
@@ -80,6 +118,36 @@ def remove_hashtags(tags):
         logger.error("Error Raised at tags column cleaning:  %s", e, exc_info=True)
 
 
+def _clean_category_strings(tags: pd.Series) -> pd.Series:
+    clean = tags.mask(tags.str.contains("#", regex=False), "")
+    short = clean.str.len() < 4
+    return clean.str.upper().where(short, clean.str.lower().str.capitalize())
+
+
+def clean_categories(tags: pd.Series) -> pd.Series:
+    """
+    Vectorized remove_hashtags() for a whole column, with the same output.
+    Categories repeat a lot, so each distinct value is cleaned once and mapped back.
+    Args:
+        tags (Series): Column to be cleaned
+
+    Returns:
+        Series: Cleaned column.
+    """
+    if pd.api.types.infer_dtype(tags, skipna=True) != "string":
+        # Lists (and any non-string values) are joined up front; plain strings stay vectorized
+        is_str = tags.map(type).eq(str)
+        joined = tags[~is_str].map(
+            lambda v: ",".join(tag for tag in v if "#" not in tag) if isinstance(v, list) else "")
+        clean = _clean_category_strings(tags.where(is_str, ""))
+        clean[~is_str] = _clean_category_strings(joined)
+        return clean
+
+    codes, uniques = pd.factorize(tags.fillna(""))
+    cleaned = _clean_category_strings(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(cleaned.take(codes), index=tags.index, name=tags.name)
+
+
 def clean_data(df):
     """
     Custom function to clean scraped/manual ai_tools dataset
@@ -95,7 +163,7 @@ def clean_data(df):
         new_df = new_df.reset_index(drop=True)
 
         if "category" in df.columns:
-            new_df["category"] = new_df["category"].apply(remove_hashtags)
+            new_df["category"] = clean_categories(new_df["category"])
         else:
             pass
 
@@ -159,13 +227,7 @@ def transform_data(df: pd.DataFrame, source=None) -> pd.DataFrame:
 
         df["updated_at"] = datetime.now().strftime("%Y-%m-%d")
 
-        if "trending" not in df.columns:
-            df["trending"] = 0
-            # df["trending"] = df["trending"].notna().astype(bool)
-        else:
-            df["trending"] = df["trending"].apply(
-                lambda x: 0 if x == "Low" else 1
-            )
+        # The scraped trending level is not loaded; the backend computes trending itself
         df["trending"] = 0
 
         trans_df = df.rename(columns={"url": "homepage_url", "tags": "category"})
@@ -173,6 +235,8 @@ def transform_data(df: pd.DataFrame, source=None) -> pd.DataFrame:
         trans_df["created_at"] = pd.to_datetime(
             trans_df["created_at"], format="%Y-%m-%d", errors="coerce"
         )
+        # agents.created_at is NOT NULL, so a date that failed to parse becomes today
+        trans_df["created_at"] = trans_df["created_at"].fillna(pd.Timestamp.now().normalize())
         trans_df["updated_at"] = pd.to_datetime(
             trans_df["updated_at"], format="%Y-%m-%d", errors="coerce"
         )
@@ -202,6 +266,39 @@ def merging_dfs(new_df, existing_df) -> pd.DataFrame:
         logger.error("Error merging DFs: %s", e, exc_info=True)
 
 
+def row_hash(df: pd.DataFrame) -> pd.Series:
+    """
+    md5 of the compared columns per row, matching ROW_HASH_SQL in utils.models
+    (values joined with \\x1f, NULLs skipped, trending as 1/0 whether it is a bool or an int).
+    """
+    columns = [df[col].tolist() for col in COMPARED_COLUMNS]
+    hashes = []
+    for values in zip(*columns):
+        text = "\x1f".join(str(int(v)) if col == "trending" else str(v)
+                           for col, v in zip(COMPARED_COLUMNS, values) if not pd.isna(v))
+        hashes.append(hashlib.md5(text.encode("utf-8")).hexdigest())
+    return pd.Series(hashes, index=df.index)
+
+
+def changed_agents(new_df: pd.DataFrame, fingerprints: pd.DataFrame) -> pd.DataFrame:
+    """
+    In-process counterpart of merge_agents_via_staging: keep only the scraped rows
+    that are new or differ from the stored row hash.
+    Args:
+        new_df (pd.DataFrame): Transformed scraped ai_tools
+        fingerprints (pd.DataFrame): `name` and `row_hash` from fetch_agent_fingerprints()
+
+    Returns:
+        pd.DataFrame: Rows to upsert.
+    """
+    stored = dict(zip(fingerprints["name"], fingerprints["row_hash"]))
+    hashes = row_hash(new_df)
+    keep = [stored.get(name) != digest for name, digest in zip(new_df["name"], hashes)]
+    changed_df = new_df[keep]
+    logger.info(f"{len(changed_df)} of {len(new_df)} scraped agents are new or changed.")
+    return changed_df
+
+
 def fetch_db_records():
     session, engine = connect_db()
 
@@ -212,41 +309,85 @@ def fetch_db_records():
     return db_df
 
 
-def dump_raw_data_to_s3(file_path: str):
+def dump_raw_data_to_s3(file_path: str) -> bool:
+    """
+    Upload a file to the bucket and delete the local copy. Returns whether the upload succeeded.
+    """
     try:
-        s3.upload_file(file_path, bucket_name, f"{os.path.basename(file_path)}")
+        s3_transfer.upload(s3, bucket_name, file_path)
         logger.info(f"Successfully upload to s3://{bucket_name}/{os.path.basename(file_path)}")
         os.remove(file_path)
         print(f"Successfully upload to s3://{bucket_name}/{os.path.basename(file_path)}")
+        return True
     except Exception as e:
         logger.error(f"Uploading failed: {e}")
         print(f"Uploading failed: {e}")
+        return False
 
 
-def fetch_latest_csv_from_s3(download_dir='downloads'):
+def archive_raw_data_to_s3(file_path: str):
+    """
+    Store a snapshot in the content-addressed S3 archive, uploading only the chunks
+    that changed since earlier runs, and point the S3 manifest at it.
+    """
     try:
-        response = s3.list_objects_v2(Bucket=bucket_name)
-        contents = response.get('Contents', [])
+        name = Path(file_path).stem
+        archived = archive_snapshot(read_snapshot_tools(file_path), S3Store(s3, bucket_name), name)
+        key = f"{ARCHIVE_PREFIX}snapshots/{name}.json"
+        s3_transfer.update_manifest(s3, bucket_name, s3_transfer.SNAPSHOT, {
+            "key": key,
+            "rows": sum(chunk["rows"] for chunk in archived["chunks"]),
+            "new_bytes": archived["new_bytes"],
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        })
+        os.remove(file_path)
+        print(f"Successfully archived to s3://{bucket_name}/{key}")
+    except Exception as e:
+        logger.error(f"Archiving failed: {e}")
+        print(f"Archiving failed: {e}")
 
-        # Filter for CSV files and sort by last modified time
-        csv_files = [obj for obj in contents if obj['Key'].endswith('.csv')]
-        if not csv_files:
-            logger.info("❌ No CSV files found.")
-            return None
 
-        latest_file = max(csv_files, key=lambda x: x['LastModified'])
-        latest_key = latest_file['Key']
-        filename = os.path.basename(latest_key)
-        local_path = os.path.join(download_dir, filename)
+def fetch_latest_csv_from_s3(download_dir='downloads', kind='snapshot'):
+    """
+    Download the newest scrape output from S3.
+    Args:
+        download_dir (str): Local directory to download to.
+        kind (str): 'snapshot' for full scrapes (Parquet or CSV), 'delta' for the per-run change files.
+    """
+    try:
+        latest_key = s3_transfer.latest_key(s3, bucket_name, kind)
+        if not latest_key:
+            logger.info(f"❌ No {kind} files found.")
+            return None
 
-        os.makedirs(download_dir, exist_ok=True)
-        s3.download_file(bucket_name, latest_key, local_path)
+        local_path = s3_transfer.download(s3, bucket_name, latest_key, download_dir)
 
-        logger.info(f"✅ Downloaded latest CSV: {latest_key} → {local_path}")
-        print(f"✅ Downloaded latest CSV: {latest_key} → {local_path}")
+        logger.info(f"✅ Downloaded latest {kind}: {latest_key} → {local_path}")
+        print(f"✅ Downloaded latest {kind}: {latest_key} → {local_path}")
         return local_path
 
     except Exception as e:
         logger.error(f"❌ Failed to fetch from S3: {e}")
         print(f"❌ Failed to fetch from S3: {e}")
         return None
+
+
+def read_latest_from_s3(kind='snapshot', chunksize=None):
+    """
+    Read the newest scrape output straight from S3, without a local copy.
+    Args:
+        kind (str): 'snapshot' or 'delta'
+        chunksize (int): When given, return an iterator of DataFrames of at most
+            `chunksize` rows instead of one DataFrame.
+
+    Returns:
+        pd.DataFrame | Iterator[pd.DataFrame] | None: None when S3 holds no file of that kind.
+    """
+    latest_key = s3_transfer.latest_key(s3, bucket_name, kind)
+    if not latest_key:
+        logger.info(f"❌ No {kind} files found.")
+        return None
+    logger.info(f"✅ Reading latest {kind} from s3://{bucket_name}/{latest_key}")
+    if chunksize:
+        return s3_transfer.iter_object_chunks(s3, bucket_name, latest_key, chunksize)
+    return s3_transfer.read_object(s3, bucket_name, latest_key)
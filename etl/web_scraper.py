@@ -6,6 +6,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 from datetime import datetime
+import asyncio
 import json
 import time
 import random
@@ -13,145 +14,89 @@ from utils.logger_config import logger
 import requests
 import bs4
 import re
-import csv
 import os
+import queue
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from utils.utils import dump_raw_data_to_s3
+from utils.utils import archive_raw_data_to_s3, dump_raw_data_to_s3
+from utils.async_fetcher import AsyncFetcher
+from utils.direct_feed import scrape_direct_feed
+from utils.http_cache import HTTPCache, NotModifiedMiss
+from utils.frontier import CrawlFrontier
+from utils.host_controller import HostController
+from utils.delta import (
+    DEFAULT_STATE_PATH,
+    compute_delta,
+    delta_path_for,
+    load_state,
+    save_state,
+    summarize,
+    write_delta,
+)
+from utils.parse_pipeline import ParsePipeline
+from utils.snapshots import BatchedSink, SnapshotWriter
+from utils.sources import Source, register_source, run_sources
+from utils.selector_plan import ToolTilePlan
+from utils.parsers import (
+    TOOLIFY_CATEGORY_URL,
+    build_toolify_jobs,
+    extract_tool_data,
+    parse_toolify_categories,
+    parse_toolify_subcategory,
+    with_category,
+)
 
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-filename = f'data/{timestamp}_ai_tools_scraped.csv'
+# Snapshots are Parquet by default; SNAPSHOT_FORMAT=csv keeps the old CSV output
+SNAPSHOT_FORMAT = os.environ.get("SNAPSHOT_FORMAT", "parquet")
+filename = f'data/{timestamp}_ai_tools_scraped.{SNAPSHOT_FORMAT}'
 os.makedirs(os.path.dirname(filename), exist_ok=True)
+# Open only while main() runs: scraping threads enqueue, a background thread writes and fsyncs the snapshot
+snapshot = None
 
+# Selectors are compiled once per process and shared by every page
+TILE_PLAN = ToolTilePlan()
 
-def extract_tool_data(element):
-    tool_data = {}
-
-    title_selectors = [
-        "h1",
-        "h2",
-        "h3",
-        "h4",
-        "h5",
-        "h6",
-        '[class*="sv-tile__title sv-text-reset sv-is-link"]'  # Standard headings
-        ".title",
-        ".name",
-        ".tool-name",
-        ".product-name",  # Common title classes
-        '[class*="title"]',
-        '[class*="name"]',  # Partial class matches
-        "a[href]",  # Links often contain tool names
-        "strong",
-        "b",  # Bold text
-        ".sv-tile-title",
-        ".sv-title",  # SV-specific classes
-    ]
-
-    for selector in title_selectors:
-        title_elem = element.select_one(selector)
-        if title_elem and title_elem.get_text(strip=True):
-            title_text = title_elem.get_text(strip=True)
-            # Skip very short or very long titles
-            if 3 <= len(title_text) <= 100:
-                tool_data["name"] = title_text
-                break
-
-    desc_selectors = [
-        ".description",
-        ".desc",
-        ".summary",
-        ".overview",
-        '[class*="desc"]',
-        '[class*="summary"]',
-        "p",  # Paragraphs
-        "sv-tile__description sv-text-reset",
-        ".sv-tile-description",
-        ".sv-description",  # SV-specific
-    ]
-
-    for selector in desc_selectors:
-        desc_elem = element.select_one(selector)
-        if desc_elem and desc_elem.get_text(strip=True):
-            desc_text = desc_elem.get_text(strip=True)
-            # Look for meaningful descriptions (not too short, not the same as title)
-            if len(desc_text) > 20 and desc_text != tool_data.get("name", ""):
-                tool_data["description"] = desc_text
-                break
-
-    if not tool_data.get("description"):
-        all_text_elements = element.find_all(string=True)
-        text_contents = [text.strip() for text in all_text_elements if text.strip()]
-        if text_contents:
-            # Find the longest text that's not the title
-            longest_text = max(text_contents, key=len, default="")
-            if len(longest_text) > 20 and longest_text != tool_data.get("name", ""):
-                tool_data["description"] = longest_text
-
-    link_elements = element.select("a[href]")
-    for link_elem in link_elements:
-        href = link_elem.get("href", "")
-        if href and not href.startswith("#"):
-            if href.startswith("http"):
-                tool_data["url"] = href
-                break
-            elif href.startswith("/") and "aitoolsdirectory.com" not in href:
-                # Skip internal directory links, look for external ones
-                continue
-            elif href.startswith("/"):
-                tool_data["url"] = f"https://aitoolsdirectory.com{href}"
-
-    tool_data["source"] = "https://aitoolsdirectory.com"
-
-    tag_selectors = [
-        ".tag",
-        ".category",
-        ".badge",
-        ".label",
-        ".chip",
-        '[class*="tag"]',
-        '[class*="category"]',
-        '[class*="badge"]',
-        ".sv-tag",
-        ".sv-category",  # SV-specific
-    ]
-
-    tags = []
-    for selector in tag_selectors:
-        tag_elements = element.select(selector)
-        for tag_elem in tag_elements:
-            tag_text = tag_elem.get_text(strip=True)
-            if tag_text and 2 <= len(tag_text) <= 30:  # Reasonable tag length
-                tags.append(tag_text)
-
-    if tags:
-        tool_data['category'] = tags[0]
-
-    return tool_data
+MAIN_LIST_SELECTOR = ".sv-tiles-list.sv-tiles-list--flex.sv-tiles-list--tile-view.sv-tiles-list--small-size"
 
 
 def save_tools(tools):
+    """
+    Queue tools for the snapshot opened by main(). Raises when no snapshot is open
+    or its writer has failed, so the crawl stops instead of losing every later batch.
+    """
     if not tools:
         logger.warning("No tools to save.")
         return
-    file_exists = os.path.isfile(filename)
-    fieldnames = tools[0].keys()
-
-    try:
-        with open(filename, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(tools)
-        print(f"Appended {len(tools)} tools to {filename}")
-    except Exception as e:
-        print(f"Failed to append tools to CSV: {e}")
+    if snapshot is None:
+        raise RuntimeError("No snapshot is open, tools can only be saved while main() runs")
+    snapshot.put(tools)
+    print(f"Queued {len(tools)} tools for {filename}")
 
 
 class AIToolsScraper:
-    def __init__(self, headless=True, wait_time=10):
+    def __init__(self, headless=True, wait_time=10, event_driven=True, start_browser=True, use_cache=True):
         self.wait_time = wait_time
-        self.setup_driver(headless)
+        self.headless = headless
+        # Wait on DOM mutations of the tile list instead of fixed sleeps
+        self.event_driven = event_driven
+        if start_browser:
+            self.setup_driver(headless)
         self.tools = []
+        # Shared session so the threaded Toolify crawl reuses keep-alive connections
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32))
+        # Per-host AIMD concurrency, Retry-After and jittered retries for the threaded crawl
+        self.controller = HostController(self.session, max_limit=32)
+        # Conditional-GET cache: unchanged pages are neither downloaded in full nor re-parsed
+        self.http_cache = HTTPCache() if use_cache else None
+        # Pages that could not be fetched or scraped; the run's delta must not read their tools as removed
+        self.failed_fetches = 0
+        self._failures_lock = threading.Lock()
+
+    def record_failure(self, count=1):
+        with self._failures_lock:
+            self.failed_fetches += count
 
     def setup_driver(self, headless=True):
         chrome_options = Options()
@@ -185,6 +130,10 @@ class AIToolsScraper:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
 
+    def ensure_driver(self):
+        if not hasattr(self, "driver"):
+            self.setup_driver(self.headless)
+
     def wait_for_content_load(self, max_wait=30):
         logger.info("Waiting for content to load...")
         if self.wait_for_main_list():
@@ -204,7 +153,7 @@ class AIToolsScraper:
         return False
 
     def wait_for_main_list(self, timeout=20):
-        main_list_selector = ".sv-tiles-list.sv-tiles-list--flex.sv-tiles-list--tile-view.sv-tiles-list--small-size"
+        main_list_selector = MAIN_LIST_SELECTOR
         try:
             logger.info("Waiting for main tools list to load...")
             element = self.wait.until(
@@ -283,7 +232,34 @@ class AIToolsScraper:
         except:
             return False
 
+    def wait_for_tiles_settled(self, quiet_period=0.5, timeout=10.0, poll_interval=0.1):
+        """
+        Block until the tile count has not changed for `quiet_period` seconds and return it.
+
+        A list that never changes returns after `quiet_period`; one that keeps
+        changing returns its current count after `timeout` seconds.
+        """
+        started = changed_at = time.monotonic()
+        tile_count = self.count_tiles()
+        while True:
+            now = time.monotonic()
+            if now - changed_at >= quiet_period:
+                return tile_count
+            if now - started >= timeout:
+                logger.warning(f"Tile list kept changing for {timeout}s, continuing with {tile_count} tiles")
+                return tile_count
+            time.sleep(min(poll_interval, quiet_period - (now - changed_at)))
+            new_count = self.count_tiles()
+            if new_count != tile_count:
+                tile_count, changed_at = new_count, time.monotonic()
+
+    def count_tiles(self):
+        return len(self.driver.find_elements(By.CSS_SELECTOR, f"{MAIN_LIST_SELECTOR} > *"))
+
     def scroll_to_load_content(self):
+        if self.event_driven:
+            return self.scroll_until_tiles_stop_growing()
+
         logger.info("Scrolling to trigger lazy loading...")
 
         # Get initial height
@@ -311,6 +287,22 @@ class AIToolsScraper:
         self.driver.execute_script("window.scrollTo(0, 0);")
         time.sleep(1)
 
+    def scroll_until_tiles_stop_growing(self, max_attempts=5):
+        logger.info("Scrolling until the tile list stops growing...")
+        tile_count = self.wait_for_tiles_settled(quiet_period=0.3)
+
+        for attempt in range(1, max_attempts + 1):
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            # Long enough for the lazy-load request to start adding tiles after the scroll
+            new_count = self.wait_for_tiles_settled(quiet_period=1.0)
+            if new_count <= tile_count:
+                break
+            tile_count = new_count
+            logger.info(f"Scroll attempt {attempt}, tiles loaded: {tile_count}")
+
+        # Only the parsed page source is needed afterwards, so there is no need to wait after this
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
     def extract_tools_from_page(self):
         logger.info("Extracting tools from page...")
 
@@ -319,8 +311,7 @@ class AIToolsScraper:
         soup = BeautifulSoup(html, "html.parser")
 
         # First, try to find the main tools list container
-        main_list_selector = "div.sv-tiles-list.sv-tiles-list--flex.sv-tiles-list--tile-view.sv-tiles-list--small-size"
-        main_list = soup.select_one(main_list_selector)
+        main_list = soup.select_one(f"div{MAIN_LIST_SELECTOR}")
 
         tools_found = []
 
@@ -339,8 +330,9 @@ class AIToolsScraper:
                 )
 
             # Extract data from each tool element
+            plan_state = TILE_PLAN.new_page()
             for element in tool_elements:
-                tool_data = extract_tool_data(element)
+                tool_data = TILE_PLAN.extract(element, plan_state)
                 if tool_data and tool_data.get("name"):
                     tools_found.append(tool_data)
 
@@ -356,19 +348,28 @@ class AIToolsScraper:
         logger.info(f"Scraping page {page_num}: {url}")
 
         try:
+            started = time.perf_counter()
             self.driver.get(url)
             self.wait_for_content_load()
+            loaded = time.perf_counter()
             self.scroll_to_load_content()
+            scrolled = time.perf_counter()
 
             tools = self.extract_tools_from_page()
+            finished = time.perf_counter()
+            logger.info(f"Page {page_num} timings: load {loaded - started:.2f}s, "
+                        f"scroll {scrolled - loaded:.2f}s, extract {finished - scrolled:.2f}s, "
+                        f"total {finished - started:.2f}s, {len(tools)} tools")
 
             return tools
 
         except Exception as e:
             logger.error(f"Error scraping page {page_num}: {e}")
+            self.record_failure()
             return []
 
     def scrape_multiple_pages(self, base_url, max_pages=5):
+        self.ensure_driver()
         all_tools = []
 
         for page in range(1, max_pages + 1):
@@ -386,204 +387,471 @@ class AIToolsScraper:
 
         return all_tools
 
+    def scrape_multiple_pages_parallel(self, base_url, max_pages=5, pool_size=3, sink=None):
+        """
+        Scrape listing pages on a pool of headless browsers.
+
+        This scraper's own driver is one member of the pool; `pool_size - 1` extra
+        drivers are started and closed here. Results keep page order; `sink`, when
+        given, is called with each page's tools as soon as the page is done.
+        """
+        started = time.perf_counter()
+        self.ensure_driver()
+        pool_size = max(1, min(pool_size, max_pages))
+        browsers = queue.Queue()
+        browsers.put(self)
+        extra = []
+        try:
+            for _ in range(pool_size - 1):
+                worker = AIToolsScraper(headless=self.headless, wait_time=self.wait_time,
+                                        event_driven=self.event_driven, use_cache=False)
+                extra.append(worker)
+                browsers.put(worker)
+        except Exception as e:
+            logger.warning(f"Started only {len(extra) + 1} of {pool_size} browsers: {e}")
+
+        def scrape_with_pooled_browser(page):
+            browser = browsers.get()
+            try:
+                page_tools = browser.scrape_page(f"{base_url}?page={page}", page)
+            finally:
+                browsers.put(browser)
+            if sink:
+                sink(page_tools)
+            return page_tools
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(extra) + 1) as executor:
+                pages = list(executor.map(scrape_with_pooled_browser, range(1, max_pages + 1)))
+        finally:
+            for worker in extra:
+                self.record_failure(worker.failed_fetches)
+                worker.close()
+
+        all_tools = [tool for page_tools in pages for tool in page_tools]
+        logger.info(f"Scraped {max_pages} pages on {len(extra) + 1} browsers in "
+                    f"{time.perf_counter() - started:.1f}s, {len(all_tools)} tools")
+        return all_tools
+
+    def scrape_aitoolsdirectory(self, base_url, max_pages=5, pool_size=3, sink=None):
+        """
+        Scrape aitoolsdirectory from its JSON data feed, falling back to Selenium
+        only when the feed cannot be reached or returns nothing.
+        """
+        started = time.perf_counter()
+        tools = scrape_direct_feed(self.session)
+        if tools:
+            logger.info(f"Scraped {len(tools)} tools from the direct feed in {time.perf_counter() - started:.1f}s")
+            if sink:
+                sink(tools)
+            return tools
+
+        logger.info("Direct feed unavailable, falling back to Selenium")
+        return self.scrape_multiple_pages_parallel(base_url, max_pages, pool_size, sink=sink)
+
     def close(self):
         if hasattr(self, "driver"):
             self.driver.quit()
             logger.info("WebDriver closed")
+        if hasattr(self, "session"):
+            self.session.close()
+        if getattr(self, "http_cache", None):
+            self.http_cache.close()
+
+    def cache_headers(self, url):
+        return self.http_cache.request_headers(url) if self.http_cache else {}
+
+    def parse_cached(self, url, res, parse):
+        if not self.http_cache:
+            return parse(res.content)
+        try:
+            return self.http_cache.resolve(url, res.status_code, res.headers, res.content, parse)
+        except NotModifiedMiss:
+            res = self.refetch(url)
+            return self.http_cache.resolve(url, res.status_code, res.headers, res.content, parse)
+
+    def refetch(self, url):
+        # Unconditional GET, for a 304 whose cache entry was evicted meanwhile
+        res = self.controller.get(url)
+        res.raise_for_status()
+        return res
+
+    def report_cache(self):
+        if self.http_cache:
+            self.http_cache.report()
 
     def scrape_toolify_categories(self):
         logger.info("Starting scrape_toolify_categories function")
-        data = []
 
         try:
-            logger.info("Fetching page from https://www.toolify.ai/category")
-            res = requests.get("https://www.toolify.ai/category", timeout=50)
+            logger.info(f"Fetching page from {TOOLIFY_CATEGORY_URL}")
+            res = self.controller.get(TOOLIFY_CATEGORY_URL, headers=self.cache_headers(TOOLIFY_CATEGORY_URL))
             res.raise_for_status()
             logger.info(f"Successfully fetched page, status code: {res.status_code}")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch page: {e}")
-            return data
+            self.record_failure()
+            return []
 
         try:
-            logger.info("Starting HTML parsing")
-            soup = bs4.BeautifulSoup(res.text, 'html.parser')
-            table = soup.find_all('div', id=re.compile(r'^group-'))
-            logger.info(f"Found {len(table)} category groups")
-
-            if not table:
-                logger.warning("No category groups found with id starting with 'group-'")
-
-            for i, row in enumerate(table):
-                logger.debug(f"Processing category group {i + 1}/{len(table)}")
-                try:
-                    title = row.find('h3').get_text(strip=True)
-                    logger.debug(f"Found category: {title}")
-                    sub_categories = []
-
-                    sub_links = row.find_all('a', class_='go-category-link')
-                    logger.debug(f"Found {len(sub_links)} subcategories for '{title}'")
-
-                    for j, sub_row in enumerate(sub_links):
-                        href = sub_row.get('href', '')
-                        full_link = f"https://www.toolify.ai{href}" if href.startswith('/') else href
-
-                        name_span = sub_row.find('span',
-                                                 class_='text-base text-gray-1000 flex-1 w-0 truncate font-medium')
-                        if name_span:
-                            name = name_span.get_text(strip=True)
-                            sub_categories.append({
-                                'name': name,
-                                'link': full_link,
-                            })
-                            logger.debug(f"Added subcategory: {name}")
-                        else:
-                            logger.info(f"Skipping subcategory {j + 1} in '{title}' - no expected span found")
-
-                    data.append({
-                        'category': title,
-                        'sub_categories': sub_categories
-                    })
-                    logger.info(f"Successfully processed category '{title}' with {len(sub_categories)} subcategories")
-                except AttributeError as e:
-                    logger.warning(f"Could not extract category block {i + 1} properly: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected parsing error: {e}")
-
+            data = self.parse_cached(TOOLIFY_CATEGORY_URL, res, parse_toolify_categories)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch page: {e}")
+            self.record_failure()
+            return []
         logger.info(f"scrape_toolify_categories completed successfully. Extracted {len(data)} categories")
         return data
 
     def scrape_toolify_subcategory(self, subcategory_url, category_name="", subcategory_name=""):
         logger.info(f"Starting scrape_toolify_subcategory for URL: {subcategory_url}, category: {category_name}, "
                     f"subcategory: {subcategory_name}")
-        sub_data = []
 
         try:
             logger.info(f"Fetching subcategory page: {subcategory_url}")
-            res = requests.get(subcategory_url, timeout=50)
+            res = self.controller.get(subcategory_url, headers=self.cache_headers(subcategory_url))
             res.raise_for_status()
             logger.info(f"Successfully fetched subcategory page, status code: {res.status_code}")
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch subcategory page: {e}")
-            return sub_data
+            self.record_failure()
+            return []
 
         try:
-            logger.info("Starting HTML parsing for subcategory")
-            soup = bs4.BeautifulSoup(res.text, 'html.parser')
-            table = soup.find_all('div', class_='mb-12')
-            logger.info(f"Found {len(table)} tool items in subcategory")
-
-            for i, row in enumerate(table):
-                logger.debug(f"Processing tool item {i + 1}/{len(table)}")
-                try:
-                    row_class = row.find('div', class_='tool-card bg-white p-6 flex gap-4 items-center')
-                    agent = row_class.find('div',
-                                           class_='card-text-content flex flex-col justify-between flex-1 h-full w-0')
-
-                    name = agent.find('a').find('h2').get_text(strip=True)
-                    description = agent.find('p').get_text(strip=True)
-                    full_url = ''
-                    visit_btn_parent = row.find('div', class_='visit-btn')
-                    if visit_btn_parent:
-                        visit_link_tag = visit_btn_parent.find_parent('a')  # Get the <a> that wraps the button
-                        if visit_link_tag and visit_link_tag.has_attr('href'):
-                            visit_url = visit_link_tag['href']
-                            full_url = visit_url
-
-                    tool_data = {
-                        "name": name,
-                        "description": description,
-                        "url": full_url,
-                        "source": "https://www.toolify.ai",
-                        "category": category_name
-                    }
-
-                    sub_data.append(tool_data)
-                    logger.debug(f"Successfully extracted tool: {name}")
-
-
-                except AttributeError as e:
-                    logger.warning(f"Could not parse tool item {i + 1}: {e}")
-
-        except Exception as e:
-            logger.error(f"Unexpected parsing error in subcategory scraping: {e}")
-
+            sub_data = with_category(self.parse_cached(subcategory_url, res, parse_toolify_subcategory), category_name)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch subcategory page: {e}")
+            self.record_failure()
+            return []
         logger.info(
             f"scrape_toolify_subcategory completed. Extracted {len(sub_data)} tools from category '{category_name}'")
         return sub_data
 
-    def scrape_all_toolify_data_concurrent(self, max_workers=10):
-        all_tools = []
-        categories = self.scrape_toolify_categories()
-        subcat_jobs = []
-
-        for category in categories:
-            category_name = category['category']
-            for subcat in category.get('sub_categories', []):
-                subcat_name = subcat['name']
-                subcat_url = subcat['link']
-                subcat_jobs.append((category_name, subcat_url, subcat_name))
+    def resume_toolify_crawl(self, frontier, sink):
+        """
+        Resume an unfinished Toolify crawl checkpointed in `frontier`.
+
+        Returns:
+            tuple: (tools already scraped, replayed into `sink`; pending jobs), or
+                ([], None) when a fresh crawl has to be planned.
+        """
+        resumed = frontier.resume() if frontier else None
+        if not resumed:
+            return [], None
+        subcat_jobs, done_tools = resumed
+        if done_tools:
+            sink(done_tools)
+        return list(done_tools), subcat_jobs
+
+    def scrape_all_toolify_data_concurrent(self, max_workers=32, sink=save_tools, frontier=None,
+                                           stats_every=50):
+        """
+        Threaded Toolify crawl. `max_workers` is only an upper bound: the host
+        controller sets how many requests each host actually gets, and its live
+        stats are printed every `stats_every` subcategories. With a `frontier`,
+        every finished subcategory is checkpointed and an interrupted crawl
+        resumes with only the remaining jobs.
+        """
+        all_tools, subcat_jobs = self.resume_toolify_crawl(frontier, sink)
+        if subcat_jobs is None:
+            categories = self.scrape_toolify_categories()
+            subcat_jobs = build_toolify_jobs(categories)
+            if frontier:
+                frontier.start(subcat_jobs)
 
         print(f"[INFO] Queued {len(subcat_jobs)} subcategories for scraping")
 
         # Threaded scraping
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_subcat = {
-                executor.submit(self.scrape_toolify_subcategory, url, category_name, subcategory): subcategory
+                executor.submit(self.scrape_toolify_subcategory, url, category_name, subcategory):
+                    (category_name, url, subcategory)
                 for category_name, url, subcategory in subcat_jobs
             }
 
-            for future in as_completed(future_to_subcat):
-                subcat_name = future_to_subcat[future]
+            for done, future in enumerate(as_completed(future_to_subcat), 1):
+                category_name, url, subcat_name = future_to_subcat[future]
+                if done % stats_every == 0:
+                    self.controller.report()
                 try:
                     result = future.result()
-                    save_tools(result)
-                    all_tools.extend(result)
-                    logger.debug(f"Saved tool data for: {subcat_name}")
-                    print(f"[DONE] Scraped {len(result)} tools from: {subcat_name}")
                 except Exception as e:
                     print(f"[ERROR] Failed scraping {subcat_name}: {e}")
+                    self.record_failure()
+                    continue
+                # Outside the try: a failing sink stops the crawl instead of dropping every later batch
+                sink(result)
+                if frontier:
+                    frontier.complete(category_name, url, result)
+                all_tools.extend(result)
+                logger.debug(f"Saved tool data for: {subcat_name}")
+                print(f"[DONE] Scraped {len(result)} tools from: {subcat_name}")
+        if frontier:
+            frontier.finish()
         print(f"[DONE] Scraped {len(all_tools)} tools in total")
+        self.controller.report()
+        self.report_cache()
         return all_tools
 
+    def fetch_page_bytes(self, url):
+        try:
+            res = self.controller.get(url, headers=self.cache_headers(url))
+            res.raise_for_status()
+            if self.http_cache:
+                try:
+                    cached = self.http_cache.lookup(url, res.status_code, res.headers, res.content)
+                except NotModifiedMiss:
+                    res = self.refetch(url)
+                    cached = self.http_cache.lookup(url, res.status_code, res.headers, res.content)
+                if cached is not None:
+                    return cached
+            return res.content
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch page {url}: {e}")
+            self.record_failure()
+            return None
+
+    def scrape_all_toolify_data_pipeline(self, fetch_workers=16, parse_workers=None, queue_size=64,
+                                         parser_backend=None, sink=save_tools):
+        """
+        Toolify crawl with fetching and parsing split into separate pools.
+
+        Fetcher threads push raw HTML onto a bounded queue that a process pool of
+        `parser_backend` parsers drains, so parsing is not serialized by the GIL.
+        Fetch vs parse timings are reported at the end to size each pool.
+        """
+        categories = self.scrape_toolify_categories()
+        subcat_jobs = build_toolify_jobs(categories)
+        print(f"[INFO] Queued {len(subcat_jobs)} subcategories for scraping")
 
-def main(all_page: int):
-    scraper = None
+        def on_result(subcat_name, result):
+            sink(result)
+            print(f"[DONE] Scraped {len(result)} tools from: {subcat_name}")
 
-    try:
-        print("AI Tools Directory Scraper")
-        print("=" * 40)
+        pipeline = ParsePipeline(self.fetch_page_bytes, fetch_workers=fetch_workers,
+                                 parse_workers=parse_workers, queue_size=queue_size,
+                                 backend=parser_backend, cache=self.http_cache)
+        all_tools = pipeline.run(subcat_jobs, on_result=on_result)
+        print(f"[DONE] Scraped {len(all_tools)} tools in total")
+        self.report_cache()
+        return all_tools
+
+    def scrape_all_toolify_data_async(self, max_concurrency=20, per_host_limit=10, rate_limits=None,
+                                      sink=save_tools, frontier=None):
+        """
+        Asyncio variant of scrape_all_toolify_data_concurrent.
+
+        All requests share one pooled keep-alive session; `max_concurrency` caps
+        requests in flight, `per_host_limit` caps connections per host and
+        `rate_limits` ({host: requests_per_second}) throttles individual hosts.
+        Each request also goes through `self.controller`, so throttled and failed
+        pages are retried with backoff instead of being skipped.
+        Returns the same tool dicts as the threaded crawl, and checkpoints and
+        resumes through `frontier` the same way.
+        """
+        return asyncio.run(self._crawl_toolify_async(max_concurrency, per_host_limit, rate_limits, sink, frontier))
+
+    async def _crawl_toolify_async(self, max_concurrency, per_host_limit, rate_limits, sink=save_tools,
+                                   frontier=None):
+        started = time.perf_counter()
+        all_tools, subcat_jobs = self.resume_toolify_crawl(frontier, sink)
+
+        async with AsyncFetcher(max_concurrency=max_concurrency, per_host_limit=per_host_limit,
+                                rate_limits=rate_limits, controller=self.controller) as fetcher:
+            async def fetch_parsed(url, parse):
+                response = await fetcher.fetch(url, self.cache_headers(url))
+                if response is None:
+                    return None
+                status, headers, body = response
+                if not self.http_cache:
+                    return parse(body)
+                try:
+                    return self.http_cache.resolve(url, status, headers, body, parse)
+                except NotModifiedMiss:
+                    response = await fetcher.fetch(url)
+                    if response is None:
+                        return None
+                    return self.http_cache.resolve(url, *response, parse)
+
+            if subcat_jobs is None:
+                categories = await fetch_parsed(TOOLIFY_CATEGORY_URL, parse_toolify_categories)
+                if categories is None:
+                    self.record_failure()
+                    return all_tools
+                subcat_jobs = build_toolify_jobs(categories)
+                if frontier:
+                    frontier.start(subcat_jobs)
+            print(f"[INFO] Queued {len(subcat_jobs)} subcategories for scraping")
+
+            async def scrape_job(category_name, url, subcategory):
+                result = await fetch_parsed(url, parse_toolify_subcategory)
+                if result is not None:
+                    result = with_category(result, category_name)
+                return category_name, url, subcategory, result
+
+            tasks = [asyncio.create_task(scrape_job(*job)) for job in subcat_jobs]
+            for task in asyncio.as_completed(tasks):
+                try:
+                    category_name, url, subcat_name, result = await task
+                except Exception as e:
+                    print(f"[ERROR] Failed scraping subcategory: {e}")
+                    self.record_failure()
+                    continue
+                # A failed fetch is not checkpointed, so a resumed run retries it
+                if result is None:
+                    self.record_failure()
+                elif frontier:
+                    frontier.complete(category_name, url, result)
+                result = result or []
+                sink(result)
+                all_tools.extend(result)
+                print(f"[DONE] Scraped {len(result)} tools from: {subcat_name}")
+
+        if frontier:
+            frontier.finish()
+
+        print(f"[DONE] Scraped {len(all_tools)} tools in total in {time.perf_counter() - started:.1f}s")
+        self.controller.report()
+        self.report_cache()
+        return all_tools
 
-        scraper = AIToolsScraper(wait_time=15)
-        base_url = "https://aitoolsdirectory.com/"
 
-        max_pages = all_page
-        max_pages = min(max_pages, 10)
+def incomplete_sources(results) -> set:
+    """
+    `source` values of the tools of every run_sources() result that missed pages.
+    A tool missing from such a source may only be on a page that failed.
+    """
+    return {tool.get("source") or "" for result in results.values() if not result["complete"]
+            for tool in result["tools"]}
+
+
+def write_run_delta(tools, state_path=DEFAULT_STATE_PATH, upload=dump_raw_data_to_s3, incomplete_sources=()):
+    """
+    Write the added/changed/removed tools of this run next to the full snapshot,
+    upload it, and only then advance the fingerprint state. After a failed upload
+    the next run diffs against the same state, so these changes are not lost.
+    Sources in `incomplete_sources` missed pages and report no removals.
+    """
+    delta, new_state = compute_delta(tools, load_state(state_path), incomplete_sources)
+    delta_file = delta_path_for(filename)
+    write_delta(delta, delta_file)
+    counts = summarize(delta)
+    logger.info(f"Delta written to {delta_file}: {counts}")
+    print(f"[DELTA] {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed -> {delta_file}")
+    if upload(delta_file):
+        save_state(new_state, state_path)
+    else:
+        logger.warning(f"Delta {delta_file} was not uploaded, keeping the previous fingerprint state")
+    return delta_file
+
+
+@register_source
+class AIToolsDirectorySource(Source):
+    """
+    aitoolsdirectory.com: the JSON data feed, or a pool of headless browsers
+    over the listing pages when the feed is unavailable.
+    """
+
+    name = "aitoolsdirectory"
+    fetch_strategy = "feed, selenium fallback"
+    max_concurrency = 3
+    base_url = "https://aitoolsdirectory.com/"
+
+    def __init__(self, max_pages=4, **options):
+        super().__init__(**options)
+        self.max_pages = min(max_pages, 10)
+        # Chrome is only started if the direct feed fails
+        self.scraper = AIToolsScraper(wait_time=15, start_browser=False, use_cache=False)
+
+    def scrape(self, sink):
+        return self.scraper.scrape_aitoolsdirectory(self.base_url, self.max_pages,
+                                                    pool_size=self.max_concurrency, sink=sink)
+
+    def complete(self):
+        return self.scraper.failed_fetches == 0
+
+    def close(self):
+        self.scraper.close()
+
+
+@register_source
+class ToolifySource(Source):
+    """
+    toolify.ai category pages, crawled with the asyncio engine by default.
+    `mode` is "async", "pipeline" or "threaded". The async and threaded crawls
+    checkpoint their frontier, so a killed run is resumed by the next one
+    unless `resume` is False.
+    """
+
+    name = "toolify"
+    fetch_strategy = "requests"
+    max_concurrency = 20
+
+    def __init__(self, mode="async", resume=True, **options):
+        super().__init__(**options)
+        self.mode = mode
+        self.scraper = AIToolsScraper(start_browser=False)
+        self.frontier = CrawlFrontier(self.name) if resume else None
+
+    def scrape(self, sink):
+        if self.mode == "async":
+            return self.scraper.scrape_all_toolify_data_async(max_concurrency=self.max_concurrency, sink=sink,
+                                                              frontier=self.frontier)
+        if self.mode == "pipeline":
+            return self.scraper.scrape_all_toolify_data_pipeline(fetch_workers=self.max_concurrency, sink=sink)
+        return self.scraper.scrape_all_toolify_data_concurrent(max_workers=self.max_concurrency, sink=sink,
+                                                               frontier=self.frontier)
+
+    def complete(self):
+        return self.scraper.failed_fetches == 0
 
-        print(f"\nStarting to scrape {max_pages} pages...")
-        tools = scraper.scrape_multiple_pages(base_url, max_pages)
+    def close(self):
+        self.scraper.close()
+        if self.frontier:
+            self.frontier.close()
+
+
+def main(all_page: int, toolify_mode: str = "async", sources=None):
+    """
+    Run every registered source (or only `sources`) concurrently; tools stream into
+    the snapshot as each source produces them. The snapshot is closed however the
+    run ends, so an interrupted run still leaves a complete file of what was scraped.
+    """
+    global snapshot
+    sink = snapshot = BatchedSink(SnapshotWriter(filename, SNAPSHOT_FORMAT))
+    try:
+        print("AI Tools Directory Scraper")
+        print("=" * 40)
 
+        results = run_sources(save_tools, sources, options={
+            "aitoolsdirectory": {"max_pages": all_page},
+            "toolify": {"mode": toolify_mode},
+        })
+        tools = [tool for result in results.values() for tool in result["tools"]]
         if tools:
             print(f"\n{'=' * 60}")
-            print(f"SCRAPING COMPLETED - Found {len(tools)} unique AI tools")
+            print(f"SCRAPING COMPLETED - Found {len(tools)} AI tools")
             print(f"{'=' * 60}")
-
-            save_tools(tools)
-
         else:
             print("No tools were scraped. The website structure might have changed.")
-        # scrape toolify website
-        scraper.scrape_all_toolify_data_concurrent()
-        dump_raw_data_to_s3(filename)
+
+        # Raises when the writer failed: the snapshot is incomplete and nothing is uploaded
+        written = sink.close()
+        # Only the chunks that changed since earlier runs are uploaded
+        if written:
+            archive_raw_data_to_s3(filename)
+        write_run_delta(tools, incomplete_sources=incomplete_sources(results))
 
     except KeyboardInterrupt:
         print("\nScraping interrupted by user")
     except Exception as e:
         logger.error(f"Scraping failed: {e}")
-
     finally:
-        if scraper:
-            scraper.close()
-
+        snapshot = None
+        if not sink.closed:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"Closing the snapshot failed: {e}")
 
 if __name__ == "__main__":
     main(4)